@@ -2,7 +2,7 @@ export const API_BASE_URL = 'http://127.0.0.1:8080'
 
 export const API_ENDPOINTS = {
     GENERATE_SOW: `${API_BASE_URL}/generate-sow`,
-    GENERATED_SOW_PDF: `${API_BASE_URL}/static/Generated_SOW_final.docx`,
+    DOCUMENT: (fileName: string) => `${API_BASE_URL}/documents/${fileName}`,
     LIKE_SOW: `${API_BASE_URL}/like-sow`,
     CHAT: `${API_BASE_URL}/chat`,
 }
@@ -46,6 +46,12 @@ const SOWGenerator = () => {
   const [isLikeLoading, setIsLikeLoading] = useState(false);
   const [isChaGenerating, setIsChaGenerating] = useState(false);
   const [generatedContent, setGeneratedContent] = useState();
+  // SOW JSON of the latest response, chat edits are applied to it as patches
+  const [sowJson, setSowJson] = useState<string>();
+  // Stored DOCX of the latest response, downloaded from /documents/<fileName>
+  const [fileName, setFileName] = useState<string>();
+  // Server-side session of the latest SOW, chat turns continue it instead of resending the SOW
+  const [sessionId, setSessionId] = useState<string>();
   const { toast } = useToast();
   const [chatMessages, setChatMessages] = useState<{role: 'user' | 'assistant', content: string}[]>([]);
   const [chatInput, setChatInput] = useState("");
@@ -68,7 +74,8 @@ const SOWGenerator = () => {
 
   const handleDownloadDocx = async () => {
     try {
-      const response = await axios.get(API_ENDPOINTS.GENERATED_SOW_PDF, {
+      if (!fileName) return;
+      const response = await axios.get(API_ENDPOINTS.DOCUMENT(fileName), {
         responseType: 'blob', // very important to receive binary data
       });
   
@@ -113,6 +120,9 @@ const SOWGenerator = () => {
 
       if (response.status === 200) {
         setGeneratedContent(response.data.message)
+        setSowJson(response.data.sow_json)
+        setFileName(response.data.fileName)
+        setSessionId(response.data.sessionId)
         toast({
           title: "Success",
           description: "SOW has been generated",
@@ -160,13 +170,22 @@ const SOWGenerator = () => {
     const userMsg = { role: 'user' as const, content: chatInput };
     setChatMessages((prev) => [...prev, userMsg]);
     setChatInput("");
-    // Send message to backend
-    axios.post(API_ENDPOINTS.CHAT, {
-      message: chatInput,
-      context: generatedContent,
-    })
+    const withSow = { message: chatInput, context: generatedContent, sowJson };
+    // Send message to backend, continuing the server-side session. When the server no longer has it
+    // (404, e.g. after a restart), send the SOW this page holds instead.
+    const request = sessionId
+      ? axios.post(API_ENDPOINTS.CHAT, { message: chatInput, sessionId }).catch((error) => {
+          if (error?.response?.status !== 404) throw error;
+          setSessionId(undefined);
+          return axios.post(API_ENDPOINTS.CHAT, withSow);
+        })
+      : axios.post(API_ENDPOINTS.CHAT, withSow);
+    request
     .then((response) => {
       setGeneratedContent(response.data.message);
+      setSowJson(response.data.sow_json);
+      setFileName(response.data.fileName);
+      setSessionId(response.data.sessionId);
       setIsChaGenerating(false);
       setIsGenerating(false);
     }
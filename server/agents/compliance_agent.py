@@ -1,29 +1,66 @@
-import spacy
-from transformers import pipeline
 import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import COMPLIANCE_ENGINE
+from services.inference import build_pipeline
+from services.registry import registry
+
+CLAUSE_MODEL = "facebook/bart-large-mnli"
+
+# Passive voice detection only needs the dependency parser (and the sentence
+# boundaries it sets), the remaining en_core_web_sm components are skipped in fast mode
+FAST_PIPELINE_EXCLUDE = ["tagger", "attribute_ruler", "lemmatizer", "ner"]
+SPACY_BATCH_SIZE = 32
+
+def elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 1)
+
+def load_spacy_fast():
+    import spacy
+    return spacy.load("en_core_web_sm", exclude=FAST_PIPELINE_EXCLUDE)
+
+def load_spacy_standard():
+    import spacy
+    return spacy.load("en_core_web_sm")
+
+def load_clause_checker():
+    return build_pipeline("zero-shot-classification", CLAUSE_MODEL)
+
+# Both pipelines are available to agents built with either engine, only the configured one is preloaded
+registry.register("spacy_nlp_fast", load_spacy_fast, preload=COMPLIANCE_ENGINE == "fast")
+registry.register("spacy_nlp_standard", load_spacy_standard, preload=COMPLIANCE_ENGINE != "fast")
+registry.register("clause_checker", load_clause_checker)
 
 class ComplianceAgent:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
-        self.clause_checker = pipeline(
-            "zero-shot-classification",
-            model="facebook/bart-large-mnli",
-            framework="pt",
-            device=-1
-        )
-       
+    def __init__(self, engine=COMPLIANCE_ENGINE):
+        self.engine = engine
+        # Torch and spaCy release the GIL in their heavy loops, so threads are
+        # enough to overlap the zero-shot and linguistic analyses
+        self.executor = ThreadPoolExecutor(max_workers=2) if engine == "fast" else None
+
         self.required_fields = [
             "Project Title", "Scope of Work", "Deliverables",
             "Timeline", "Payment Terms", "Confidentiality",
             "Termination", "Limitation of Liability"
         ]
 
-    def validate_structure(self, sow_data):
-        """Check for missing fields and basic validation"""
+    @property
+    def nlp(self):
+        return registry.get(f"spacy_nlp_{'fast' if self.engine == 'fast' else 'standard'}")
+
+    @property
+    def clause_checker(self):
+        return registry.get("clause_checker")
+
+    def validate_structure(self, sow_data, fields=None):
+        """Check for missing fields and basic validation, limited to the given fields when set"""
         missing = []
         issues = []
         
         for field in self.required_fields:
+            if fields is not None and field not in fields:
+                continue
             value = sow_data.get(field)
             if not value:
                 print(f"MISSING {field}:")
@@ -49,26 +86,59 @@ class ComplianceAgent:
                 issues.append(f"{label.title()} clause needs strengthening ({score:.1%} confidence)")
         return issues
 
-    def check_language(self, text):
-        """Language quality checks"""
-        doc = self.nlp(text)
+    def passive_voice_issues(self, doc):
+        """Passive voice detection"""
         issues = []
-        
-        # Passive voice detection
         for sent in doc.sents:
             if any(token.dep_ == "nsubjpass" for token in sent):
                 issues.append(f"Passive voice: '{sent.text}'")
-        
-        # Vague terms check
+        return issues
+
+    def vague_term_issues(self, text):
+        """Vague terms check"""
+        issues = []
         vague_terms = ["appropriate", "reasonable", "etc."]
         for term in vague_terms:
             if term in text.lower():
                 issues.append(f"Vague term used: '{term}'")
-        
         return issues
 
-    def generate_report(self, sow_data):
-        """Full compliance analysis"""
+    def check_language(self, text):
+        """Language quality checks"""
+        doc = self.nlp(text)
+        issues = self.passive_voice_issues(doc)
+        issues.extend(self.vague_term_issues(text))
+        return issues
+
+    def check_language_batched(self, text):
+        """Language quality checks with the text split into sections and parsed through nlp.pipe"""
+        sections = [section for section in re.split(r"\n\s*\n", text) if section.strip()]
+        issues = []
+        for doc in self.nlp.pipe(sections, batch_size=SPACY_BATCH_SIZE):
+            issues.extend(self.passive_voice_issues(doc))
+        issues.extend(self.vague_term_issues(text))
+        return issues
+
+    def timed(self, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        return result, elapsed_ms(start)
+
+    def analyze_text(self, text):
+        """Run clause and language analysis, returning both issue lists and their timings"""
+        if self.engine == "fast":
+            clauses = self.executor.submit(self.timed, self.analyze_clauses, text)
+            language = self.executor.submit(self.timed, self.check_language_batched, text)
+            (content_issues, clauses_ms), (language_issues, language_ms) = clauses.result(), language.result()
+        else:
+            content_issues, clauses_ms = self.timed(self.analyze_clauses, text)
+            language_issues, language_ms = self.timed(self.check_language, text)
+
+        return content_issues, language_issues, {"clauses_ms": clauses_ms, "language_ms": language_ms}
+
+    def generate_report(self, sow_data, fields=None):
+        """Full compliance analysis, or only of the given fields (chat patches)"""
+        start = time.perf_counter()
         report = {
             "missing_fields": [],
             "structural_issues": [],
@@ -76,16 +146,20 @@ class ComplianceAgent:
             "language_issues": [],
             "compliance_score": 100,
             "risk_level": "low",
-            "recommendations": []
+            "recommendations": [],
+            "timings": {"engine": self.engine}
         }
         
         # Structural validation
-        report["missing_fields"], report["structural_issues"] = self.validate_structure(sow_data)
+        report["missing_fields"], report["structural_issues"] = self.validate_structure(sow_data, fields)
+        report["timings"]["structure_ms"] = elapsed_ms(start)
         
         # Content analysis
         if "sow_text" in sow_data:
-            report["content_issues"].extend(self.analyze_clauses(sow_data["sow_text"]))
-            report["language_issues"].extend(self.check_language(sow_data["sow_text"]))
+            content_issues, language_issues, timings = self.analyze_text(sow_data["sow_text"])
+            report["content_issues"].extend(content_issues)
+            report["language_issues"].extend(language_issues)
+            report["timings"].update(timings)
         
         # Calculate score
         penalties = (
@@ -112,6 +186,7 @@ class ComplianceAgent:
         if report["language_issues"]:
             report["recommendations"].append("Revise vague terms and passive voice constructions")
         
+        report["timings"]["total_ms"] = elapsed_ms(start)
         return report
 
     def process_sow(self, state):
@@ -125,8 +200,13 @@ class ComplianceAgent:
                 sow_data = {"sow_text": state['sow']}
             
             # Generate the compliance report
-            report = self.generate_report(sow_data)
+            # A chat patch only needs the fields it edited checked again
+            report = self.generate_report(sow_data, state.get('touched_fields'))
             state['compliance_results'] = report
+
+            # Every draft is checked afresh, errors from the previous iteration no longer apply
+            state['error'] = None
+            state['error_fields'] = []
             
             # If any compliance issues are detected, build a brief error message
             if (report["compliance_score"] < 80 or
@@ -145,8 +225,16 @@ class ComplianceAgent:
                     error_message += f"Language issues: {', '.join(report['language_issues'])}. "
                 error_message += f"Risk Level: {report['risk_level']}"
                 state['error'] = error_message
+
+                # Missing fields can be repaired one by one, content and language
+                # issues come from unparsed text and need the whole document redrafted
+                if report["content_issues"] or report["language_issues"] or report["structural_issues"]:
+                    state['error_fields'] = None
+                else:
+                    state['error_fields'] = list(report["missing_fields"])
             
             return state
         except Exception as e:
             state['error'] = f"Compliance checking failed: {str(e)}"
+            state['error_fields'] = None
             return state
\ No newline at end of file
@@ -1,12 +1,39 @@
 import json
 import re
+import time
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+from config import DRAFTING_MODE, REPAIR_MODE, STREAM_VALIDATION
+from services.json_stream import IncrementalJSONParser
 from services.llm_service import llm_service
-from prompts.templates import drafting_prompt_template, drafting_chat_prompt
+from services.sow_patch import PatchError, apply_patch
+from prompts.templates import (drafting_prompt_template, drafting_chat_prompt, drafting_chat_patch_prompt,
+                               drafting_group_prompt, REQUIRED_FIELDS, SECTION_GROUPS, format_group_fields)
 from services.vector_service import vector_service
 
 class DraftingAgent:
-    def __init__(self):
-        pass
+    def __init__(self, on_field=None):
+        # Called with (key, value) for every top-level SOW field as soon as it has
+        # been generated, so checks can start while the rest is still being decoded
+        self.on_field = on_field
+
+    def complete(self, prompt, use_cache=True):
+        """Run the prompt and return the response text, streaming finished fields to on_field"""
+        if self.on_field is None or not STREAM_VALIDATION:
+            return llm_service.invoke(prompt, use_cache=use_cache).content
+
+        parser = IncrementalJSONParser()
+        chunks = []
+        for chunk in llm_service.stream(prompt, use_cache=use_cache):
+            chunks.append(chunk)
+            if parser is None:
+                continue
+            try:
+                for key, value in parser.feed(chunk):
+                    self.on_field(key, value)
+            except ValueError:
+                # Not valid JSON, stop early checks and leave parsing to the later stages
+                parser = None
+        return "".join(chunks)
     
     def extract_raw_json(self, response_text):
         """
@@ -40,7 +67,53 @@ class DraftingAgent:
             context = self.get_relevant_context(state['user_query'])
             state['additional_context'] = context
             state['retryCount'] = 0
-        
+
+        if state.get('error'):
+            # Repair only the failing sections when every error is tied to a field
+            result = None
+            if state.get('flow') != 'chat' and (state.get('repair_mode') or REPAIR_MODE) == 'targeted':
+                result = self.repair_sections(state)
+            if result is None:
+                result = self.draft(state)
+                result['repair_history'] = state.get('repair_history', []) + [
+                    {'retry': state.get('retryCount', 0), 'mode': 'full', 'fields': None}
+                ]
+            return result
+
+        return self.draft(state)
+
+    def repair_sections(self, state):
+        """
+        Regenerate only the fields named in error_fields and splice them into the
+        previous SOW JSON. Returns None when the errors are not tied to fields or
+        the previous SOW cannot be parsed, in which case the whole SOW is redrafted.
+        """
+        fields = state.get('error_fields')
+        previous = self.extract_raw_json(state.get('sow', '')) if fields else None
+        if not fields or not isinstance(previous, dict):
+            return None
+
+        start = time.perf_counter()
+        current = {field: previous[field] for field in fields if field in previous}
+        instruction = (f"Below is the previously generated content of these sections: {json.dumps(current)} "
+                    f"The following errors were detected: {state['error']}. "
+                    f"Please revise these sections accordingly.")
+        revised = self.draft_group(state, instruction, False, "revised", fields)
+
+        for field in fields:
+            if field in revised:
+                previous[field] = revised[field]
+
+        return {
+            'sow': json.dumps(previous),
+            'drafting_ms': round((time.perf_counter() - start) * 1000, 1),
+            'repair_history': state.get('repair_history', []) + [
+                {'retry': state.get('retryCount', 0), 'mode': 'targeted', 'fields': list(fields)}
+            ]
+        }
+
+    def draft(self, state):
+        """Draft the complete SOW, revising the previous draft when there are errors"""
         # Prepare feedback instruction based on error state
         if state.get('error'):
             previous_content = state.get('sow', '')
@@ -49,22 +122,116 @@ class DraftingAgent:
                         f"Please revise the content accordingly.")
         else:
             instruction = ""
+
+        # Retries after a rejection must reach the model, never replay a cached draft, even
+        # when the rejection left no error in the state
+        use_cache = not state.get('error') and not state.get('retryCount')
         
         # Handle different flow types (normal or chat)
-        if state.get('flow') == 'chat':
+        if state.get('flow') == 'chat' and state.get('chat_mode') == 'patch':
+            result = self.draft_patch(state, use_cache)
+            if result is not None:
+                return result
+            print("⚠️ Patch could not be applied, regenerating the whole SOW")
+            return {**self.draft({**state, 'chat_mode': 'full'}), 'chat_mode': 'full', 'touched_fields': None}
+        elif state.get('flow') == 'chat':
             prompt = drafting_chat_prompt.invoke({
                 "user_query": state['user_query'],
                 "previous_sow": state['previous_sow'],
                 "feedback": instruction,
             })
-            response = llm_service.invoke(prompt)
-            return {'sow': response.content}
+            return {'sow': self.complete(prompt, use_cache)}
+        elif (state.get('drafting_mode') or DRAFTING_MODE) == 'parallel':
+            start = time.perf_counter()
+            sow = self.draft_parallel(state, instruction, use_cache)
+            return {'sow': sow, 'drafting_ms': round((time.perf_counter() - start) * 1000, 1)}
         else:
+            start = time.perf_counter()
             prompt = drafting_prompt_template.invoke({
                 "query": state['user_query'],
                 "additional_context": state['additional_context'],
                 "feedback": instruction,
                 **state['query_map']
             })
-            response = llm_service.invoke(prompt)
-            return {'sow': response.content}
\ No newline at end of file
+            return {'sow': self.complete(prompt, use_cache), 'drafting_ms': round((time.perf_counter() - start) * 1000, 1)}
+
+    def draft_patch(self, state, use_cache):
+        """
+        Ask for field level edit operations instead of the whole SOW and apply them
+        to the current SOW JSON. Returns None when the SOW or the operations cannot
+        be used, in which case the caller regenerates the whole document.
+        """
+        start = time.perf_counter()
+        current = self.extract_raw_json(state.get('sow', ''))
+        if not isinstance(current, dict):
+            return None
+
+        # The current SOW is already part of the prompt, the feedback only carries the errors
+        instruction = ""
+        if state.get('error'):
+            instruction = (f"The following errors were detected after applying the previous operations: "
+                           f"{state['error']}. Please fix them.")
+        prompt = drafting_chat_patch_prompt.invoke({
+            "user_query": state['user_query'],
+            "previous_sow": json.dumps(current),
+            "feedback": instruction,
+        })
+        # Operations are not SOW fields, so they are not streamed to on_field
+        response = self.extract_raw_json(llm_service.invoke(prompt, use_cache=use_cache).content)
+        operations = response.get('operations') if isinstance(response, dict) else response
+        try:
+            patched, touched = apply_patch(current, operations)
+        except PatchError as e:
+            print(f"❌ Invalid patch: {e}")
+            return None
+
+        # Retries keep checking the fields edited by the earlier attempts of this turn
+        if state.get('error'):
+            touched = list(dict.fromkeys((state.get('touched_fields') or []) + touched))
+        return {
+            'sow': json.dumps(patched),
+            'touched_fields': touched,
+            'drafting_ms': round((time.perf_counter() - start) * 1000, 1)
+        }
+
+    def draft_group(self, state, instruction, use_cache, group_name, fields):
+        """Draft one group of SOW sections from the shared project details and context"""
+        prompt = drafting_group_prompt.invoke({
+            "query": state['user_query'],
+            "additional_context": state['additional_context'],
+            "feedback": instruction,
+            "group_name": group_name,
+            "group_fields": format_group_fields(fields),
+            **state['query_map']
+        })
+        return self.extract_raw_json(self.complete(prompt, use_cache)) or {}
+
+    def draft_parallel(self, state, instruction, use_cache):
+        """
+        Draft the section groups concurrently and merge them into one SOW JSON.
+        Fields missing from the merged result are drafted once more together.
+        """
+        # ContextThreadPoolExecutor keeps the graph's callbacks so streamed tokens still reach the client
+        with ContextThreadPoolExecutor(max_workers=len(SECTION_GROUPS)) as executor:
+            futures = {
+                group_name: executor.submit(self.draft_group, state, instruction, use_cache, group_name, fields)
+                for group_name, fields in SECTION_GROUPS.items()
+            }
+            merged = {}
+            for group_name, future in futures.items():
+                group = future.result()
+                for field in SECTION_GROUPS[group_name]:
+                    if field in group:
+                        merged[field] = group[field]
+
+        missing = [field for field in REQUIRED_FIELDS if field not in merged]
+        if missing:
+            print(f"⚠️ Parallel drafting missed fields, drafting them again: {', '.join(missing)}")
+            group = self.draft_group(state, instruction, use_cache, "remaining", missing)
+            for field in missing:
+                if field in group:
+                    merged[field] = group[field]
+
+        # Keep the field order of the full SOW prompt
+        ordered = {field: merged[field] for field in REQUIRED_FIELDS if field in merged}
+        return json.dumps(ordered)
\ No newline at end of file
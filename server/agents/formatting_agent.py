@@ -1,13 +1,24 @@
-import os
+import hashlib
+import json
+import threading
+import time
 import docx
 from docx.shared import Pt, Inches
-import requests
 from io import BytesIO
-from config import LOGO_URL
+from config import LOGO_URL, LOGO_URLS, RENDER_ENGINE, RENDER_TEMPLATE_PATH, DOCX_RENDERING
+from services.asset_cache import asset_cache
+from services.document_store import document_store
+from services.metrics import DOCX_RENDER_DURATION, DOCX_RENDERS_DEFERRED
+from rendering import render_sow
 
 class FormattingAgent:
-    def __init__(self):
-        pass
+    def __init__(self, rendering=DOCX_RENDERING):
+        self.rendering = rendering
+        # Striped locks so concurrent downloads of one SOW version render it once
+        self.render_locks = [threading.Lock() for _ in range(16)]
+        self.deferred = 0
+        self.rendered_on_download = 0
+        self.render_ms = 0.0
         
     def add_paragraph(self, doc, text, size=12):
         """Add a paragraph with specified font size (default 12pt)"""
@@ -134,8 +145,78 @@ class FormattingAgent:
         
         return table
 
-    def generate_sow_document(self, sow_data, output_filename="Generated_SOW_final.docx"):
-        """Generate a DOCX document from SOW data"""
+    def generate_sow_document(self, sow_data, logo_url=LOGO_URL, engine=RENDER_ENGINE):
+        """Generate the DOCX bytes and the markdown of a SOW"""
+        if engine == "legacy":
+            return self.generate_legacy_document(sow_data, logo_url)
+
+        rendered = render_sow(sow_data, logo=asset_cache.get(logo_url))
+        return {"content": rendered["docx"], "formatted_sow_md": rendered["markdown"]}
+
+    def generate_markdown(self, sow_data):
+        return render_sow(sow_data, formats=("markdown",))["markdown"]
+
+    def generate_docx(self, sow_data, logo_url=LOGO_URL, engine=RENDER_ENGINE):
+        if engine == "legacy":
+            return self.generate_legacy_document(sow_data, logo_url)["content"]
+        return render_sow(sow_data, formats=("docx",), logo=asset_cache.get(logo_url))["docx"]
+
+    def mean_render_ms(self):
+        """Mean time to render and store a DOCX on download, None before the first one"""
+        return round(self.render_ms / self.rendered_on_download, 1) if self.rendered_on_download else None
+
+    def store_source(self, sow_data, logo_url, request_id=None):
+        """
+        Store the SOW with everything its DOCX depends on and return its version,
+        the hash of that source
+        """
+        source = json.dumps({"sow": sow_data, "logoUrl": logo_url, "engine": RENDER_ENGINE,
+                             "template": RENDER_TEMPLATE_PATH}, sort_keys=True).encode("utf-8")
+        version = hashlib.sha256(source).hexdigest()
+        return document_store.put(source, request_id=request_id, name=sow_data.get('Project Name'),
+                                  kind="sow", key=version)
+
+    def render_document(self, version):
+        """
+        Digest of the DOCX of a stored SOW version, rendering and storing it on the
+        first request. None when the version is unknown.
+        """
+        with self.render_locks[int(version[:4], 16) % len(self.render_locks)]:
+            meta = document_store.metadata(version)
+            if meta is None:
+                return None
+            if meta.get("document") and document_store.exists(meta["document"]):
+                return meta["document"]
+            source = document_store.load_source(version)
+            if source is None:
+                return None
+
+            start = time.perf_counter()
+            content = self.generate_docx(source["sow"], logo_url=source["logoUrl"], engine=source["engine"])
+            digest = document_store.put(content, name=meta.get("name"))
+            document_store.link(version, digest)
+            elapsed = time.perf_counter() - start
+
+        DOCX_RENDER_DURATION.labels("download").observe(elapsed)
+        self.rendered_on_download += 1
+        self.render_ms += elapsed * 1000
+        print(f"✅ SOW document rendered on download: {version} -> {digest}")
+        return digest
+
+    def stats(self):
+        mean = self.mean_render_ms()
+        return {
+            "rendering": self.rendering,
+            "deferred": self.deferred,
+            "renderedOnDownload": self.rendered_on_download,
+            "meanRenderMs": mean,
+            # Renders moved off the generation path, and the ones never needed because nobody downloaded the file
+            "savedMs": round(self.deferred * mean, 1) if mean is not None else None,
+            "avoidedRenders": max(0, self.deferred - self.rendered_on_download),
+        }
+
+    def generate_legacy_document(self, sow_data, logo_url=LOGO_URL):
+        """Generate a DOCX document from SOW data, building it run by run (RENDER_ENGINE=legacy)"""
         markdown = ''
         newLineChar = '\n\n'
         doc = docx.Document()
@@ -145,16 +226,13 @@ class FormattingAgent:
         font = style.font
         font.size = Pt(12)
         
-        # Add logo at the beginning of the document
-        try:
-            response = requests.get(LOGO_URL)
-            if response.status_code == 200:
-                logo_stream = BytesIO(response.content)
-                doc.add_picture(logo_stream, width=Inches(3))
-            else:
-                print(f"⚠️ Failed to fetch logo from URL: {LOGO_URL}. Status code: {response.status_code}")
-        except Exception as e:
-            print(f"⚠️ Error adding logo: {str(e)}")
+        # Add logo at the beginning of the document, served from the asset cache
+        logo = asset_cache.get(logo_url)
+        if logo:
+            try:
+                doc.add_picture(BytesIO(logo), width=Inches(3))
+            except Exception as e:
+                print(f"⚠️ Error adding logo: {str(e)}")
         
         # Add project name as heading with custom size
         heading = doc.add_heading(sow_data["Project Name"], level=1)
@@ -229,23 +307,34 @@ class FormattingAgent:
         markdown += f"Name: ___________________{newLineChar}"
         markdown += f"Signature: ________________{newLineChar}"
 
-        # Save document
-        static_folder = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static')
-        if not os.path.exists(static_folder):
-            os.makedirs(static_folder)
-
-        output_path = os.path.join(static_folder, output_filename)
-        doc.save(output_path)
-
-        print(f"✅ SOW document generated: {output_filename}")
-        return {"fileName": output_filename, "formatted_sow_md": markdown}
+        buffer = BytesIO()
+        doc.save(buffer)
+        return {"content": buffer.getvalue(), "formatted_sow_md": markdown}
         
     def process_sow(self, state):
         """Process SOW for formatting"""
         try:
-            output_file = self.generate_sow_document(state['validated_sow'])
-            state['doc_file_path'] = output_file['fileName']
-            state['formatted_sow'] = output_file['formatted_sow_md']
+            sow_data = state['validated_sow']
+            logo_url = LOGO_URLS.get(state.get('brand'), LOGO_URL)
+            if self.rendering == "eager":
+                start = time.perf_counter()
+                output_file = self.generate_sow_document(sow_data, logo_url=logo_url)
+                # Stored under its content hash, downloaded from /documents/<doc_file_path>
+                digest = document_store.put(output_file['content'], request_id=state.get('request_id'),
+                                            name=sow_data.get('Project Name'))
+                DOCX_RENDER_DURATION.labels("pipeline").observe(time.perf_counter() - start)
+                print(f"✅ SOW document generated: {digest}")
+                state['doc_file_path'] = f"{digest}.docx"
+                state['formatted_sow'] = output_file['formatted_sow_md']
+                return state
+
+            # Markdown only, the DOCX is rendered from the stored SOW when /documents/<doc_file_path> is first requested
+            state['formatted_sow'] = self.generate_markdown(sow_data)
+            version = self.store_source(sow_data, logo_url, state.get('request_id'))
+            state['doc_file_path'] = f"{version}.docx"
+            state['render_saved_ms'] = self.mean_render_ms()
+            self.deferred += 1
+            DOCX_RENDERS_DEFERRED.inc()
             return state
         except Exception as e:
             state['error'] = f"Document formatting failed: {str(e)}"
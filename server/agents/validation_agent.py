@@ -1,62 +1,223 @@
-from transformers import pipeline
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import VALIDATION_CACHE_SIZE, VALIDATION_CACHE_BACKEND, VALIDATION_CACHE_MAX_ROWS, INFERENCE_BACKEND
+from services.cache import TieredCache, build_store, hash_key
+from services.inference import build_pipeline
 from services.llm_service import llm_service
+from services.registry import registry
+
+TOXICITY_MODEL = "unitary/unbiased-toxic-roberta"
+
+# Labels of unbiased-toxic-roberta that count as toxic content
+TOXIC_LABELS = [
+    "toxicity", "severe_toxicity", "obscene", "threat",
+    "insult", "identity_attack", "sexual_explicit"
+]
+
+# The model accepts 512 tokens including the two special tokens
+WINDOW_TOKENS = 510
+# Overlap between consecutive windows so text split at a boundary is still seen whole
+WINDOW_OVERLAP = 64
+# Larger batches pad more windows to the longest one, which costs more than batching saves on CPU
+BATCH_SIZE = 4
+# Bump when the model, windowing or result format changes so cached results are not reused
+CACHE_VERSION = 1
+
+def load_toxicity_classifier():
+    return build_pipeline("text-classification", TOXICITY_MODEL)
+
+registry.register("toxicity_classifier", load_toxicity_classifier)
 
 class ValidationAgent:
     def __init__(self):
-        self.toxicity_classifier = pipeline(
-            "text-classification", 
-            model="unitary/unbiased-toxic-roberta"
+        # Per-field classification results keyed by a hash of the field text
+        self.cache = TieredCache(
+            "validation",
+            max_size=VALIDATION_CACHE_SIZE,
+            store=build_store(VALIDATION_CACHE_BACKEND, "validation_cache", max_size=VALIDATION_CACHE_MAX_ROWS)
         )
+        # Fields classified in the background while the draft is still streaming, by cache key
+        self.pending = {}
+        self.pending_lock = threading.Lock()
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=1)
+
+    @property
+    def toxicity_classifier(self):
+        return registry.get("toxicity_classifier")
+
+    def cache_key(self, text):
+        # The ONNX backend's scores differ slightly, so results are cached per backend
+        return hash_key(CACHE_VERSION, TOXICITY_MODEL, INFERENCE_BACKEND, WINDOW_TOKENS, WINDOW_OVERLAP, text)
+
+    def split_windows(self, text):
+        """Split text into overlapping windows that fit the model's token limit"""
+        tokenizer = self.toxicity_classifier.tokenizer
+        input_ids = tokenizer(text, add_special_tokens=False)['input_ids']
+        if len(input_ids) <= WINDOW_TOKENS:
+            return [text]
+
+        windows = []
+        step = WINDOW_TOKENS - WINDOW_OVERLAP
+        for start in range(0, len(input_ids), step):
+            windows.append(tokenizer.decode(input_ids[start:start + WINDOW_TOKENS]))
+            if start + WINDOW_TOKENS >= len(input_ids):
+                break
+        return windows
+
+    def classify_texts(self, texts):
+        """
+        Classify many texts in batched pipeline calls. Each text is split into
+        windows and the most toxic window result is returned for it.
+        """
+        windows = []
+        owners = []
+        for index, text in enumerate(texts):
+            for window in self.split_windows(text):
+                windows.append(window)
+                owners.append(index)
+
+        results = [None] * len(texts)
+        if not windows:
+            return results
+
+        # A batch is padded to its longest window: batching windows of similar length keeps short
+        # fields from being padded to the length of a full window
+        order = sorted(range(len(windows)), key=lambda i: len(windows[i]))
+        predictions = [None] * len(windows)
+        sorted_predictions = self.toxicity_classifier([windows[i] for i in order], batch_size=BATCH_SIZE, truncation=True)
+        for i, prediction in zip(order, sorted_predictions):
+            predictions[i] = prediction
+        for index, prediction in zip(owners, predictions):
+            current = results[index]
+            if current is None:
+                results[index] = prediction
+            elif prediction['label'] in TOXIC_LABELS and (
+                    current['label'] not in TOXIC_LABELS or prediction['score'] > current['score']):
+                results[index] = prediction
+        return results
+
+    def classify_cached(self, texts):
+        """
+        Classify texts, only running the model for texts without a cached result.
+        Returns the results along with the number of cache hits and misses.
+        """
+        keys = [self.cache_key(text) for text in texts]
+        results = [self.cache.get(key) for key in keys]
+
+        # Fields still being classified from the draft stream are awaited, not classified twice
+        for index, key in enumerate(keys):
+            with self.pending_lock:
+                future = self.pending.get(key) if results[index] is None else None
+            if future is not None:
+                results[index] = future.result()
+            elif results[index] is None:
+                # The background classification may have finished since the lookup above
+                results[index] = self.cache.memory.get(key)
 
-    def validate_text(self, text, threshold=0.75):
-        """Check text for toxic content"""
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            for index, result in zip(missing, self.classify_texts([texts[i] for i in missing])):
+                results[index] = result
+                self.cache.set(keys[index], result)
+
+        return results, len(texts) - len(missing), len(missing)
+
+    def prevalidate_field(self, key, value):
+        """
+        Start classifying a SOW field that has finished streaming from the LLM, so
+        the validation node finds its result ready instead of running the model.
+        """
+        values = value.values() if isinstance(value, dict) else [value]
+        for item in values:
+            text = self.field_text(item)
+            if not text.strip():
+                continue
+            cache_key = self.cache_key(text)
+            with self.pending_lock:
+                if cache_key in self.pending or self.cache.memory.get(cache_key) is not None:
+                    continue
+                self.pending[cache_key] = self.prefetch_executor.submit(self.prefetch, cache_key, text)
+
+    def prefetch(self, cache_key, text):
         try:
-            result = self.toxicity_classifier(text)[0]
+            result = self.classify_texts([text])[0]
+            self.cache.set(cache_key, result)
+            return result
         except Exception as e:
-            return text, None
-        
-        toxic_labels = [
-            "toxicity", "severe_toxicity", "obscene", "threat",
-            "insult", "identity_attack", "sexual_explicit"
-        ]
-        
-        if result['label'] in toxic_labels and result['score'] > threshold:
+            print(f"⚠️ Background validation failed: {str(e)}")
+            return None
+        finally:
+            with self.pending_lock:
+                self.pending.pop(cache_key, None)
+
+    def toxicity_error(self, text, result, threshold=0.75):
+        """Build the error message for a classification result, or None if the text is clean"""
+        if result and result['label'] in TOXIC_LABELS and result['score'] > threshold:
             error_msg = (f"[⚠ TOXIC CONTENT DETECTED] Text validation failed: {text}. "
                         f"Reason: {result['label']} with score {round(result['score']*100, 2)}%")
             print(error_msg)
-            return text, error_msg
-            
-        return text, None
+            return error_msg
+        return None
 
-    def validate_sow_data(self, sow_data):
-        """Validate SOW data for toxic content"""
-        validated_data = {}
-        errors = {}
-        
+    def field_text(self, value):
+        """Flatten a SOW field value (string, list of rows, number) into plain text"""
+        if isinstance(value, str):
+            return value
+        if isinstance(value, list):
+            parts = []
+            for item in value:
+                if isinstance(item, dict):
+                    parts.extend(str(v) for v in item.values() if v)
+                elif item:
+                    parts.append(str(item))
+            return "\n".join(parts)
+        if value is None:
+            return ""
+        return str(value)
+
+    def validate_sow_data(self, sow_data, threshold=0.75, cache_stats=None, fields=None):
+        """
+        Validate SOW data for toxic content, only the given fields when set. When a
+        cache_stats dict is given, the cache hits and misses of this call are added to it.
+        """
+        # Collect every field and nested dict sub-field so they can be classified together
+        targets = []
         for key, value in sow_data.items():
+            if fields is not None and key not in fields:
+                continue
             if isinstance(value, dict):
-                validated_subsection = {}
-                subsection_errors = {}
-                
                 for subkey, subvalue in value.items():
-                    valid_text, error = self.validate_text(subvalue)
-                    validated_subsection[subkey] = valid_text
-                    
-                    if error:
-                        subsection_errors[subkey] = error
-                
-                validated_data[key] = validated_subsection
-                
-                if subsection_errors:
-                    errors[key] = subsection_errors
+                    targets.append((key, subkey, subvalue))
+            else:
+                targets.append((key, None, value))
+
+        texts = [self.field_text(value) for _, _, value in targets]
+        pending = [index for index, text in enumerate(texts) if text.strip()]
+        results = [None] * len(targets)
+        classified, hits, misses = self.classify_cached([texts[i] for i in pending])
+        for index, result in zip(pending, classified):
+            results[index] = result
+
+        if cache_stats is not None:
+            cache_stats['hits'] = cache_stats.get('hits', 0) + hits
+            cache_stats['misses'] = cache_stats.get('misses', 0) + misses
+
+        errors = {}
+        for (key, subkey, value), result in zip(targets, results):
+            error = self.toxicity_error(value, result, threshold)
+            if not error:
+                continue
+            if subkey is None:
+                errors[key] = error
             else:
-                valid_text, error = self.validate_text(value)
-                validated_data[key] = valid_text
-                
-                if error:
-                    errors[key] = error
-                    
+                errors.setdefault(key, {})[subkey] = error
+
+        # Validation does not rewrite content, the data passes through unchanged
+        validated_data = {
+            key: dict(value) if isinstance(value, dict) else value
+            for key, value in sow_data.items()
+        }
         return validated_data, errors
 
     def process_sow(self, state):
@@ -67,16 +228,39 @@ class ValidationAgent:
             except Exception as parse_error:
                 sow_data = llm_service.extract_json_from_sow(state['sow'])
 
-            validated_data, errors = self.validate_sow_data(sow_data)
-            
-            if errors:
-                state['error'] = json.dumps(errors)
-                return {'feedback': 'REJECTED', 'retryCount': state['retryCount'] + 1}
+            cache_stats = {'hits': 0, 'misses': 0}
+            validated_data, errors = self.validate_sow_data(
+                sow_data, cache_stats=cache_stats, fields=state.get('touched_fields')
+            )
+
+            if errors or state.get('error'):
+                # Carry both compliance and validation errors back to drafting, along
+                # with the fields they apply to (None means the whole document)
+                error_fields = state.get('error_fields', [])
+                if errors:
+                    if error_fields is not None:
+                        error_fields = list(dict.fromkeys(error_fields + list(errors.keys())))
+                    error = json.dumps(errors)
+                    if state.get('error'):
+                        error = f"{state['error']}. Validation errors: {error}"
+                else:
+                    error = state['error']
+                return {
+                    'feedback': 'REJECTED',
+                    'retryCount': state['retryCount'] + 1,
+                    'error': error,
+                    'error_fields': error_fields,
+                    'validation_cache': cache_stats
+                }
             else:
                 state['validated_sow'] = validated_data
-                state.pop('error', None)
-                return {'feedback': 'ACCEPTED', 'validated_sow': validated_data}
-                
+                return {
+                    'feedback': 'ACCEPTED',
+                    'validated_sow': validated_data,
+                    'error': None,
+                    'error_fields': [],
+                    'validation_cache': cache_stats
+                }
+
         except Exception as e:
-            state['error'] = str(e)
-            return {'feedback': 'REJECTED', 'retryCount': state['retryCount'] + 1}
\ No newline at end of file
+            return {'feedback': 'REJECTED', 'retryCount': state['retryCount'] + 1, 'error': str(e), 'error_fields': None}
@@ -1,16 +1,25 @@
+import threading
 from flask import Flask
 from flask_cors import CORS
-from config import POSTGRESQL_BASE_URL
+from config import MODEL_LOADING, LOGO_URL, LOGO_URLS
 
 from models.sow import db
-from routes import sow_bp, chat_bp, feedback_bp
+from routes import sow_bp, chat_bp, feedback_bp, job_bp, health_bp, document_bp, session_bp
+from services.registry import registry
+from services.asset_cache import asset_cache
+from services.db import database_url
 
-def create_app():
-    """Application factory function to create and configure the Flask app"""
+def create_app(background_warm_up=True):
+    """
+    Application factory function to create and configure the Flask app.
+    background_warm_up=False leaves MODEL_LOADING=background to the caller, e.g.
+    gunicorn starts it in each worker since threads do not survive the fork.
+    """
     app = Flask(__name__, static_folder='static')
     
     # Configure the application
-    app.config["SQLALCHEMY_DATABASE_URI"] = f"postgresql://{POSTGRESQL_BASE_URL}"
+    # The engine itself is the shared one from services/db.py, see models/sow.py
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url()
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     
     # Initialize extensions
@@ -21,6 +30,20 @@ def create_app():
     app.register_blueprint(sow_bp)
     app.register_blueprint(chat_bp)
     app.register_blueprint(feedback_bp)
+    app.register_blueprint(job_bp)
+    app.register_blueprint(health_bp)
+    app.register_blueprint(document_bp)
+    app.register_blueprint(session_bp)
+
+    # Load model weights up front instead of on the first request
+    if MODEL_LOADING == "eager":
+        registry.warm_up(kind="model")
+    elif MODEL_LOADING == "background" and background_warm_up:
+        threading.Thread(target=registry.warm_up, kwargs={"kind": "model"}, daemon=True).start()
+
+    # Fetch logos in the background so the first document does not wait on the network
+    for url in {LOGO_URL, *LOGO_URLS.values()}:
+        asset_cache.prefetch(url)
     
     return app
 
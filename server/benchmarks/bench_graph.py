@@ -0,0 +1,177 @@
+"""
+Per-node latency of the SOW graph with fake LLM and vector backends. The real
+drafting, compliance, validation and formatting agents run over a corpus of
+representative forms at each concurrency level, and the results are written
+as JSON so runs can be compared across commits.
+
+Run from the server directory:
+    python -m benchmarks.bench_graph --concurrency 1 4 8 --forms 24 --output bench_graph.json
+
+--fake-classifiers replaces the toxicity model with a fixed-cost stand-in on
+machines without the model weights.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+NODES = ["get_relevant_context", "drafting_agent", "compliance_agent", "validation_agent", "formatting_agent"]
+
+def percentile(samples, q):
+    """Nearest-rank percentile, q in [0, 100]"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+def summarize(samples):
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "mean": round(statistics.fmean(samples), 1),
+        "p50": round(percentile(samples, 50), 1),
+        "p90": round(percentile(samples, 90), 1),
+        "p99": round(percentile(samples, 99), 1),
+        "max": round(max(samples), 1),
+    }
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def run_form(graph, inputs, graph_config):
+    """
+    Run one form through the graph. Node durations are measured from the node_start
+    custom event to the node's state update.
+    """
+    started = {}
+    durations = []
+    drafts = 0
+    start = time.perf_counter()
+    for mode, chunk in graph.stream(inputs, graph_config(inputs["session_id"]), stream_mode=["custom", "updates"]):
+        now = time.perf_counter()
+        if mode == "custom" and chunk.get("event") == "node_start":
+            started[chunk["node"]] = now
+        elif mode == "updates":
+            for node in chunk:
+                if node in started:
+                    durations.append((node, (now - started.pop(node)) * 1000))
+                if node == "drafting_agent":
+                    drafts += 1
+    return {"totalMs": (time.perf_counter() - start) * 1000, "nodes": durations, "retries": max(0, drafts - 1)}
+
+def run_level(graph, forms, concurrency, build_form_state, build_query_map, graph_config, drafting_mode):
+    inputs = [build_form_state(build_query_map(form), drafting_mode=drafting_mode) for form in forms]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        runs = list(executor.map(lambda state: run_form(graph, state, graph_config), inputs))
+    wall = time.perf_counter() - start
+
+    node_samples = {node: [] for node in NODES}
+    for run in runs:
+        for node, ms in run["nodes"]:
+            node_samples.setdefault(node, []).append(ms)
+    retries = [run["retries"] for run in runs]
+    return {
+        "concurrency": concurrency,
+        "forms": len(forms),
+        "wallSeconds": round(wall, 3),
+        "formsPerMinute": round(len(forms) / wall * 60, 2),
+        "formLatencyMs": summarize([run["totalMs"] for run in runs]),
+        "nodeLatencyMs": {node: summarize(samples) for node, samples in node_samples.items()},
+        "retries": {"total": sum(retries), "mean": round(statistics.fmean(retries), 2), "max": max(retries)},
+        "peakRssMb": peak_rss_mb(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--forms", type=int, default=12, help="Forms per concurrency level")
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--llm-jitter-ms", type=float, default=200)
+    parser.add_argument("--vector-latency-ms", type=float, default=50)
+    parser.add_argument("--reject-rate", type=float, default=0.2, help="Share of drafts missing a required field")
+    parser.add_argument("--long-words", type=int, default=400, help="Words in each long section of the canned SOW")
+    parser.add_argument("--drafting-mode", choices=["single", "parallel"], default="single")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fake-classifiers", action="store_true")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    # Only the in-process caches, so persistent results of earlier runs are not reused
+    os.environ["VALIDATION_CACHE_BACKEND"] = ""
+    os.environ["LLM_CACHE_BACKEND"] = ""
+    os.environ["EMBEDDING_CACHE_BACKEND"] = ""
+    # Checkpoints are written after every node as in production, kept in memory
+    os.environ["CHECKPOINT_BACKEND"] = "memory"
+
+    from benchmarks.fakes import FakeLLMService, FakeToxicityClassifier, FakeVectorService
+    from benchmarks.forms import corpus
+    from services.registry import registry
+    from graph.inputs import build_form_state, build_query_map
+    from graph.sessions import graph_config
+    from graph.sow_graph import graph, compliance_agent, validation_agent
+
+    llm = FakeLLMService(
+        latency_ms=args.llm_latency_ms, jitter_ms=args.llm_jitter_ms, reject_rate=args.reject_rate,
+        seed=args.seed, long_words=args.long_words, droppable=compliance_agent.required_fields
+    )
+    registry.override("llm_service", llm)
+    registry.override("vector_service", FakeVectorService(latency_ms=args.vector_latency_ms))
+    if args.fake_classifiers:
+        registry.override("toxicity_classifier", FakeToxicityClassifier(), kind="model")
+
+    # Load the classifier before measuring. The spaCy and clause models only
+    # analyse SOWs that are not JSON, which the fake LLM never returns
+    registry.get("toxicity_classifier")
+
+    forms = corpus(args.forms)
+    levels = []
+    for concurrency in args.concurrency:
+        validation_agent.cache.memory.clear()
+        levels.append(run_level(graph, forms, concurrency, build_form_state, build_query_map, graph_config,
+                                args.drafting_mode))
+
+    print(f"{'concurrency':>11} {'forms/min':>10} {'p50 ms':>9} {'p90 ms':>9} {'retries':>8} {'peak RSS MB':>12}")
+    for level in levels:
+        print(f"{level['concurrency']:>11} {level['formsPerMinute']:>10.1f} {level['formLatencyMs']['p50']:>9.0f} "
+              f"{level['formLatencyMs']['p90']:>9.0f} {level['retries']['total']:>8} {level['peakRssMb']:>12.1f}")
+    for level in levels:
+        print(f"\nconcurrency {level['concurrency']}")
+        print(f"  {'node':<22} {'count':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for node, stats in level["nodeLatencyMs"].items():
+            if stats["count"]:
+                print(f"  {node:<22} {stats['count']:>6} {stats['p50']:>9.1f} {stats['p90']:>9.1f} "
+                      f"{stats['p99']:>9.1f} {stats['max']:>9.1f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({
+                "benchmark": "graph",
+                "commit": git_commit(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "python": platform.python_version(),
+                "settings": vars(args),
+                "llmCalls": llm.calls,
+                "injectedRejections": llm.rejections,
+                "levels": levels,
+            }, file, indent=2)
+        print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    main()
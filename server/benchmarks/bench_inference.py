@@ -0,0 +1,107 @@
+"""
+Latency, throughput and RSS of the toxicity and zero-shot clause classifiers on
+the PyTorch and the int8 quantized ONNX Runtime backends, plus an agreement check
+of their outputs. Each backend runs in its own interpreter so RSS is not shared.
+
+Export the ONNX models first (python export_onnx_models.py), then run from the
+server directory:
+    python -m benchmarks.bench_inference --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Documented tolerance of the quantized backend against PyTorch
+SCORE_TOLERANCE = 0.03
+
+PROBE = """
+import json, resource, sys, time
+from agents.compliance_agent import CLAUSE_MODEL
+from agents.validation_agent import TOXICITY_MODEL
+from benchmarks.sample_data import SENTENCES, paragraph
+from services.inference import build_pipeline
+
+backend, repeat = sys.argv[1], int(sys.argv[2])
+texts = SENTENCES + [paragraph(120), paragraph(300)]
+clauses = ["confidentiality", "termination", "liability"]
+
+start = time.perf_counter()
+toxicity = build_pipeline("text-classification", TOXICITY_MODEL, backend=backend)
+zero_shot = build_pipeline("zero-shot-classification", CLAUSE_MODEL, backend=backend)
+load_seconds = time.perf_counter() - start
+
+def timed(fn):
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+toxicity_ms = timed(lambda: toxicity(texts, batch_size=16, truncation=True))
+zero_shot_ms = timed(lambda: zero_shot(texts[-1], clauses, multi_label=True))
+
+toxicity_out = toxicity(texts, batch_size=16, truncation=True)
+zero_shot_out = zero_shot(texts[-1], clauses, multi_label=True)
+print(json.dumps({
+    "loadSeconds": load_seconds,
+    "texts": len(texts),
+    "toxicityMs": toxicity_ms,
+    "zeroShotMs": zero_shot_ms,
+    "maxRssMb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "toxicity": [[r["label"], r["score"]] for r in toxicity_out],
+    "zeroShot": dict(zip(zero_shot_out["labels"], zero_shot_out["scores"])),
+}))
+"""
+
+def run_backend(backend, repeat):
+    server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, backend, str(repeat)], cwd=server_dir,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def compare(reference, candidate):
+    """Return (label mismatches, max absolute score difference) of candidate against reference"""
+    mismatches = 0
+    max_diff = 0.0
+    for (ref_label, ref_score), (label, score) in zip(reference["toxicity"], candidate["toxicity"]):
+        if ref_label != label:
+            mismatches += 1
+        else:
+            max_diff = max(max_diff, abs(ref_score - score))
+    for label, ref_score in reference["zeroShot"].items():
+        max_diff = max(max_diff, abs(ref_score - candidate["zeroShot"][label]))
+    return mismatches, max_diff
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backends", nargs="+", default=["pytorch", "onnx"])
+    args = parser.parse_args()
+
+    results = {backend: run_backend(backend, args.repeat) for backend in args.backends}
+
+    print(f"{'backend':<10} {'load s':>8} {'toxicity ms':>12} {'texts/s':>9} {'zero-shot ms':>13} {'max RSS MB':>11}")
+    for backend, result in results.items():
+        toxicity_ms = statistics.median(result["toxicityMs"])
+        print(f"{backend:<10} {result['loadSeconds']:>8.1f} {toxicity_ms:>12.1f} "
+              f"{result['texts'] / (toxicity_ms / 1000):>9.1f} {statistics.median(result['zeroShotMs']):>13.1f} "
+              f"{result['maxRssMb']:>11.1f}")
+
+    if "pytorch" in results:
+        for backend, result in results.items():
+            if backend == "pytorch":
+                continue
+            mismatches, max_diff = compare(results["pytorch"], result)
+            status = "OK" if not mismatches and max_diff <= SCORE_TOLERANCE else "OUT OF TOLERANCE"
+            print(f"{backend} vs pytorch: {mismatches} label mismatches, max score diff {max_diff:.4f} "
+                  f"(tolerance {SCORE_TOLERANCE}) {status}")
+
+if __name__ == "__main__":
+    main()
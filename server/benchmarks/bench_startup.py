@@ -0,0 +1,52 @@
+"""
+Cold-start time and resident memory of create_app() for each MODEL_LOADING mode.
+Every mode runs in a fresh interpreter so imports and model loads are measured cold.
+
+Run from the server directory:
+    python -m benchmarks.bench_startup --modes lazy eager
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROBE = """
+import json, resource, time
+start = time.perf_counter()
+from app import create_app
+app = create_app()
+startup = time.perf_counter() - start
+client = app.test_client()
+start = time.perf_counter()
+response = client.get('/readyz')
+print(json.dumps({
+    "startupSeconds": round(startup, 3),
+    "readyzMs": round((time.perf_counter() - start) * 1000, 1),
+    "readyzStatus": response.status_code,
+    "maxRssMb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+}))
+"""
+
+def measure(mode):
+    env = dict(os.environ, MODEL_LOADING=mode)
+    server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=server_dir, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    # Model loading prints progress, the measurement is the last line
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=["lazy", "eager"])
+    args = parser.parse_args()
+
+    print(f"{'mode':<12} {'startup s':>10} {'readyz':>8} {'max RSS MB':>11}")
+    for mode in args.modes:
+        result = measure(mode)
+        print(f"{mode:<12} {result['startupSeconds']:>10.2f} {result['readyzStatus']:>8} {result['maxRssMb']:>11.1f}")
+
+if __name__ == "__main__":
+    main()
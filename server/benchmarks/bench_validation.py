@@ -0,0 +1,110 @@
+"""
+Per-SOW toxicity validation time on CPU: the previous one-call-per-field path
+versus the batched, windowed ValidationAgent.validate_sow_data.
+
+Run from the server directory:
+    python -m benchmarks.bench_validation --repeat 5
+
+On a host that cannot download unitary/unbiased-toxic-roberta, --stand-in runs
+the same roberta-base architecture with random weights and a byte-level BPE
+tokenizer trained on the sample SOW. Weights do not change CPU time; the token
+count per word is printed so it can be compared with the real tokenizer's.
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.sample_data import sample_sow
+
+# Labels of unbiased-toxic-roberta, in its order
+MODEL_LABELS = [
+    "toxicity", "severe_toxicity", "obscene", "identity_attack", "insult", "threat", "sexual_explicit",
+    "male", "female", "homosexual_gay_or_lesbian", "christian", "jewish", "muslim", "black", "white",
+    "psychiatric_or_mental_illness",
+]
+
+def stand_in_classifier(corpus, vocab_size=1000):
+    """Text classification pipeline with the toxicity model's architecture and random weights"""
+    from tokenizers import ByteLevelBPETokenizer
+    from tokenizers.processors import RobertaProcessing
+    from transformers import PreTrainedTokenizerFast, RobertaConfig, RobertaForSequenceClassification, pipeline
+
+    specials = ["<s>", "<pad>", "</s>", "<unk>", "<mask>"]
+    bpe = ByteLevelBPETokenizer()
+    bpe.train_from_iterator(corpus, vocab_size=vocab_size, special_tokens=specials)
+    bpe.post_processor = RobertaProcessing(("</s>", bpe.token_to_id("</s>")), ("<s>", bpe.token_to_id("<s>")))
+    tokenizer = PreTrainedTokenizerFast(tokenizer_object=bpe._tokenizer, bos_token="<s>", pad_token="<pad>", eos_token="</s>",
+                                        unk_token="<unk>", mask_token="<mask>", model_max_length=512)
+
+    # roberta-base dimensions, as the toxicity model
+    config = RobertaConfig(vocab_size=len(tokenizer), max_position_embeddings=514, type_vocab_size=1,
+                           pad_token_id=tokenizer.pad_token_id, problem_type="multi_label_classification",
+                           id2label=dict(enumerate(MODEL_LABELS)), label2id={l: i for i, l in enumerate(MODEL_LABELS)})
+    model = RobertaForSequenceClassification(config).eval()
+    return pipeline("text-classification", model=model, tokenizer=tokenizer, framework="pt", device=-1)
+
+def legacy_validate(agent, sow_data, threshold=0.75):
+    """The original implementation: one forward pass per field, errors treated as clean"""
+    errors = {}
+    failed = 0
+    for key, value in sow_data.items():
+        values = value.items() if isinstance(value, dict) else [(None, value)]
+        for subkey, text in values:
+            try:
+                result = agent.toxicity_classifier(text)[0]
+            except Exception:
+                failed += 1
+                continue
+            if agent.toxicity_error(text, result, threshold):
+                errors[(key, subkey)] = result
+    return errors, failed
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--long-words", type=int, default=700, help="Words in each long SOW section")
+    parser.add_argument("--stand-in", action="store_true", help="Random-weight model of the same architecture")
+    args = parser.parse_args()
+
+    from agents.validation_agent import ValidationAgent
+    from services.registry import registry
+    sow = sample_sow(long_words=args.long_words)
+    agent = ValidationAgent()
+    texts = [agent.field_text(value) for value in sow.values()]
+    if args.stand_in:
+        registry.register("toxicity_classifier", lambda: stand_in_classifier(texts))
+    # Every batched run classifies the SOW again instead of reading the results of the previous one
+    agent.cache.store = None
+
+    def batched_validate():
+        agent.cache.memory.clear()
+        agent.validate_sow_data(sow)
+
+    # Warm up both paths so model loading is not measured
+    legacy_validate(agent, sow)
+    batched_validate()
+
+    _, skipped = legacy_validate(agent, sow)
+    legacy = timed(lambda: legacy_validate(agent, sow), args.repeat)
+    batched = timed(batched_validate, args.repeat)
+
+    tokenizer = agent.toxicity_classifier.tokenizer
+    words = sum(len(text.split()) for text in texts)
+    tokens = sum(len(tokenizer(text, add_special_tokens=False)["input_ids"]) for text in texts)
+    print(f"Fields: {len(sow)}, {words} words, {tokens / words:.2f} tokens per word  "
+          f"(legacy path skipped {skipped} fields it could not classify)")
+    print(f"{'path':<10} {'median ms':>10} {'min ms':>10} {'max ms':>10}")
+    for name, samples in (("legacy", legacy), ("batched", batched)):
+        print(f"{name:<10} {statistics.median(samples):>10.1f} {min(samples):>10.1f} {max(samples):>10.1f}")
+    print(f"speedup: {statistics.median(legacy) / statistics.median(batched):.2f}x")
+
+if __name__ == "__main__":
+    main()
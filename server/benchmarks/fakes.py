@@ -0,0 +1,146 @@
+"""
+Replayable stand-ins for llm_service, vector_service and the toxicity classifier.
+Responses, latencies and injected rejections are derived from a hash of the
+prompt, so a run is reproducible regardless of thread scheduling.
+"""
+import json
+import re
+import threading
+import time
+import uuid
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+
+from benchmarks.sample_data import paragraph, sample_sow
+from services.cache import hash_key
+
+def prompt_text(prompt):
+    """All message contents of a prompt value, or the prompt itself when it is a string"""
+    if hasattr(prompt, "to_messages"):
+        return "\n".join(message.content for message in prompt.to_messages())
+    return str(prompt)
+
+def draw(seed, *parts):
+    """Deterministic number in [0, 1) for the given parts"""
+    return int(hash_key(seed, *parts)[:8], 16) / 0x100000000
+
+class FakeLLMService:
+    """
+    Answers drafting prompts with canned SOW JSON after a configurable latency.
+    Full and section-group drafts drop one of the droppable fields (the fields
+    compliance requires) with probability reject_rate, which makes compliance
+    reject the draft and exercises the repair loop.
+    """
+
+    def __init__(self, latency_ms=800, jitter_ms=200, reject_rate=0.0, seed=0,
+                 long_words=400, short_words=40, chunk_chars=40, droppable=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.reject_rate = reject_rate
+        self.seed = seed
+        self.template = sample_sow(long_words=long_words, short_words=short_words)
+        self.chunk_chars = chunk_chars
+        self.droppable = droppable
+        self.calls = 0
+        self.rejections = 0
+        self.lock = threading.Lock()
+
+    def requested_fields(self, text):
+        """Fields of a section-group prompt, every field for a full draft"""
+        if "You are drafting only the" not in text:
+            return list(self.template)
+        structure = text.split("#Required JSON Structure:")[1].split("#Input Mapping Instructions:")[0]
+        return re.findall(r'^- "([^"]+)":', structure, re.MULTILINE)
+
+    def respond(self, text):
+        digest = hash_key(self.seed, text)[:8]
+        if "edit operations" in text:
+            return json.dumps({"operations": [
+                {"op": "replace", "field": "Fees", "value": f"{paragraph(60)} Ref {digest}."}
+            ]})
+
+        # Field text varies per prompt so validation results are not shared between forms
+        sow = {}
+        for field in self.requested_fields(text):
+            value = self.template.get(field, paragraph(40))
+            sow[field] = f"{value} Ref {digest}." if isinstance(value, str) else value
+
+        # Revisions after a rejection are always complete so every form converges
+        candidates = sorted(field for field in sow if self.droppable is None or field in self.droppable)
+        if ("errors were detected" not in text and candidates and self.reject_rate
+                and draw(self.seed, "reject", text) < self.reject_rate):
+            sow.pop(candidates[int(draw(self.seed, "field", text) * len(candidates))])
+            with self.lock:
+                self.rejections += 1
+        return json.dumps(sow)
+
+    def latency(self, text):
+        """Seconds to answer a prompt, latency_ms +/- jitter_ms"""
+        return max(0.0, self.latency_ms + (draw(self.seed, "latency", text) * 2 - 1) * self.jitter_ms) / 1000
+
+    def invoke(self, prompt, use_cache=True):
+        text = prompt_text(prompt)
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency(text))
+        return AIMessage(content=self.respond(text))
+
+    def stream(self, prompt, use_cache=True):
+        text = prompt_text(prompt)
+        with self.lock:
+            self.calls += 1
+        content = self.respond(text)
+        chunks = [content[i:i + self.chunk_chars] for i in range(0, len(content), self.chunk_chars)]
+        # The latency is spread over the chunks like token decoding
+        delay = self.latency(text) / len(chunks)
+        for chunk in chunks:
+            time.sleep(delay)
+            yield chunk
+
+    def extract_json_from_sow(self, raw_sow, use_cache=True):
+        return json.loads(self.respond(raw_sow))
+
+    def cache_stats(self):
+        return {"hits": 0, "misses": self.calls, "hitRatio": 0.0, "size": 0, "savedMs": 0.0}
+
+class FakeEmbeddings:
+    def stats(self):
+        return {"hits": 0, "misses": 0, "hitRatio": 0.0, "size": 0, "savedMs": 0.0}
+
+class FakeVectorService:
+    """Returns k canned reference documents after a configurable retrieval latency"""
+
+    def __init__(self, latency_ms=50, k=2, words=300):
+        self.latency_ms = latency_ms
+        self.documents = [
+            Document(page_content=paragraph(words), metadata={"id": str(uuid.uuid4()), "fileName": f"SOW_{number}"})
+            for number in range(1, k + 1)
+        ]
+        self.embeddings = FakeEmbeddings()
+
+    def retrieve_context(self, query):
+        time.sleep(self.latency_ms / 1000)
+        return list(self.documents)
+
+    def store_document(self, content, file_name="user_generated_sow"):
+        time.sleep(self.latency_ms / 1000)
+        return str(uuid.uuid4())
+
+class WhitespaceTokenizer:
+    def __call__(self, text, add_special_tokens=False):
+        return {"input_ids": text.split()}
+
+    def decode(self, ids):
+        return " ".join(ids)
+
+class FakeToxicityClassifier:
+    """Pipeline stand-in with a fixed per-text cost, for machines without the model weights"""
+
+    def __init__(self, ms_per_text=5):
+        self.ms_per_text = ms_per_text
+        self.tokenizer = WhitespaceTokenizer()
+
+    def __call__(self, texts, **kwargs):
+        texts = [texts] if isinstance(texts, str) else texts
+        time.sleep(self.ms_per_text * len(texts) / 1000)
+        return [{"label": "toxicity", "score": 0.01} for _ in texts]
@@ -0,0 +1,85 @@
+"""Representative generate-sow request bodies, from a terse form to a fully detailed one"""
+from benchmarks.sample_data import paragraph
+
+FORMS = [
+    {
+        "projectObjectives": "Migrate the on-premise SQL Server data warehouse to Azure Synapse and retire the legacy SSIS jobs.",
+        "projectScope": "Assessment, migration of 40 databases, re-implementation of 120 SSIS packages as Data Factory pipelines.",
+        "servicesDescription": paragraph(120),
+        "specificFeatures": "Incremental loads, data quality checks, lineage in Purview, Power BI semantic model refresh.",
+        "platformsTechnologies": "Azure Synapse, Azure Data Factory, Purview, Power BI, Terraform.",
+        "integrations": "SAP ECC extracts over ODBC, Salesforce REST API, SFTP drops from logistics partners.",
+        "designSpecifications": "Medallion architecture with bronze, silver and gold zones; RBAC through Entra ID groups.",
+        "outOfScope": "Report redesign, SAP upgrades, end user training beyond two sessions.",
+        "deliverables": "Migration runbook, pipelines in Git, test evidence, handover documentation.",
+        "timeline": "16 weeks: assessment 3 weeks, build 9 weeks, parallel run 3 weeks, cutover 1 week.",
+    },
+    {
+        "projectObjectives": "Build a patient appointment booking mobile app for a regional clinic network.",
+        "projectScope": "iOS and Android apps, booking API, admin portal for clinic staff.",
+        "servicesDescription": "Design, development, testing and app store release.",
+        "specificFeatures": "Slot search, reminders, cancellations, waitlist, telehealth links.",
+        "platformsTechnologies": "React Native, Node.js, PostgreSQL, AWS.",
+        "integrations": "Existing EHR scheduling module over HL7 FHIR.",
+        "designSpecifications": "WCAG 2.1 AA, HIPAA aligned hosting, 99.9% availability.",
+        "outOfScope": "Billing, insurance verification.",
+        "deliverables": "Apps in both stores, API, admin portal, source code.",
+        "timeline": "6 months.",
+    },
+    {
+        "projectObjectives": "Penetration test of the customer facing web platform.",
+        "projectScope": "External web application and API testing.",
+        "servicesDescription": "NA",
+        "specificFeatures": "NA",
+        "platformsTechnologies": "NA",
+        "integrations": "NA",
+        "designSpecifications": "NA",
+        "outOfScope": "Social engineering, physical security.",
+        "deliverables": "Findings report and retest letter.",
+        "timeline": "3 weeks.",
+    },
+    {
+        "projectObjectives": paragraph(80),
+        "projectScope": paragraph(150),
+        "servicesDescription": paragraph(300),
+        "specificFeatures": paragraph(200),
+        "platformsTechnologies": "Kubernetes, Kafka, Go, React, PostgreSQL, Redis, Grafana, ArgoCD.",
+        "integrations": paragraph(100),
+        "designSpecifications": paragraph(150),
+        "outOfScope": paragraph(60),
+        "deliverables": paragraph(120),
+        "timeline": "Four phases over 12 months with quarterly steering reviews.",
+    },
+    {
+        "projectObjectives": "Implement Salesforce Service Cloud for the customer support team of 200 agents.",
+        "projectScope": "Case management, knowledge base, omni-channel routing, CTI integration.",
+        "servicesDescription": paragraph(60),
+        "specificFeatures": "Entitlements and SLAs, macros, customer portal on Experience Cloud.",
+        "platformsTechnologies": "Salesforce Service Cloud, Experience Cloud, MuleSoft.",
+        "integrations": "Genesys CTI, ERP order lookup via MuleSoft.",
+        "designSpecifications": "Declarative configuration first, Apex only where required.",
+        "outOfScope": "Marketing Cloud, data migration older than 3 years.",
+        "deliverables": "Configured org, test scripts, admin guide, training.",
+        "timeline": "10 weeks including 2 weeks hypercare.",
+    },
+    {
+        "projectObjectives": "Managed security operations for 12 months.",
+        "projectScope": "24x7 monitoring, incident response, monthly reporting for 3,000 endpoints.",
+        "servicesDescription": paragraph(90),
+        "specificFeatures": "Threat hunting, playbooks, quarterly tabletop exercises.",
+        "platformsTechnologies": "Microsoft Sentinel, Defender for Endpoint.",
+        "integrations": "ServiceNow ITSM for ticketing.",
+        "designSpecifications": "15 minute response for critical alerts.",
+        "outOfScope": "Forensics beyond 40 hours per quarter.",
+        "deliverables": "Monthly service reports, incident reports, annual review.",
+        "timeline": "12 months from onboarding, 4 week onboarding period.",
+    },
+]
+
+def corpus(size):
+    """size forms cycling through FORMS, numbered so repeats are distinct requests"""
+    forms = []
+    for index in range(size):
+        form = FORMS[index % len(FORMS)]
+        forms.append(dict(form, projectObjectives=f"{form['projectObjectives']} (request {index + 1})"))
+    return forms
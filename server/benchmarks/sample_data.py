@@ -0,0 +1,69 @@
+"""Synthetic but representative SOW data used by the benchmarks"""
+
+STRING_FIELDS = [
+    "Project Name", "Project Title", "Start Date", "End Date", "SOW Effective Date",
+    "Agreement Date", "Company Information", "Company Name", "Client Name", "Client",
+    "Client Contact", "Contact", "Services Description", "Deliverables", "Acceptance",
+    "Personnel and Locations", "Representatives", "Client Representatives",
+    "Terms & Conditions", "Fees", "Expenses", "Taxes", "Conversion",
+    "Limitation of Liability", "Service Level Agreement", "Assumptions", "Scope of Work",
+    "Change Process", "Payment Terms", "Timeline", "Confidentiality",
+    "Intellectual Property", "Termination"
+]
+
+# Fields the drafting prompt asks to be long, multi-paragraph sections
+LONG_FIELDS = [
+    "Services Description", "Deliverables", "Scope of Work", "Assumptions",
+    "Service Level Agreement", "Limitation of Liability", "Terms & Conditions"
+]
+
+SENTENCES = [
+    "The Provider shall perform all Services in a professional and workmanlike manner consistent with industry standards.",
+    "Deliverables will be submitted to the Client Representative for review within five (5) business days of completion.",
+    "Any change to the scope of work must be documented through the change request process described in this SOW.",
+    "The Client shall provide timely access to systems, documentation and personnel required for the engagement.",
+    "- **Data Platform Assessment**: evaluation of the current SQL Server estate, data flows and reporting workloads.",
+    "Fees are invoiced monthly in arrears and payable within thirty (30) days of the invoice date.",
+    "Neither party shall disclose Confidential Information of the other party except as permitted by the Agreement.",
+    "The Provider's aggregate liability shall not exceed the fees paid under this SOW in the preceding six (6) months.",
+]
+
+def paragraph(words):
+    """Build a paragraph of roughly the given number of words from the sentence pool"""
+    text = []
+    count = 0
+    index = 0
+    while count < words:
+        sentence = SENTENCES[index % len(SENTENCES)]
+        text.append(sentence)
+        count += len(sentence.split())
+        index += 1
+    return " ".join(text)
+
+def sample_sow(long_words=700, short_words=40):
+    """Return a 35 field SOW dict; long sections exceed the 512 token model limit by default"""
+    sow = {}
+    for field in STRING_FIELDS:
+        if field in ("Start Date", "End Date", "SOW Effective Date", "Agreement Date"):
+            sow[field] = "[DATE]"
+        elif field in ("Company Name", "Client Name", "Contact", "Client Contact"):
+            sow[field] = f"[{field.upper().replace(' ', '_')}]"
+        elif field in LONG_FIELDS:
+            sow[field] = paragraph(long_words)
+        else:
+            sow[field] = paragraph(short_words)
+
+    sow["Milestones"] = [
+        {
+            "milestone": f"Phase {number}",
+            "duration": f"Weeks {number * 2 - 1}-{number * 2}",
+            "deliverables": "<ul><li>Stakeholder interviews</li><li>Findings report</li><li>Roadmap review</li></ul>",
+        }
+        for number in range(1, 6)
+    ]
+    sow["Contractor Resources"] = [
+        {"roleName": "Solution Architect", "noOfPersons": 1, "responsibility": paragraph(25)},
+        {"roleName": "Data Engineer", "noOfPersons": 2, "responsibility": paragraph(25)},
+        {"roleName": "Project Manager", "noOfPersons": 1, "responsibility": paragraph(25)},
+    ]
+    return sow
@@ -1,3 +1,4 @@
+import json
 import os
 from dotenv import load_dotenv, find_dotenv
 # Load environment variables from the .env file
@@ -12,4 +13,132 @@ AZURE_TEXT_EMBEDDING = os.getenv("AZURE_TEXT_EMBEDDING")
 AZURE_EMBEDDING_URL_PATH = os.getenv("AZURE_EMBEDDING_URL_PATH")
 POSTGRESQL_BASE_URL= os.getenv("POSTGRESQL_BASE_URL")
 EMBEDDING_COL_NAME= os.getenv("EMBEDDING_COL_NAME")
-LOGO_URL= os.getenv("LOGO_URL")
\ No newline at end of file
+LOGO_URL= os.getenv("LOGO_URL")
+# Additional logos per brand as JSON, e.g. {"acme": "https://..."}, selected with "brand" in the request
+LOGO_URLS = json.loads(os.getenv("LOGO_URLS") or "{}")
+
+# Background job worker pool for /jobs
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", "3600"))
+# Where job status is shared so GET /jobs/<id> answers on every worker: 'postgres', 'sqlite' (workers on one host)
+# or empty for in-process only, which needs a single gunicorn worker
+JOB_STORE_BACKEND = os.getenv("JOB_STORE_BACKEND", "postgres")
+
+# Caching. Persistent cache backends are 'sqlite', 'postgres' or empty for in-process only
+CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", os.path.join(os.path.dirname(__file__), "cache", "cache.sqlite3"))
+VALIDATION_CACHE_SIZE = int(os.getenv("VALIDATION_CACHE_SIZE", "4096"))
+VALIDATION_CACHE_BACKEND = os.getenv("VALIDATION_CACHE_BACKEND", "")
+VALIDATION_CACHE_MAX_ROWS = int(os.getenv("VALIDATION_CACHE_MAX_ROWS", "50000"))
+
+# 'fast' loads a slimmed spaCy pipeline and runs clause and language analysis concurrently, 'standard' runs them sequentially
+COMPLIANCE_ENGINE = os.getenv("COMPLIANCE_ENGINE", "fast")
+
+# Model loading: 'lazy' loads on first use, 'eager' loads everything in create_app,
+# 'background' starts loading in a thread and reports ready once done
+MODEL_LOADING = os.getenv("MODEL_LOADING", "lazy")
+
+# Inference backend for the compliance and toxicity classifiers: 'pytorch' or 'onnx' (dynamically int8 quantized)
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "pytorch")
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", os.path.join(os.path.dirname(__file__), "onnx_models"))
+# Quantization target for exported models: avx2, avx512, avx512_vnni or arm64
+ONNX_QUANTIZATION = os.getenv("ONNX_QUANTIZATION", "avx2")
+
+# LLM response cache: in-process entries, TTL in seconds and optional persistent tier (sqlite/postgres) row limit
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "256"))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "86400"))
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "")
+LLM_CACHE_MAX_ROWS = int(os.getenv("LLM_CACHE_MAX_ROWS", "10000"))
+
+# Embedding cache for queries and documents: in-process entries, persistent tier (postgres/sqlite/empty) and its row limit
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+EMBEDDING_CACHE_BACKEND = os.getenv("EMBEDDING_CACHE_BACKEND", "postgres")
+EMBEDDING_CACHE_MAX_ROWS = int(os.getenv("EMBEDDING_CACHE_MAX_ROWS", "50000"))
+
+# Embedding backend: 'azure' (AZURE_TEXT_EMBEDDING) or 'local' (sentence-transformers model on CPU)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "azure")
+LOCAL_EMBEDDING_MODEL = os.getenv("LOCAL_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+LOCAL_EMBEDDING_BATCH_SIZE = int(os.getenv("LOCAL_EMBEDDING_BATCH_SIZE", "32"))
+# Vector size of the embedding model, detected when empty
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS") or 0) or None
+
+# Default drafting mode: 'single' (one completion for the whole SOW) or 'parallel' (section groups drafted concurrently)
+DRAFTING_MODE = os.getenv("DRAFTING_MODE", "single")
+
+# On rejection: 'targeted' regenerates only the failing fields when possible, 'full' redrafts the whole SOW
+REPAIR_MODE = os.getenv("REPAIR_MODE", "targeted")
+
+# Validate each SOW field while the draft is still streaming from the LLM
+STREAM_VALIDATION = os.getenv("STREAM_VALIDATION", "true").lower() == "true"
+
+# Chat refinement: 'patch' asks the LLM for field level edit operations on the SOW JSON sent by the client, 'full' regenerates the whole SOW
+CHAT_MODE = os.getenv("CHAT_MODE", "patch")
+
+# Logo and other remote document assets: disk cache, seconds before background revalidation, fetch timeout
+ASSET_CACHE_DIR = os.getenv("ASSET_CACHE_DIR", os.path.join(os.path.dirname(__file__), "cache", "assets"))
+ASSET_CACHE_TTL = int(os.getenv("ASSET_CACHE_TTL", "3600"))
+ASSET_FETCH_TIMEOUT = float(os.getenv("ASSET_FETCH_TIMEOUT", "5"))
+# Image used when a logo has never been fetched successfully, no logo when empty
+LOGO_FALLBACK_PATH = os.getenv("LOGO_FALLBACK_PATH", "")
+
+# Document rendering: 'template' renders markdown and DOCX from one section model into a copy of a styled template,
+# 'legacy' builds the DOCX paragraph by paragraph
+RENDER_ENGINE = os.getenv("RENDER_ENGINE", "template")
+# Pre-styled .docx whose styles, page setup, headers and footers are used, the built-in styles when empty
+RENDER_TEMPLATE_PATH = os.getenv("RENDER_TEMPLATE_PATH", "")
+
+# Generated documents, stored by content hash: directory, seconds a document is kept after it was last stored,
+# total size cap in bytes (0 disables either limit) and seconds between retention sweeps
+DOCUMENT_STORE_DIR = os.getenv("DOCUMENT_STORE_DIR") or os.path.join(os.path.dirname(__file__), "cache", "documents")
+DOCUMENT_MAX_AGE = int(os.getenv("DOCUMENT_MAX_AGE", str(7 * 24 * 3600)))
+DOCUMENT_MAX_BYTES = int(os.getenv("DOCUMENT_MAX_BYTES", str(1024 ** 3)))
+DOCUMENT_EVICT_INTERVAL = int(os.getenv("DOCUMENT_EVICT_INTERVAL", "300"))
+
+# 'lazy' stores the validated SOW and renders the DOCX on its first download, 'eager' renders it in the pipeline
+DOCX_RENDERING = os.getenv("DOCX_RENDERING", "lazy")
+
+# Connection pool shared by Flask-SQLAlchemy, PGVector and the Postgres cache tiers, per worker process
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+# Persist form submissions from a background queue in batches instead of committing before the graph runs
+WRITE_BEHIND = os.getenv("WRITE_BEHIND", "true").lower() == "true"
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "50"))
+WRITE_BEHIND_INTERVAL = float(os.getenv("WRITE_BEHIND_INTERVAL", "2"))
+WRITE_BEHIND_QUEUE_SIZE = int(os.getenv("WRITE_BEHIND_QUEUE_SIZE", "1000"))
+
+# LangGraph checkpointer for SOW sessions: postgres, sqlite or memory (local only, lost on restart)
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "postgres")
+CHECKPOINT_SQLITE_PATH = os.getenv("CHECKPOINT_SQLITE_PATH") or os.path.join(os.path.dirname(__file__), "cache", "checkpoints.sqlite3")
+# psycopg connections of the Postgres checkpointer, per worker process
+CHECKPOINT_POOL_SIZE = int(os.getenv("CHECKPOINT_POOL_SIZE", "5"))
+# Sessions idle for CHECKPOINT_TTL seconds are deleted (0 keeps them), swept every CHECKPOINT_SWEEP_INTERVAL seconds
+CHECKPOINT_TTL = int(os.getenv("CHECKPOINT_TTL", "604800"))
+CHECKPOINT_SWEEP_INTERVAL = int(os.getenv("CHECKPOINT_SWEEP_INTERVAL", "3600"))
+# Graph steps per run: 4 nodes per drafting attempt, up to 11 attempts, plus retrieval and formatting
+GRAPH_RECURSION_LIMIT = int(os.getenv("GRAPH_RECURSION_LIMIT", "100"))
+
+# Coalescing of identical concurrent requests: postgres (advisory lock, workers on any host), file (lock files, workers
+# on one host), memory (within a process) or off
+SINGLE_FLIGHT_BACKEND = os.getenv("SINGLE_FLIGHT_BACKEND", "postgres")
+SINGLE_FLIGHT_DIR = os.getenv("SINGLE_FLIGHT_DIR") or os.path.join(os.path.dirname(__file__), "cache", "single_flight")
+# Seconds a request waits on a run in another worker before running itself, and between lock attempts
+SINGLE_FLIGHT_WAIT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_WAIT_TIMEOUT", "600"))
+SINGLE_FLIGHT_POLL_INTERVAL = float(os.getenv("SINGLE_FLIGHT_POLL_INTERVAL", "0.5"))
+# Seconds a result published for waiting workers is kept
+SINGLE_FLIGHT_RESULT_TTL = int(os.getenv("SINGLE_FLIGHT_RESULT_TTL", "600"))
+
+# Approximate nearest neighbour index of the vector collection: hnsw, ivfflat or none (exact scan). Build parameters
+# apply when manage_vector_index.py creates the index, VECTOR_IVFFLAT_LISTS=0 picks lists from the row count
+VECTOR_INDEX = os.getenv("VECTOR_INDEX", "hnsw")
+VECTOR_HNSW_M = int(os.getenv("VECTOR_HNSW_M", "16"))
+VECTOR_HNSW_EF_CONSTRUCTION = int(os.getenv("VECTOR_HNSW_EF_CONSTRUCTION", "64"))
+VECTOR_IVFFLAT_LISTS = int(os.getenv("VECTOR_IVFFLAT_LISTS", "0"))
+# Query time recall / latency trade-off, set on every pooled connection
+VECTOR_HNSW_EF_SEARCH = int(os.getenv("VECTOR_HNSW_EF_SEARCH", "40"))
+VECTOR_IVFFLAT_PROBES = int(os.getenv("VECTOR_IVFFLAT_PROBES", "10"))
+# maintenance_work_mem of index builds, HNSW builds are much faster when the graph fits
+VECTOR_INDEX_BUILD_MEMORY = os.getenv("VECTOR_INDEX_BUILD_MEMORY", "1GB")
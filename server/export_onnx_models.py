@@ -0,0 +1,18 @@
+import argparse
+from agents.compliance_agent import CLAUSE_MODEL
+from agents.validation_agent import TOXICITY_MODEL
+from services.inference import export_quantized_model
+from config import ONNX_QUANTIZATION
+
+def main():
+    """Export the compliance and toxicity classifiers as int8 quantized ONNX models for INFERENCE_BACKEND=onnx"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--quantization", default=ONNX_QUANTIZATION,
+                        choices=["avx2", "avx512", "avx512_vnni", "arm64"])
+    args = parser.parse_args()
+
+    for model_id in (CLAUSE_MODEL, TOXICITY_MODEL):
+        export_quantized_model(model_id, quantization=args.quantization)
+
+if __name__ == "__main__":
+    main()
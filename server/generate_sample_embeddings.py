@@ -1,5 +1,5 @@
 from services.vector_service import vector_service
-import uuid
+from services.ingestion import content_id, upsert_batch
 from langchain_core.documents import Document
 
 docs = [
@@ -11,7 +11,7 @@ Microsoft 365 service Management, configuration, and activation of mobile device
 Problems that arise outside the scope of this SOW and feedback provided after a customer has approved a deliverable is addressed as a change request . Important! Have you discussed the Service deliverable acceptance process with the customer? Project governance. It is recommended that Project Governance is aligned to the Statement of Work. The governance structure and processes the team adheres to for the project are described in the following sections: Project Communication Use the following to communicate during the project: Communication plan: This document describes the frequency, audience, and content of communication with the team and stakeholders. The partner and the customer develop this project plan together. Status reports: The partner team prepares and issues regular status reports to inform stakeholders per the frequency as defined in the communication plan. Status meetings: The partner team schedules regular status meetings to review the overall project status, the acceptance of deliverables, and review open problems and risks. Risk and Issue Management Use the following procedure to manage active project issues and risks during the project: Identify: Identify and document project issues (current problems) and risks (potential problems) that could affect the project. Analyze and prioritize: Assess the potential impact and determine the highest priority risks and problems that will need to be actively managed. Plan and schedule: Determine the strategy for managing priority risks and issues and identify a resource that can take responsibility for mitigation and remediation. Track and report: Monitor and report the status of risks and problems. Escalate: Escalate the high-impact problems and risks (the team is unable to resolve) to project sponsors. Control: Review the effectiveness of risk and issue management actions Active issues and risks should be regularly monitored during the project. Change Management Process During the project, either the customer or partner can request modifications to
 the Services described in the SOW. These changes only take effect when the proposed change is agreed upon by both parties. The change management process steps are: Document the change: The partner documents all change requests in a Partner Change Request Form and submits them to the customer. The Partner Change Request Form includes a description of the change and the estimated effect of implementing the change. Submit the Change Request. The customer receives the change request. The customer accepts or rejects the change. The customer has three business days to: Accept: The customer must sign and return the Change Request Form to the partner. Reject: If the customer does not want to proceed with the change or does not provide approval within three business days, no changes will be made. Escalation Path The partner project manager works closely with the customer project manager, project sponsor, and other designees to manage project issues, risks, and change requests as described previously. The customer provides reasonable access to the sponsor or sponsors to expedite resolution. The standard escalation path for review, approval, or dispute resolution is as follows: Project team member (Partner or the Customer) Project manager (Partner and the Customer) Partner FastTrack Manager Partner and the Customer project sponsor Project Completion Partner provides services defined in this SOW to the extent of the fees available and the term specified in the contract. If additional services are required, the partner uses the change management process and modifies the contract. The project is considered complete when at least one of the following conditions has been met: All fees available are used for services delivered and expenses incurred. The term of the project expires. All partner activities and in-scope items are completed. The contract is terminated. Date
 FastTrack Ready Partner signature Customer signature""",
-            metadata={"id": str(uuid.uuid4()), "fileName": "SOW_1"},
+            metadata={"fileName": "SOW_1"},
         ),
          Document(    
             page_content="""Generic Statement of Work (SOW) Template The Statement of Work (SOW) format herein is only meant to be a guide and is not necessarily all-inclusive; as such, contents should be tailored to the requirement. Consult your NOAA AGO Contracting Officer and the NOAA Acquisition Process Guide (APG) for further guidance. You will need to prepare a SOW, for instance, when acquiring a service but not relying on the Contractors commercial description to define the requirement. In this situation, purchasers are tailoring the commercial services performed by the Contractor (e.g., program management services) to meet a particular Government need (e.g., management of a process improvement program). SOW Format Background Objectives Scope Tasks Delivery Government-Furnished Property (GFP) Security Considerations Travel Special Material Requirements Other Unique Requirements and Considerations Place of performance Period of performance Background Identified as the Introduction, this section provides information needed to acquaint the reader with the basic acquisition situation. The background
@@ -21,7 +21,7 @@ attendance at meetings, etc. 4.3 Task 3 - Title Describe the specific services t
 Government-Furnished Property, Material, Equipment, or Information (GFP, GFM, GFE, or GFI) This section should identify any Government-furnished property provided to the Contractor. This includes all Government-furnished property, such as Government-furnished material, equipment, or information. If the list of property is extensive, this section should identify where that list can be found. Before offering to provide any property, make sure that it will be available when required, where required, and in the condition required by the contract. Failure to meet Government-furnished property requirements often lead to a Contractor claim for an equitable adjustment to contract price, delivery, or other requirements. See FAR 45 and NOAA APG for specific requirements about providing Government-furnished property. Security This section should identify any unique security requirements associated with contract performance (when applicable). These requirements may include, but are not limited to, such items as: Special pass or identification requirements; Special security clearance requirements; or Special escort requirements. Travel Describe any travel requirements that are to be encountered in the performance of the service(s). Special Material Requirements Describe requirements for any special materials that are to be encountered in the performance of the service(s). Other Unique Requirements Discuss any other unique requirements or considerations, e.g. - Unique Item Identification (UID) and Radio Frequency Identification (RFID). Place of Performance This section should identify where the contract will be performed. If performance will occur at multiple Government locations, this section should
 indicate which tasks must be completed where. If performance will be at the Contractors facility, the SOW need only state that requirement. Period of Performance The period of performance may be stated using actual dates, days after contract award, or using some other method. If different periods of performance will apply to different tasks, the tasks and related periods of performance should be clearly identified. SOW Language Tips: A variety of people with different perspectives and life experiences will read your SOW. Readers typically include Government and industry contracting personnel, managers, technical experts, accountants and lawyers. All these readers need to understand the SOW in a clear and concise manner; therefore, language selection is very important. Below are tips that you should consider when reviewing the SOW: Use simple words, phrases, and sentences whenever practical. Be concise, precise, and consistent. Keep sentences short and to the point. Normally the longer the sentence, the harder it is to understand. Use verbs in the active voice. A verb is in the active voice when it expresses an action performed by its subject. For example, The Contractor shall report contract progress quarterly. Conversely, avoid using verbs in the passive voice. A verb is in the passive voice when it expresses an action performed upon its subject or when the subject is the result of the action. For example, Contract progress shall be reported quarterly by the Contractor. Use shall or must when writing a requirement binding on the Contractor. Avoid should or may because they leave the decision on appropriate action up to the Contractor. Use will to indicate actions by the Government. Be consistent when using terminology. Use the same word to mean the same thing throughout your SOW. Avoid using different words to indicate the same type of action. Avoid redundancy. At best, requiring the Contractor to do the same thing in different parts of the SOW will add needless words to the SOW. At worst, there
 may be subtle differences in the requirements that may lead to a dispute during contract performance. Avoid vague or inexact phrases and generalizations. Avoid catchall and open-ended phrases, such as, is common practice in the industry, as directed, or subject to approval. If you want to give the Contractor an opportunity to use their standard commercial practices, require each offeror to identify its commercial practices in a proposal and then include that proposal as part of the order/contract. Define technical terms. Avoid using Government jargon. Assure that it is clearly defined whenever jargon must be used. Only use any, either, and/or, etc. when allowing the Contractor to select an alternative. Use abbreviations or acronyms only after spelling them out the first time they are used (e.g., National Climatic Data Center (NCDC)). Spell them out even if they are commonly used by NOAA because a commercial Contractor may not be familiar with them. Identify the date or version of any document referenced in your SOW. Advise readers from industry where they can obtain referenced documents.""",
-            metadata={"id": str(uuid.uuid4()), "fileName": "SOW_2"},
+            metadata={"fileName": "SOW_2"},
         ),
         Document(    
             page_content="""Contract No. VA-190906-STVN, Exhibit D EXHIBIT D – STATEMENT OF WORK (SOW) TEMPLATE STATEMENT OF WORK D-X BETWEEN (NAME OF AUTHORIZED USER) AND SITEVISION, INC. ISSUED UNDER CONTRACT NUMBER VA-190906-STVN BETWEEN VIRGINIA INFORMATION TECHNOLOGIES AGENCY AND SITEVISION, INC. Exhibit D, between (Name of Agency/Institution) and SiteVision, Inc. (“Supplier”) is hereby incorporated into and made an integral part of Contract Number VA- 190906-STVN (“Contract”) between the Virginia Information Technologies Agency (“VITA”) on behalf of the Commonwealth of Virginia and Supplier. In the event of any discrepancy between this Exhibit D and the Contract, the provisions of the Contract shall control. (Note to Template Users: Any Service, Licensed Services, Solution or Software provided under this SOW must comply with all COVA Security and Enterprise Architecture ITRM policies, standards and guidelines located at: http://www.vita.virginia.gov/library/default.aspx?id=537 and all COVA
@@ -47,14 +47,14 @@ project plan; any changes in tasks, resources or schedule with new target dates,
 Supplier Performance Assessments (You may want to develop assessments of the Supplier’s performance and disseminate such assessments to other Authorized Users of the VITA Contract. Prior to dissemination of such assessments, Supplier will have an opportunity to respond to the assessments, and independent verification of the assessment may be utilized in the case of disagreement.) VA-190906-STVN, Exhibit D Statement of Work Template Page 9 of 10 Contract No. VA-190906-STVN, Exhibit D CHANGE MANAGEMENT (Changes to the baseline SOW must be documented for proper project oversight. Depending on your project, you may need to manage and capture changes to configuration, incidents, deliverables, schedule, price or other factors your team designates as critical. Any price changes must be done in compliance with the Code of Virginia, § 2.2-4309. Modification of the contract, found at this link: http://leg1.state.va.us/cgi-bin/legp504.exe?000+coh+2.2-4309+500825. Changes to the scope of this SOW must stay within the boundaries of the scope of the VITA Contract. For complex and/or major projects, it is recommended that you use the VITA PMD processes and templates located at: http://www.vita.virginia.gov/oversight/projects/default.aspx?id=567. Administrative or non-technical/functional changes (deliverables, schedule, point of contact, reporting, etc.) should extrapolate the affected sections of this SOW in a “from/to” format and be placed in a numbered modification letter referencing this SOW and date, with a new effective date. The VITA Contract may include a template for your use or you may obtain one from the VITA Contract’s Point of Contact. It is very important that changes do not conflict with, but do comply with, the VITA Contract, which takes precedence. The
 following language may be included in this section, but additional language is needed to list any technical/functional change management areas specific to this SOW; i.e., configuration, incident, work flow, or any others of a technical/functional nature.) All changes to this SOW must comply with the Contract. Price changes must comply with the Code of Virginia, § 2.2-4309. Modification of the contract, found at this link: http://leg1.state.va.us/cgi-bin/legp504.exe?000+coh+2.2-4309+500825http://leg1.state.va.us/cgi-bin/legp504.exe?000+coh+2.2-4309+500825 All changes to this SOW shall be in written form and fully executed between the Authorized User’s and the Supplier’s authorized representatives. For administrative changes, the parties agree to use the change template, attached to this SOW. For technical/functional change management requirements, listed below, the parties agree to follow the processes and use the templates provided at this link: http://www.vita.virginia.gov/oversight/projects/default.aspx?id=567 POINT OF CONTACT For the duration of this project, the following project managers shall serve as the points of contact for day-to-day communication: Authorized User: __________________________ Supplier: _________________________ By signing below, both parties agree to the terms of this Exhibit. Supplier: Authorized User: SiteVision, Inc. (Name of Supplier) (Name of Agency/Institution) By: ________________________________ By:
 __________________________________ (Signature) (Signature) Name: _____________________________ Name: _______________________________ (Print) (Print) Title: ______________________________ Title: _________________________________ Agency Head or Designee Date: ______________________________ Date: _________________________________""",
-            metadata={"id": str(uuid.uuid4()), "fileName": "SOW_3"},
+            metadata={"fileName": "SOW_3"},
         ),
         Document(    
             page_content="""Your logo here STATEMENT OF WORK COMPANY NAME Prepared by Optimus Prime Project Name
 Phone number Email address Name of the project. (310-555-5555) optimusprime@yourfavoritecompany.com "Address ","123 South Beach Ave., Los Angeles, CA " "Project location ","Santa Monica Pier " "Date ","August 01, 2024 " --- PAGE 2 --- Introduction Goals of project Create a short two-paragraph section summarizng the agreement and project. Outline the reasons for taking on this project and list its objectives.
 Scope of work Estimated costs Explain the exact details of the project, including: • Deliverables. Share what the client can expect to receive, such as a product, service, or measurable result. • Exclusions. List what the project scope does not cover. Explain how out-of-scope services could incur additional fees. • Milestones. List important due dates for the project. • List all expenses in a table with a description of each. Consider costs like software subscriptions, materials, and labor. Description Cost Total $$$ --- PAGE 3 --- Pricing and payment terms
 Explain pricing plans and payment options here. State which costs the client isn't expected to cover, such as equipement fees or rent. Project schedule "Task ","Deadline ","Cost " List a more in-depth explanation of project milestones. Organize the project schedule for easy, at-a-glance project updates. List deliverables and their deadlines, budgets, and who is responsible for each task. Total cost Create a statement of work template that updates costs in a table as you go to simplify overall costs. You can also convert your spreadsheet into PDFs using Acrobat.""",
-            metadata={"id": str(uuid.uuid4()), "fileName": "SOW_4"},
+            metadata={"fileName": "SOW_4"},
         ),
         Document(    
             page_content="""Statement of Work (SOW) Project: {Insert title} GENERAL INFORMATION 1.0 Scope of Work: {Provide a brief statement of the overall project, including goals and objectives}
@@ -62,13 +62,18 @@ Explain pricing plans and payment options here. State which costs the client isn
 Separate general information from direction. 4.0 Government Furnished: {List any government-furnished support, data, property or facilities. Describe government responsibility for reviewing and approving reports and final products generated under the contract. If the contractor will require access to government facilities, identify the facility location and specific area. Identify any federal holidays or other times when access may be restricted.} 5.0 Deliverables / Schedule: {All written deliverables shall be phrased in layperson language.} Where a written milestone deliverable is required draft format, indicate a completion time for review of the draft formatted deliverable, e.g. within ___ calendar days from date of receipt. The agency shall also indicate the number of business days the contractor has to deliver the final deliverable from date of receipt of the governments comments. To the maximum extent possible, state requirements in terms of (a) functions to be performed; (b) performance required; or (c) essential physical characteristics. Define in terms that encourage offerors to supply commercial items, or, to the extent that commercial items suitable to meet the agencys need are not available, non-developmental items. Allow the contractor to devise and propose one or more solutions to satisfy the requirements. Sample Text - Tasks and Associated Deliverables: Timely submission of deliverables is essential to successful completing this requirement. Schedules for deliverables are specified in Exhibit B. All deliverables shall be prepared and submitted according to format, content, and schedule described in the SOW. All hard copy deliverables will be submitted on recycled-content paper, and printed double-sided.
 Sample Text - Reporting Requirements: The contractor is required to provide written progress reports {insert frequency, e.g. monthly} for the period {specify contract period or project duration}. The original and {specify number} copies are required. The progress report shall cover all work completed during the specified period and shall present the work to be accomplished during the subsequent period. This report shall also identify any problems that arose and a statement explaining how the problem was resolved. This report shall also identify any problems that have arisen but have not been completely resolved and provide an explanation. Example 1 Key Deliverables Item No. Deliverable Objective Due 1 Proposed Project Plan Defining the responsibilities, timeline, risks, and milestones of contract objectives. Ref. Subtask 4.1.3 No later than five (5) business days after contract award 2 Weekly Status Report Report documenting tasks & issues weekly. Ref. Task 5.1 Weekly, every Friday, by 3:00 pm (EDST) unless until the contract expires Example 2 Key Deliverables Item No. Deliverable/ Item Title Description Frequency Reference Delivery Format Due By 1 Monthly Status Report Monthly report documenting tasks and issues identified during the month Once per Month Ref. SOO, Page 3, Section 4.2.1, Functional Task Via email to COR The 5th day of each month after contract award 2 Monthly Cumulative BPA Call Order Report Monthly Cumulative of all BPA Calls issued since date of contract award Once per Month Ref. SOO, Page 6, Section 5.1.3, Call Order Report Details Via email to COR On the 10th day of each month after contract award 6.0 Travel: {Identify any travel requirements, locations involved, number of trips (if known), and duration of anticipated travel. Specify responsibility for travel reimbursement, e.g., the contractor or the Government. If the travel will
 be reimbursed by the Government, discuss the method of reimbursement, e.g., in accordance with Federal/agency travel regulations. State the Government official authorized to approve contractor travel, e.g., the Contracting Officer or Contracting Officer Representative.} 7.0 Contractors Key Personnel: {Describe positions which are considered key to successful performance of the contract and the information required to support key personnel qualifications, e.g., experience which correlates to SOW requirements,, education, and past performance on similar projects. Specify if resumes are required and provide resume format if appropriate.} 8.0 Security Requirements: {Specify security requirements that apply to the contract performance. Specify the level of clearances required and identify positions that are applicable.} 9.0 Data Rights: {If data is to be produced, furnished, acquired, or used in meeting contract requirements, delineate the respective rights and obligations of the government and the contractor regarding the use, production, and disclosure of that data.} 10.0 Section 508 Electronic and Information Technology Standards: {When information technology is to be acquired, include language describing Section 508 requirements.} Attachment: {If applicable, include an Attachment stating Evaluation Factors and significant Subfactors representing the key areas of importance and emphasis to be considered in the source selection decision} PAGE * MERGEFORMAT 2""",
-            metadata={"id": str(uuid.uuid4()), "fileName": "SOW_5"},
+            metadata={"fileName": "SOW_5"},
         ),
     ]
 
 def main():
     """Add sample documents to the vector store for demonstration purposes"""
-    vector_service.vector_store.add_documents(docs, ids=[doc.metadata["id"] for doc in docs])
+    # Content-hash ids make re-runs update the samples instead of adding duplicates
+    batch = []
+    for doc in docs:
+        doc_id = content_id(doc.page_content)
+        batch.append((doc_id, doc.page_content, {"id": doc_id, **doc.metadata}))
+    upsert_batch(vector_service.vector_store, vector_service.embeddings.embeddings, batch)
     print(f"Successfully added {len(docs)} sample SOW documents to vector store")
 
 if __name__ == "__main__":
@@ -0,0 +1,110 @@
+"""Helpers shared by every entry point that runs the SOW graph"""
+import json
+import uuid
+from config import CHAT_MODE
+from graph.sessions import new_session_id
+from services.cache import hash_key
+
+# Form field in the request body -> key used in the query map / SOWUserInput column
+FORM_FIELDS = {
+    "projectObjectives": "project_objectives",
+    "projectScope": "project_scope",
+    "servicesDescription": "detailed_desc",
+    "specificFeatures": "specific_feature",
+    "platformsTechnologies": "platform_tech",
+    "integrations": "integrations",
+    "designSpecifications": "design_specification",
+    "outOfScope": "out_of_scope",
+    "deliverables": "deliverables",
+    "timeline": "project_timeline",
+}
+
+def build_query_map(data):
+    """Extract the form fields from the request body"""
+    return {key: data.get(field, "NA") for field, key in FORM_FIELDS.items()}
+
+def normalize_text(value):
+    """Request text without the whitespace differences that do not change the SOW"""
+    if not isinstance(value, str):
+        return value
+    return "\n".join(line.rstrip() for line in value.replace("\r\n", "\n").strip().split("\n"))
+
+def form_key(query_map, drafting_mode=None, repair_mode=None, brand=None):
+    """Single-flight key of a form generation: identical forms with the same options share one run"""
+    fields = {key: normalize_text(value) for key, value in query_map.items()}
+    return hash_key("form", json.dumps(fields, sort_keys=True), drafting_mode, repair_mode, brand)
+
+def chat_key(data):
+    """Single-flight key of a chat turn: the message and the session it continues, or the SOW sent with it"""
+    message = normalize_text(data.get("message", "Unknown"))
+    options = (data.get("chatMode") or CHAT_MODE, data.get("brand"))
+    if data.get("sessionId"):
+        return hash_key("chat", data["sessionId"], message, *options)
+    sow_json = data.get("sowJson")
+    if sow_json is not None and not isinstance(sow_json, str):
+        sow_json = json.dumps(sow_json, sort_keys=True)
+    return hash_key("chat", message, *options, normalize_text(data.get("context", "Unknown")), sow_json)
+
+def build_form_state(query_map, drafting_mode=None, repair_mode=None, brand=None):
+    """Build the initial graph state for the form (generate-sow) flow"""
+    user_query = (
+        f"Objectives of project are {query_map['project_objectives']}.\n"
+        f"Scope of the project is {query_map['project_scope']}.\n"
+        f"Detailed Description of Services is {query_map['detailed_desc']}.\n"
+        f"Specific Features are {query_map['specific_feature']}.\n"
+        f"Platforms and Technologies is {query_map['platform_tech']}.\n"
+        f"Integrations is {query_map['integrations']}.\n"
+        f"Design Specifications are {query_map['design_specification']}.\n"
+        f"Out of Scope is {query_map['out_of_scope']}.\n"
+        f"Deliverables are {query_map['deliverables']}.\n"
+        f"Project Timeline and Schedule is {query_map['project_timeline']}."
+    )
+    state = {'user_query': user_query, 'query_map': query_map, 'request_id': str(uuid.uuid4()),
+             'session_id': new_session_id()}
+    if drafting_mode:
+        state['drafting_mode'] = drafting_mode
+    if repair_mode:
+        state['repair_mode'] = repair_mode
+    if brand:
+        state['brand'] = brand
+    return state
+
+def build_chat_state(data, session=None):
+    """
+    Build the initial graph state for the chat refinement flow. With a session
+    (the latest state of data["sessionId"]) the previous SOW is taken from the
+    server, otherwise from the request: patch mode needs the SOW JSON of the
+    previous response ("sowJson"), without it the whole SOW is regenerated from
+    the markdown context.
+    """
+    session = session or {}
+    state = {
+        'user_query': data.get("message", "Unknown"),
+        'flow': 'chat',
+        'previous_sow': session.get('formatted_sow') or data.get("context", "Unknown"),
+        'chat_mode': 'full',
+        'request_id': str(uuid.uuid4()),
+        'session_id': data.get("sessionId") if session else new_session_id(),
+    }
+    if session:
+        # Results of the previous run must not leak into this one
+        state.update({'error': None, 'error_fields': None, 'touched_fields': None, 'feedback': None,
+                      'compliance_results': None})
+    brand = data.get("brand") or session.get('brand')
+    if brand:
+        state['brand'] = brand
+    sow_json = session.get('sow') or data.get("sowJson")
+    if (data.get("chatMode") or CHAT_MODE) == 'patch' and sow_json:
+        state['chat_mode'] = 'patch'
+        state['sow'] = sow_json if isinstance(sow_json, str) else json.dumps(sow_json)
+    return state
+
+def build_sow_response(response):
+    """Shape the final graph state into the API response body"""
+    return {
+        "status": "success",
+        "message": response['formatted_sow'],
+        "sow_json": response['sow'],
+        "fileName": response['doc_file_path'],
+        "sessionId": response.get('session_id'),
+    }
@@ -0,0 +1,209 @@
+import queue
+import threading
+import time
+import uuid
+
+from config import JOB_WORKERS, JOB_QUEUE_SIZE, JOB_RESULT_TTL, JOB_STORE_BACKEND
+from graph.inputs import build_sow_response
+from graph.sow_graph import graph
+from graph.sessions import graph_config
+from services.cache import build_store
+from services.single_flight import single_flight
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another job"""
+
+class Job:
+    def __init__(self, kind, inputs, key=None, on_run=None):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.inputs = inputs
+        self.key = key
+        self.on_run = on_run  # Called once before the graph runs, skipped when the run is coalesced
+        self.requests = 1  # Submissions attached to this job, see JobManager.submit
+        self.status = 'queued'
+        self.node = None
+        self.retry_count = 0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "type": self.kind,
+            "status": self.status,
+            "node": self.node,
+            "retryCount": self.retry_count,
+            "requests": self.requests,
+            "result": self.result,
+            "error": self.error,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+        }
+
+class JobManager:
+    """
+    Runs SOW graph executions on a bounded pool of worker threads. Jobs run in
+    the worker process that accepted them; their status is also written to a
+    shared store so any worker behind the load balancer can report it.
+    """
+
+    def __init__(self, graph, workers=JOB_WORKERS, max_queue=JOB_QUEUE_SIZE, result_ttl=JOB_RESULT_TTL,
+                 store_backend=JOB_STORE_BACKEND):
+        self.graph = graph
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.jobs = {}
+        self.flights = {}  # Single-flight key -> unfinished job
+        self.lock = threading.Lock()
+        self.threads = []
+        self.store = build_store(store_backend, "sow_jobs", ttl=result_ttl)
+
+    def _ensure_workers(self):
+        """Start the worker threads on first use (after any gunicorn fork)"""
+        with self.lock:
+            self.threads = [t for t in self.threads if t.is_alive()]
+            for _ in range(self.workers - len(self.threads)):
+                thread = threading.Thread(target=self._worker_loop, daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def _purge_finished(self):
+        """Forget finished jobs older than the result TTL"""
+        cutoff = time.time() - self.result_ttl
+        with self.lock:
+            expired = [job_id for job_id, job in self.jobs.items()
+                       if job.finished_at and job.finished_at < cutoff]
+            for job_id in expired:
+                del self.jobs[job_id]
+
+    def submit(self, kind, inputs, key=None, on_run=None):
+        """
+        Queue a graph run and return the job immediately. A submission with the key
+        of an unfinished job returns that job instead of queueing another run.
+        on_run is called by the run itself, so a job whose run is shared with another
+        job or request never calls it.
+        """
+        self._purge_finished()
+        self._ensure_workers()
+
+        with self.lock:
+            job = self.flights.get(key) if key else None
+            if job is not None:
+                job.requests += 1
+                self._publish(job)
+                return job
+            job = Job(kind, inputs, key, on_run)
+            self.jobs[job.id] = job
+            if key:
+                self.flights[key] = job
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            with self.lock:
+                del self.jobs[job.id]
+                self._forget_flight(job)
+            raise QueueFullError("Job queue is full, please retry later")
+        self._publish(job)
+        return job
+
+    def _forget_flight(self, job):
+        if job.key and self.flights.get(job.key) is job:
+            del self.flights[job.key]
+
+    def _publish(self, job):
+        """Write the job status to the shared store, a failed write only costs other workers a stale view"""
+        if self.store is None:
+            return
+        try:
+            self.store.set(job.id, job.to_dict())
+        except Exception as e:
+            print(f"⚠️ Could not publish job {job.id}: {str(e)}")
+
+    def get(self, job_id):
+        """Status of a job of any worker as a dict, None when it is unknown or expired"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if self.store is None:
+            return None
+        try:
+            return self.store.get(job_id)
+        except Exception as e:
+            print(f"⚠️ Could not read job {job_id}: {str(e)}")
+            return None
+
+    def stats(self):
+        with self.lock:
+            statuses = [job.status for job in self.jobs.values()]
+            alive = sum(1 for t in self.threads if t.is_alive())
+        return {
+            "workers": self.workers,
+            "aliveWorkers": alive,
+            "queueDepth": self.queue.qsize(),
+            "queueCapacity": self.queue.maxsize,
+            "running": statuses.count('running'),
+            "queued": statuses.count('queued'),
+            "succeeded": statuses.count('succeeded'),
+            "failed": statuses.count('failed'),
+        }
+
+    def _worker_loop(self):
+        while True:
+            job = self.queue.get()
+            try:
+                self._run(job)
+            finally:
+                self.queue.task_done()
+
+    def _execute(self, job):
+        """Run the graph of a job, tracking its current node and retry count, and return the response"""
+        if job.on_run is not None:
+            job.on_run()
+        final_state = None
+        config = graph_config(job.inputs['session_id'])
+        for mode, payload in self.graph.stream(job.inputs, config, stream_mode=['custom', 'updates', 'values']):
+            if mode == 'custom':
+                if payload.get('event') == 'node_start':
+                    job.node = payload['node']
+                    self._publish(job)
+            elif mode == 'updates':
+                for update in payload.values():
+                    if update and update.get('retryCount') is not None:
+                        job.retry_count = update['retryCount']
+            else:
+                final_state = payload
+
+        if final_state is None or 'formatted_sow' not in final_state:
+            raise RuntimeError(final_state.get('error') if final_state else 'SOW generation did not complete')
+        return build_sow_response(final_state)
+
+    def _run(self, job):
+        job.status = 'running'
+        job.started_at = time.time()
+        self._publish(job)
+        try:
+            # Requests and jobs with the same key running in this or another worker share one run
+            execute = lambda: self._execute(job)
+            job.result = single_flight.run(job.key, execute, job.kind) if job.key else execute()
+            job.status = 'succeeded'
+        except Exception as e:
+            print(f"⚠️ Job {job.id} failed: {str(e)}")
+            job.error = str(e)
+            job.status = 'failed'
+        finally:
+            job.inputs = None
+            job.on_run = None
+            job.finished_at = time.time()
+            self._publish(job)
+            with self.lock:
+                self._forget_flight(job)
+
+# Initialize job manager as a singleton
+job_manager = JobManager(graph)
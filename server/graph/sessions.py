@@ -0,0 +1,138 @@
+"""
+SOW sessions on top of the LangGraph checkpointer. A session is a graph thread:
+every completed node of every run is checkpointed under the session id, so chat
+turns start from the latest state on the server and an interrupted run resumes
+from its last completed node instead of repeating the LLM calls before it.
+Sessions idle for CHECKPOINT_TTL seconds are deleted by a sweep in each process.
+"""
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from langgraph.checkpoint.memory import InMemorySaver
+from config import (CHECKPOINT_BACKEND, CHECKPOINT_SQLITE_PATH, CHECKPOINT_POOL_SIZE, CHECKPOINT_TTL,
+                    CHECKPOINT_SWEEP_INTERVAL, GRAPH_RECURSION_LIMIT, POSTGRESQL_BASE_URL)
+
+lock = threading.Lock()
+ready_pid = None
+
+class SessionNotFoundError(Exception):
+    """Raised when a request continues a session that has no checkpoint"""
+
+def create_checkpointer(backend=CHECKPOINT_BACKEND):
+    """Checkpointer for the configured backend. Nothing is opened until the first run, see graph_config."""
+    if backend == "postgres":
+        from psycopg.rows import dict_row
+        from psycopg_pool import ConnectionPool
+        from langgraph.checkpoint.postgres import PostgresSaver
+        pool = ConnectionPool(
+            f"postgresql://{POSTGRESQL_BASE_URL}", max_size=CHECKPOINT_POOL_SIZE, open=False,
+            kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+        )
+        return PostgresSaver(pool)
+    if backend == "sqlite":
+        import sqlite3
+        from langgraph.checkpoint.sqlite import SqliteSaver
+        os.makedirs(os.path.dirname(CHECKPOINT_SQLITE_PATH), exist_ok=True)
+        return SqliteSaver(sqlite3.connect(CHECKPOINT_SQLITE_PATH, check_same_thread=False))
+    if backend == "memory":
+        return InMemorySaver()
+    raise ValueError(f"Unknown CHECKPOINT_BACKEND: {backend}")
+
+checkpointer = create_checkpointer()
+
+def prepare_checkpointer():
+    """Open the Postgres pool and create the checkpoint tables once per process (after any gunicorn fork)"""
+    global ready_pid
+    if ready_pid == os.getpid():
+        return
+    with lock:
+        if ready_pid != os.getpid():
+            pool = getattr(checkpointer, "conn", None)
+            if hasattr(pool, "open"):
+                pool.open()
+            if hasattr(checkpointer, "setup"):
+                checkpointer.setup()
+            ready_pid = os.getpid()
+            if CHECKPOINT_TTL:
+                threading.Thread(target=sweep_loop, name="checkpoint-sweep", daemon=True).start()
+
+def idle_sessions(ttl, backend=CHECKPOINT_BACKEND):
+    """Ids of the sessions whose latest checkpoint is older than ttl seconds"""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=ttl)
+    if backend == "postgres":
+        with checkpointer.conn.connection() as conn:
+            rows = conn.execute(
+                "SELECT thread_id FROM checkpoints GROUP BY thread_id "
+                "HAVING max((checkpoint ->> 'ts')::timestamptz) < %s", (cutoff,)
+            ).fetchall()
+        return [row["thread_id"] for row in rows]
+    latest = {}
+    for item in checkpointer.list(None):
+        thread_id = item.config["configurable"]["thread_id"]
+        ts = datetime.fromisoformat(item.checkpoint["ts"])
+        if thread_id not in latest or ts > latest[thread_id]:
+            latest[thread_id] = ts
+    return [thread_id for thread_id, ts in latest.items() if ts < cutoff]
+
+def sweep_sessions(ttl=CHECKPOINT_TTL):
+    """Delete every checkpoint of the sessions idle for ttl seconds, returns how many were deleted"""
+    prepare_checkpointer()
+    expired = idle_sessions(ttl)
+    for thread_id in expired:
+        checkpointer.delete_thread(thread_id)
+    if expired:
+        print(f"🧹 Deleted {len(expired)} sessions idle for more than {ttl}s")
+    return len(expired)
+
+def sweep_loop(interval=CHECKPOINT_SWEEP_INTERVAL):
+    """Sweep expired sessions every interval seconds; every worker sweeps, deleting a thread twice is harmless"""
+    while True:
+        time.sleep(interval)
+        try:
+            sweep_sessions()
+        except Exception as e:
+            print(f"⚠️ Session sweep failed: {str(e)}")
+
+def new_session_id():
+    return str(uuid.uuid4())
+
+def graph_config(session_id):
+    """Config of every graph run: the session's thread and a recursion limit that allows all retries"""
+    prepare_checkpointer()
+    return {"configurable": {"thread_id": session_id}, "recursion_limit": GRAPH_RECURSION_LIMIT}
+
+def load_session(graph, session_id):
+    """Latest state of a session, None when it has no checkpoint"""
+    if not session_id:
+        return None
+    snapshot = graph.get_state(graph_config(session_id))
+    return snapshot.values or None
+
+def require_session(graph, session_id):
+    """
+    Latest state of the session a request continues, None when it starts a new one.
+    A session id without a checkpoint (idle past CHECKPOINT_TTL and swept, or held
+    by another worker's in-memory saver) raises instead of silently starting from
+    an empty SOW.
+    """
+    if not session_id:
+        return None
+    session = load_session(graph, session_id)
+    if session is None:
+        raise SessionNotFoundError(f"Session not found: {session_id}")
+    return session
+
+def resume_session(graph, session_id):
+    """
+    Final state of a session's latest run, continuing it from the last completed
+    node when it was interrupted. None when the session does not exist.
+    """
+    config = graph_config(session_id)
+    snapshot = graph.get_state(config)
+    if not snapshot.values:
+        return None
+    if snapshot.next:
+        return graph.invoke(None, config)
+    return snapshot.values
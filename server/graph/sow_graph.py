@@ -5,6 +5,9 @@ from agents.drafting_agent import DraftingAgent
 from agents.compliance_agent import ComplianceAgent
 from agents.validation_agent import ValidationAgent
 from agents.formatting_agent import FormattingAgent
+from graph.streaming import emit_node_start
+from graph.sessions import checkpointer
+from services.metrics import instrument_node, COMPLIANCE_SCORE, GRAPH_RETRIES, ROUTER_DECISIONS
 
 # Define our state
 class State(TypedDict, total=False):
@@ -15,57 +18,89 @@ class State(TypedDict, total=False):
     additional_context: str
     sow: str            # SOW as a JSON string (or raw text) produced by the drafting agent.
     validated_sow: dict # Parsed and validated SOW data.
-    formatted_sow: str  # Filename of the generated DOCX.
+    formatted_sow: str  # Markdown of the final SOW.
     compliance_results: dict  # Results from compliance analysis.
     feedback: str
     error: str
     retryCount: int
-    doc_file_path: str
+    doc_file_path: str  # Content addressed file name of the generated DOCX in the document store.
+    drafting_mode: str  # 'single' or 'parallel' section-group drafting.
+    drafting_ms: float  # Wall-clock time of the latest drafting call.
+    error_fields: list  # SOW fields the current errors apply to, None when they apply to the whole document.
+    repair_mode: str    # 'targeted' (repair error_fields only) or 'full' redraft on rejection.
+    repair_history: list  # Per retry: retry number, repair mode and the fields it regenerated.
+    validation_cache: dict  # Validation cache hits/misses of the latest validation pass.
+    chat_mode: str      # 'patch' (edit operations on the SOW JSON) or 'full' chat refinement.
+    touched_fields: list  # Fields edited by a chat patch, None when the whole SOW must be checked.
+    brand: str          # Key of LOGO_URLS for the document logo, LOGO_URL when not set.
+    request_id: str     # Id of the request, recorded against the stored document.
+    render_saved_ms: float  # Estimated DOCX render time deferred to download, None until one was measured.
+    session_id: str     # Graph thread the run is checkpointed under, shared by the chat turns of a SOW.
 
 # Initialize agents
-drafting_agent = DraftingAgent()
 compliance_agent = ComplianceAgent()
 validation_agent = ValidationAgent()
+# Fields are handed to the toxicity check as soon as they are generated
+drafting_agent = DraftingAgent(on_field=validation_agent.prevalidate_field)
 formatting_agent = FormattingAgent()
 
 # Agent processing functions
+@instrument_node('get_relevant_context')
 def get_relevant_context(state: State):
     """Get relevant context for the query"""
+    emit_node_start('get_relevant_context')
     print('Getting Relevant Context from Vector')
     context = drafting_agent.get_relevant_context(state['user_query'])
-    return {'additional_context': context, 'retryCount': 0}
+    return {'additional_context': context, 'retryCount': 0, 'repair_history': []}
 
+@instrument_node('drafting_agent')
 def process_drafting(state: State):
     """Process drafting stage"""
+    emit_node_start('drafting_agent')
     print('Drafting your document...')
     return drafting_agent.process_sow(state)
 
+@instrument_node('compliance_agent')
 def process_compliance(state: State):
     """Process compliance checking"""
+    emit_node_start('compliance_agent')
     print('Running compliance checks...')
-    return compliance_agent.process_sow(state)
+    result = compliance_agent.process_sow(state)
+    if result.get('compliance_results'):
+        COMPLIANCE_SCORE.observe(result['compliance_results']['compliance_score'])
+    return result
 
+@instrument_node('validation_agent')
 def process_validation(state: State):
     """Process validation stage"""
+    emit_node_start('validation_agent')
     print('Running validation checks...')
     return validation_agent.process_sow(state)
 
+@instrument_node('formatting_agent')
 def process_formatting(state: State):
     """Process formatting stage"""
+    emit_node_start('formatting_agent')
     print('Formatting your document')
     return formatting_agent.process_sow(state)
 
 def agent_router(state: State):
     """Route based on feedback and error state"""
     if state['retryCount'] > 10:
+        ROUTER_DECISIONS.labels('retries_exhausted').inc()
+        GRAPH_RETRIES.observe(state['retryCount'])
         return 'SUCCESS'
     # If any error exists (from compliance or validation), loop back to drafting.
     if state.get('error'):
         print(f"error: {state.get('error')}")
+        ROUTER_DECISIONS.labels('rejected').inc()
         return 'REJECTED'
     if state.get('feedback') == 'ACCEPTED':
+        ROUTER_DECISIONS.labels('accepted').inc()
+        GRAPH_RETRIES.observe(state.get('retryCount', 0))
         return 'SUCCESS'
     print(f"error: {state.get('error')}")
+    ROUTER_DECISIONS.labels('rejected').inc()
     return 'REJECTED'
 
 def create_graph():
@@ -98,8 +133,8 @@ def create_graph():
     
     graph_builder.add_edge('formatting_agent', END)
     
-    # Compile and return graph
-    return graph_builder.compile()
+    # Compile and return graph, every completed node is checkpointed under the session id
+    return graph_builder.compile(checkpointer=checkpointer)
 
 # Create the graph singleton
 graph = create_graph()
\ No newline at end of file
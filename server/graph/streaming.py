@@ -0,0 +1,91 @@
+import json
+import queue
+import threading
+from langgraph.config import get_stream_writer
+
+from graph.inputs import build_sow_response
+from graph.sessions import graph_config
+
+# Seconds between SSE keep-alive comments while the graph is busy
+HEARTBEAT_INTERVAL = 15
+
+# Only tokens produced by these nodes are forwarded to the client
+TOKEN_NODES = {'drafting_agent'}
+
+SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    # Disable response buffering in nginx style reverse proxies
+    'X-Accel-Buffering': 'no',
+}
+
+_DONE = object()
+
+def emit_node_start(node):
+    """Announce that a graph node has started (no-op outside of a streaming run)"""
+    get_stream_writer()({'event': 'node_start', 'node': node})
+
+def format_sse(event, data):
+    """Format a single Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _run_graph(graph, inputs, config, events):
+    """Run the graph and push every streamed chunk onto the events queue"""
+    try:
+        for chunk in graph.stream(inputs, config, stream_mode=['custom', 'updates', 'messages', 'values']):
+            events.put(chunk)
+    except Exception as e:
+        events.put(('error', e))
+    finally:
+        events.put(_DONE)
+
+def stream_graph_events(graph, inputs, config=None):
+    """
+    Run the graph in a background thread and yield its progress as SSE strings:
+    node_start / node_end for every node, token for drafting LLM output and a
+    final result (or error) event. Keep-alive comments are sent while idle so
+    proxies do not drop the connection.
+    """
+    events = queue.Queue()
+    config = config or graph_config(inputs['session_id'])
+    worker = threading.Thread(target=_run_graph, args=(graph, inputs, config, events), daemon=True)
+    worker.start()
+
+    yield format_sse('start', {'status': 'started', 'sessionId': config['configurable']['thread_id']})
+
+    final_state = None
+    while True:
+        try:
+            item = events.get(timeout=HEARTBEAT_INTERVAL)
+        except queue.Empty:
+            yield ": keep-alive\n\n"
+            continue
+
+        if item is _DONE:
+            break
+
+        mode, payload = item
+        if mode == 'error':
+            yield format_sse('error', {'status': 'error', 'message': str(payload)})
+            return
+        if mode == 'custom':
+            yield format_sse(payload.pop('event', 'custom'), payload)
+        elif mode == 'updates':
+            for node, update in payload.items():
+                update = update or {}
+                yield format_sse('node_end', {
+                    'node': node,
+                    'retryCount': update.get('retryCount'),
+                    'feedback': update.get('feedback'),
+                })
+        elif mode == 'messages':
+            message, metadata = payload
+            if metadata.get('langgraph_node') in TOKEN_NODES and message.content:
+                yield format_sse('token', {'node': metadata['langgraph_node'], 'content': message.content})
+        elif mode == 'values':
+            final_state = payload
+
+    if final_state is None or 'formatted_sow' not in final_state:
+        yield format_sse('error', {'status': 'error', 'message': 'SOW generation did not complete'})
+        return
+
+    yield format_sse('result', build_sow_response(final_state))
@@ -0,0 +1,35 @@
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8080")
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+# Generations take minutes, keep streaming and long requests alive
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "600"))
+
+# Import the app (and, with MODEL_LOADING=eager, load the model weights) once in the
+# master so forked workers share the weights copy-on-write instead of loading their own
+preload_app = True
+
+def post_fork(server, worker):
+    """
+    Create network clients per worker, connections must not be shared across a fork,
+    and start the background model warm-up, threads of the master do not exist here
+    """
+    import threading
+    from config import MODEL_LOADING
+    from services.db import dispose_after_fork
+    from services.registry import registry
+
+    # The master may have opened pooled connections while loading the app
+    dispose_after_fork()
+
+    if MODEL_LOADING != "lazy":
+        registry.warm_up(kind="service")
+    if MODEL_LOADING == "background":
+        threading.Thread(target=registry.warm_up, kwargs={"kind": "model"}, daemon=True).start()
+
+def child_exit(server, worker):
+    """Drop the metric samples of a dead worker when metrics are aggregated across workers"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
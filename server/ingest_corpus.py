@@ -0,0 +1,32 @@
+import argparse
+import os
+from config import CACHE_SQLITE_PATH
+from services.ingestion import CorpusIngestor
+from services.vector_service import vector_service
+
+def main():
+    """Ingest a directory of historical SOWs (DOCX, PDF, markdown, text) into the vector store, resuming from the checkpoint"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("directory")
+    parser.add_argument("--batch-size", type=int, default=64, help="Chunks per embedding request")
+    parser.add_argument("--concurrency", type=int, default=4, help="Embedding requests in flight")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Characters per chunk")
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--checkpoint", default=os.path.join(os.path.dirname(CACHE_SQLITE_PATH), "ingest_checkpoint.json"),
+                        help="Progress file, files recorded here with the same digest are skipped")
+    args = parser.parse_args()
+
+    ingestor = CorpusIngestor(
+        vector_service.vector_store,
+        # Every chunk is embedded once, the query embedding cache is not needed here
+        vector_service.embeddings.embeddings,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        checkpoint_path=args.checkpoint,
+    )
+    ingestor.ingest(args.directory)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import argparse
+import json
+from services.vector_service import vector_service
+
+def main():
+    """Create, inspect, rebuild or drop the ANN index of the SOW vector collection"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("action", choices=["status", "create", "rebuild", "drop"],
+                        help="create keeps a valid index with the same parameters, rebuild always builds a new one")
+    parser.add_argument("--method", choices=["hnsw", "ivfflat", "none"], help="Defaults to VECTOR_INDEX")
+    parser.add_argument("--m", type=int, help="HNSW connections per node, defaults to VECTOR_HNSW_M")
+    parser.add_argument("--ef-construction", type=int, help="HNSW build candidate list, defaults to VECTOR_HNSW_EF_CONSTRUCTION")
+    parser.add_argument("--lists", type=int, help="IVFFlat lists, defaults to VECTOR_IVFFLAT_LISTS or rows / 1000")
+    args = parser.parse_args()
+
+    index = vector_service.index
+    if args.action in ("create", "rebuild"):
+        options = {"m": args.m, "ef_construction": args.ef_construction, "lists": args.lists,
+                   "force": args.action == "rebuild"}
+        if args.method:
+            options["method"] = args.method
+        print(index.ensure(**options))
+    elif args.action == "drop":
+        print(index.drop())
+    print(json.dumps(index.status(), indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
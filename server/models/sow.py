@@ -1,6 +1,13 @@
 from flask_sqlalchemy import SQLAlchemy
+from services.db import get_engine
 
-db = SQLAlchemy()
+class SharedEngineSQLAlchemy(SQLAlchemy):
+    """Flask-SQLAlchemy using the process wide engine and pool of services/db.py instead of its own"""
+
+    def _make_engine(self, bind_key, options, app):
+        return get_engine()
+
+db = SharedEngineSQLAlchemy()
 
 class SOWUserInput(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -1,3 +1,4 @@
+import re
 from langchain_core.prompts import ChatPromptTemplate
 
 system_template = """\
@@ -171,4 +172,103 @@ drafting_chat_prompt = ChatPromptTemplate.from_messages(
         ("system", system_template),
         ("user", user_chat_prompt)
     ]
-)
\ No newline at end of file
+)
+
+chat_patch_system_template = """\
+#Instruction:
+You are an expert SOW drafting specialist editing an existing Statement of Work. The SOW is a JSON object whose keys are its sections. Instead of rewriting the document, respond with the smallest list of edit operations that applies the user's requested change.
+
+#Operations:
+- {{"op": "replace", "field": "<section>", "value": <new content>}} replaces a whole section
+- {{"op": "replace", "field": "<section>", "index": <i>, "value": <item>}} replaces item i (0-based) of an array section
+- {{"op": "append", "field": "<section>", "value": <content>}} adds text to the end of a section, or an item to the end of an array section
+- {{"op": "append", "field": "<section>", "index": <i>, "value": <item>}} inserts an item after item i of an array section
+- {{"op": "remove", "field": "<section>", "index": <i>}} removes item i of an array section
+- {{"op": "remove", "field": "<section>"}} removes a whole section, only when the user explicitly asks for it
+
+#Rules:
+- Only touch sections the user asked to change, or that must change to stay consistent with the requested change
+- A replaced section must contain its complete new content, not only the changed sentence
+- Keep the format of the section: strings with markdown for points but no headings, "Contractor Resources" items as objects with roleName, noOfPersons and responsibility, "Milestones" items as objects with milestone, duration and deliverables (as multiple points in html)
+- Never mention any name or address unless the user provides it, use placeholders
+- Always use professional and legally-precise language
+- If there is any error feedback provided, fix it with further operations on the affected sections
+
+#IMPORTANT:
+- Respond ONLY with valid JSON of the form {{"operations": [...]}}
+- Do not include explanatory text, markdown formatting indicators, or code block syntax
+"""
+
+user_chat_patch_prompt = """
+ This is the user_query - {user_query}
+
+ ## Current SOW JSON:
+ {previous_sow}
+
+ ## Feedback Errors
+    {feedback}
+    <!-- Any feedback or errors from different state that needs to be considered -->
+"""
+
+drafting_chat_patch_prompt = ChatPromptTemplate.from_messages(
+    [
+        ("system", chat_patch_system_template),
+        ("user", user_chat_patch_prompt)
+    ]
+)
+
+# Field name -> description, as listed in the required JSON structure of the system prompt
+REQUIRED_FIELDS = dict(re.findall(
+    r'^- "([^"]+)": (.+)$',
+    system_template.split("#Required JSON Structure:")[1].split("#Input Mapping Instructions:")[0],
+    re.MULTILINE
+))
+
+# Coherent groups of SOW fields that can be drafted independently and merged
+SECTION_GROUPS = {
+    "commercial terms": [
+        "Fees", "Expenses", "Taxes", "Payment Terms", "Conversion", "Terms & Conditions",
+        "Service Level Agreement", "Change Process"
+    ],
+    "scope and deliverables": [
+        "Project Name", "Project Title", "Services Description", "Scope of Work", "Deliverables",
+        "Milestones", "Acceptance", "Timeline", "Start Date", "End Date", "Assumptions"
+    ],
+    "legal clauses": [
+        "SOW Effective Date", "Agreement Date", "Confidentiality", "Intellectual Property",
+        "Termination", "Limitation of Liability"
+    ],
+    "people and resources": [
+        "Company Information", "Company Name", "Client Name", "Client", "Client Contact", "Contact",
+        "Personnel and Locations", "Representatives", "Client Representatives", "Contractor Resources"
+    ],
+}
+
+def format_group_fields(fields):
+    """Render the required JSON structure lines for a subset of fields"""
+    return "\n".join(
+        f'- "{field}": {REQUIRED_FIELDS.get(field, "Revised content of this existing SOW section")}'
+        for field in fields
+    )
+
+# Same instructions as the full SOW prompt, but the required structure is limited to
+# one group of sections and the length target is shared with the other groups
+group_system_template = (
+    system_template.split("#Required JSON Structure:")[0]
+    + "#Required JSON Structure:\n"
+    + "You are drafting only the {group_name} sections of the SOW, the other sections are drafted separately "
+      "from the same project details. The output MUST include exactly the following properties formatted as valid JSON:\n"
+    + "{group_fields}\n\n"
+    + "#Input Mapping Instructions:"
+    + system_template.split("#Input Mapping Instructions:")[1].replace(
+        "- Ensure that SOW is atleast 8 to 12 pages long or about 1000 to 2500 words and is very detailed.",
+        "- Ensure these sections are as detailed as they would be in a complete SOW of 1000 to 2500 words."
+    )
+)
+
+drafting_group_prompt = ChatPromptTemplate.from_messages(
+    [
+        ("system", group_system_template),
+        ("user", user_template)
+    ]
+)
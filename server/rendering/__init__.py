@@ -0,0 +1,4 @@
+from rendering.engine import render_sow
+from rendering.sections import build_sections
+
+__all__ = ['render_sow', 'build_sections']
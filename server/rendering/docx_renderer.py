@@ -0,0 +1,118 @@
+from io import BytesIO
+import docx
+from docx.shared import Inches
+from docx.text.run import Run as DocxRun
+from rendering.sections import Heading, ListItem, Paragraph, Run, Table
+from rendering.template import TITLE_STYLE, template_bytes
+
+STYLES = [TITLE_STYLE, "Heading 1", "Heading 2", "Heading 3", "List Bullet", "List Number"]
+
+def add_runs(paragraph, runs):
+    for run in runs:
+        if "\n" in run.text or "\t" in run.text:
+            # Line breaks and tabs need their own elements, which python-docx adds character by character
+            docx_run = paragraph.add_run(run.text)
+        else:
+            r = paragraph._p.add_r()
+            r.add_t(run.text)
+            docx_run = DocxRun(r, paragraph)
+        if run.bold:
+            docx_run.bold = True
+        if run.italic:
+            docx_run.italic = True
+
+class DocxRenderer:
+    """Writes blocks into a copy of the template document"""
+
+    def __init__(self, template=None, logo=None):
+        self.doc = docx.Document(BytesIO(template or template_bytes()))
+        # Style ids are resolved once: assigning a style by name or object scans every style of the document
+        styles = self.doc.styles
+        self.style_ids = {name: styles[name].style_id for name in STYLES}
+        self.table_style = styles["Table Grid"]
+        self.abstract_num_id = self.list_number_abstract_id()
+        self.previous = None
+        self.num_id = None
+        if logo:
+            try:
+                self.doc.add_picture(BytesIO(logo), width=Inches(3))
+            except Exception as e:
+                print(f"⚠️ Error adding logo: {str(e)}")
+
+    def list_number_abstract_id(self):
+        """Abstract numbering of the List Number style, None when the template's style is not numbered"""
+        ppr = self.doc.styles["List Number"].element.pPr
+        if ppr is None or ppr.numPr is None or ppr.numPr.numId is None:
+            return None
+        return self.doc.part.numbering_part.element.num_having_numId(ppr.numPr.numId.val).abstractNumId.val
+
+    def restart_numbering(self, start):
+        """
+        A numbering instance of its own for one ordered list, starting at start.
+        Paragraphs of the List Number style otherwise share the style's instance and
+        every ordered list of the document continues the count of the previous one.
+        """
+        if self.abstract_num_id is None:
+            return None
+        num = self.doc.part.numbering_part.element.add_num(self.abstract_num_id)
+        num.add_lvlOverride(ilvl=0).add_startOverride(start)
+        return num.numId
+
+    def list_item(self, container, block, previous, paragraph=None):
+        """Paragraph of a list item; the first item of an ordered list restarts its numbering"""
+        paragraph = self.paragraph(container, self.list_style(block), paragraph)
+        if block.ordered:
+            if not (isinstance(previous, ListItem) and previous.ordered):
+                self.num_id = self.restart_numbering(block.number if block.number is not None else 1)
+            if self.num_id is not None:
+                num_pr = paragraph._p.get_or_add_pPr().get_or_add_numPr()
+                num_pr.get_or_add_ilvl().val = 0
+                num_pr.get_or_add_numId().val = self.num_id
+        add_runs(paragraph, block.runs)
+
+    def paragraph(self, container, style=None, paragraph=None):
+        paragraph = paragraph or container.add_paragraph()
+        if style:
+            paragraph._p.style = self.style_ids[style]
+        return paragraph
+
+    def list_style(self, block):
+        return "List Number" if block.ordered else "List Bullet"
+
+    def fill_cell(self, cell, blocks):
+        previous = None
+        for index, block in enumerate(blocks):
+            existing = None if index else cell.paragraphs[0]
+            if isinstance(block, Heading):
+                add_runs(self.paragraph(cell, paragraph=existing), [Run(block.text, bold=True)])
+            elif isinstance(block, ListItem):
+                self.list_item(cell, block, previous, existing)
+            else:
+                add_runs(self.paragraph(cell, paragraph=existing), block.runs)
+            previous = block
+
+    def block(self, block):
+        doc = self.doc
+        if isinstance(block, Heading):
+            style = TITLE_STYLE if block.title else f"Heading {block.level}"
+            add_runs(self.paragraph(doc, style), [Run(block.text)])
+        elif isinstance(block, ListItem):
+            self.list_item(doc, block, self.previous)
+        elif isinstance(block, Paragraph):
+            add_runs(self.paragraph(doc), block.runs)
+        elif isinstance(block, Table):
+            table = doc.add_table(rows=len(block.rows) + 1, cols=len(block.headers))
+            table.style = self.table_style
+            rows = table.rows
+            for cell, header in zip(rows[0].cells, block.headers):
+                cell.paragraphs[0].add_run(header).bold = True
+            for row, cells in zip(rows[1:], block.rows):
+                for cell, blocks in zip(row.cells, cells):
+                    self.fill_cell(cell, blocks)
+
+        self.previous = block
+
+    def result(self):
+        buffer = BytesIO()
+        self.doc.save(buffer)
+        return buffer.getvalue()
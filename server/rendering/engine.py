@@ -0,0 +1,21 @@
+from rendering.docx_renderer import DocxRenderer
+from rendering.markdown_renderer import MarkdownRenderer
+from rendering.sections import build_sections
+
+FORMATS = ("markdown", "docx")
+
+def render_sow(sow_data, formats=FORMATS, logo=None):
+    """
+    Render the SOW into each requested format in a single walk over its blocks.
+    Returns {"markdown": str, "docx": bytes} limited to the requested formats.
+    """
+    renderers = {}
+    if "markdown" in formats:
+        renderers["markdown"] = MarkdownRenderer()
+    if "docx" in formats:
+        renderers["docx"] = DocxRenderer(logo=logo)
+
+    for block in build_sections(sow_data):
+        for renderer in renderers.values():
+            renderer.block(block)
+    return {name: renderer.result() for name, renderer in renderers.items()}
@@ -0,0 +1,75 @@
+from rendering.sections import Heading, ListItem, Paragraph, Table
+
+def inline_markdown(runs):
+    parts = []
+    for run in runs:
+        if run.bold:
+            parts.append(f"**{run.text}**")
+        elif run.italic:
+            parts.append(f"*{run.text}*")
+        else:
+            parts.append(run.text)
+    return "".join(parts)
+
+def list_marker(block):
+    """The LLM's own number of an ordered item, so a list starting at 3 still starts at 3"""
+    if not block.ordered:
+        return "-"
+    return f"{block.number if block.number is not None else 1}."
+
+def cell_markdown(blocks):
+    """A table cell on one line: line breaks as <br>, lists as HTML so the table stays intact"""
+    parts = []
+    items = []
+    first = None
+
+    def close_list():
+        if first.ordered:
+            start = f' start="{first.number}"' if first.number not in (None, 1) else ""
+            parts.append(f"<ol{start}>{''.join(items)}</ol>")
+        else:
+            parts.append(f"<ul>{''.join(items)}</ul>")
+        items.clear()
+
+    for block in blocks:
+        if isinstance(block, ListItem):
+            if not items:
+                first = block
+            items.append(f"<li>{inline_markdown(block.runs)}</li>")
+            continue
+        if items:
+            close_list()
+        text = block.text if isinstance(block, Heading) else inline_markdown(block.runs)
+        parts.append(text.replace("\n", "<br>"))
+    if items:
+        close_list()
+    return "<br>".join(part for part in parts if part).replace("|", "\\|")
+
+class MarkdownRenderer:
+    """Collects the markdown of each block and joins it once at the end"""
+
+    def __init__(self):
+        self.parts = []
+        self.previous = None
+
+    def block(self, block):
+        if self.parts:
+            # List items of the same list are on consecutive lines, everything else is a paragraph
+            same_list = (isinstance(block, ListItem) and isinstance(self.previous, ListItem)
+                         and block.ordered == self.previous.ordered)
+            self.parts.append("\n" if same_list else "\n\n")
+        if isinstance(block, Heading):
+            self.parts.append(f"{'#' * (block.level + 1)} {block.text}")
+        elif isinstance(block, ListItem):
+            self.parts.append(f"{list_marker(block)} {inline_markdown(block.runs)}")
+        elif isinstance(block, Paragraph):
+            self.parts.append(inline_markdown(block.runs))
+        elif isinstance(block, Table):
+            self.parts.append(f"| {' | '.join(block.headers)} |\n")
+            self.parts.append(f"|{'|'.join('---' for _ in block.headers)}|")
+            for row in block.rows:
+                self.parts.append(f"\n| {' | '.join(cell_markdown(cell) for cell in row)} |")
+        self.previous = block
+
+    def result(self):
+        return "".join(self.parts) + "\n\n"
@@ -0,0 +1,156 @@
+"""
+Intermediate model of a SOW document. build_sections turns the validated SOW
+dict into a flat list of blocks once; the DOCX and markdown renderers only walk
+that list, so both formats always agree on structure and inline formatting.
+"""
+import re
+from typing import List, NamedTuple, Optional
+
+SECTION_ORDER = [
+    "Services Description", "Deliverables", "Milestones", "Acceptance",
+    "Personnel and Locations", "Representatives", "Client Representatives",
+    "Contractor Resources", "Terms & Conditions", "Fees", "Expenses", "Taxes", "Conversion",
+    "Limitation of Liability", "Service Level Agreement", "Assumptions", "Change Process"
+]
+
+# Columns of list sections: (header, key of each row dict)
+MILESTONE_COLUMNS = [("Milestone", "milestone"), ("Duration", "duration"), ("Deliverables", "deliverables")]
+RESOURCE_COLUMNS = [("Role", "roleName"), ("Resources", "noOfPersons"), ("Responsibility", "responsibility")]
+
+class Run(NamedTuple):
+    text: str
+    bold: bool = False
+    italic: bool = False
+
+class Heading(NamedTuple):
+    text: str
+    level: int = 1
+    title: bool = False  # The project name at the top of the document
+
+class Paragraph(NamedTuple):
+    runs: List[Run]
+
+class ListItem(NamedTuple):
+    runs: List[Run]
+    ordered: bool = False
+    number: Optional[int] = None  # Number the LLM gave an ordered item
+
+class Table(NamedTuple):
+    headers: List[str]
+    rows: List[List[list]]  # Each cell is a list of Paragraph and ListItem blocks
+
+INLINE = re.compile(r"\*\*(.+?)\*\*|(?<![\w*])\*(?!\s)([^*]+?)(?<!\s)\*(?![\w*])", re.DOTALL)
+BULLET = re.compile(r"^\s*(?:[-*+•])\s+(.*)$")
+NUMBERED = re.compile(r"^\s*(\d+)[.)]\s+(.*)$")
+HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*$")
+HTML_LIST = re.compile(r"</?(?:ul|ol)\s*>", re.IGNORECASE)
+HTML_ITEM = re.compile(r"<li\s*>(.*?)(?:</li\s*>|(?=<li\s*>)|$)", re.IGNORECASE | re.DOTALL)
+HTML_BREAK = re.compile(r"<br\s*/?>", re.IGNORECASE)
+HTML_BOLD = re.compile(r"</?(?:b|strong)\s*>", re.IGNORECASE)
+
+def parse_inline(text):
+    """Runs of a line with **bold** and *italic* spans"""
+    runs = []
+    position = 0
+    for match in INLINE.finditer(text):
+        if match.start() > position:
+            runs.append(Run(text[position:match.start()]))
+        if match.group(1) is not None:
+            runs.append(Run(match.group(1), bold=True))
+        else:
+            runs.append(Run(match.group(2), italic=True))
+        position = match.end()
+    if position < len(text):
+        runs.append(Run(text[position:]))
+    return runs
+
+def html_to_markdown(text):
+    """Convert the list, line break and bold HTML the LLM puts in fields to markdown"""
+    if "<" not in text:
+        return text
+    text = HTML_ITEM.sub(lambda match: f"\n- {match.group(1).strip()}\n", text)
+    text = HTML_LIST.sub("\n", text)
+    text = HTML_BREAK.sub("\n", text)
+    return HTML_BOLD.sub("**", text)
+
+def parse_blocks(text):
+    """
+    Blocks of a field value. Consecutive plain lines form one paragraph with line
+    breaks, blank lines separate paragraphs and -, *, + or numbered lines become
+    list items.
+    """
+    blocks = []
+    lines = []
+
+    def flush():
+        if lines:
+            blocks.append(Paragraph(parse_inline("\n".join(lines))))
+            lines.clear()
+
+    for line in html_to_markdown(text).splitlines():
+        if not line.strip():
+            flush()
+            continue
+        bullet = BULLET.match(line)
+        numbered = None if bullet else NUMBERED.match(line)
+        heading = None if bullet or numbered else HEADING.match(line)
+        if bullet:
+            flush()
+            blocks.append(ListItem(parse_inline(bullet.group(1))))
+        elif numbered:
+            flush()
+            blocks.append(ListItem(parse_inline(numbered.group(2)), ordered=True, number=int(numbered.group(1))))
+        elif heading:
+            flush()
+            blocks.append(Heading(heading.group(2), level=min(len(heading.group(1)), 3)))
+        else:
+            lines.append(line.rstrip())
+    flush()
+    return blocks
+
+def text_blocks(text):
+    return parse_blocks(text) or [Paragraph([])]
+
+def cell_text(value):
+    return "" if value is None else str(value)
+
+def build_table(rows, columns):
+    return Table(
+        headers=[header for header, _ in columns],
+        rows=[[text_blocks(cell_text(row.get(key))) for _, key in columns] for row in rows if isinstance(row, dict)],
+    )
+
+def section_blocks(section, data):
+    if data and isinstance(data, list):
+        return [build_table(data, MILESTONE_COLUMNS if section == "Milestones" else RESOURCE_COLUMNS)]
+    if isinstance(data, str):
+        return text_blocks(data)
+    return [Paragraph([])] if data is None or data == "" else text_blocks(str(data))
+
+def intro_text(sow_data):
+    return (f"This Statement of Work (\"SOW\") is made and entered into as of {sow_data['SOW Effective Date']} (the \"Effective Date\") by and between:\n\n"
+            f"1. {sow_data['Company Name']}, a corporation organized and existing under the laws of [Jurisdiction], having its principal "
+            f"place of business at [Address] (hereinafter referred to as \"Provider\"); and\n\n"
+            f"2. {sow_data['Client Name'] or 'Client'}, a [business entity type] organized and existing under the laws of [Jurisdiction], having its principal "
+            f"place of business at [Address] (hereinafter referred to as \"Client\").\n\n"
+            f"This SOW is executed pursuant to the Master Services Agreement between Provider and Client dated {sow_data['Agreement Date']} "
+            f"(the \"Agreement\"). In the event of any conflict between this SOW and the Agreement, the terms of the Agreement shall "
+            f"govern unless explicitly stated otherwise in this SOW with specific reference to the Agreement provisions being modified.")
+
+def build_sections(sow_data) -> list:
+    """The blocks of the SOW document, in order"""
+    blocks = [Heading(sow_data["Project Name"], title=True)]
+    blocks += text_blocks(intro_text(sow_data))
+
+    for section in SECTION_ORDER:
+        blocks.append(Heading(section))
+        blocks += section_blocks(section, sow_data.get(section))
+
+    client = sow_data['Client Name'] or 'Client'
+    company = sow_data['Company Name'] or ''
+    blocks.append(Heading("Signatures"))
+    for line in ("IN WITNESS WHEREOF, the Parties have executed this Agreement as of the Effective Date.",
+                 f"For {client} (Client)", "Name: ___________________", "Signature: ________________",
+                 f"For {company} (Service Provider)", "Name: ___________________", "Signature: ________________"):
+        blocks.append(Paragraph([Run(line)]))
+    return blocks
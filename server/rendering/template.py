@@ -0,0 +1,57 @@
+"""
+The styled base document every DOCX is cloned from. It is built (or read from
+RENDER_TEMPLATE_PATH) and serialized once per process, so a request only parses
+these bytes instead of creating and styling a new document.
+"""
+import functools
+import threading
+from io import BytesIO
+import docx
+from docx.enum.style import WD_STYLE_TYPE
+from docx.shared import Pt
+from config import RENDER_TEMPLATE_PATH
+
+TITLE_STYLE = "SOW Title"
+
+# Styles the DOCX renderer uses, all present in the python-docx default template
+REQUIRED_STYLES = ["Normal", "Heading 1", "Heading 2", "Heading 3", "List Bullet", "List Number", "Table Grid"]
+
+lock = threading.Lock()
+
+def add_default_styles(doc):
+    doc.styles["Normal"].font.size = Pt(12)
+    if TITLE_STYLE not in [style.name for style in doc.styles]:
+        title = doc.styles.add_style(TITLE_STYLE, WD_STYLE_TYPE.PARAGRAPH)
+        title.base_style = doc.styles["Heading 1"]
+        title.next_paragraph_style = doc.styles["Normal"]
+        title.font.size = Pt(16)
+        title.paragraph_format.space_after = Pt(14)
+
+def clear_body(doc):
+    """Drop the template's content, keeping the section properties (page setup, headers and footers)"""
+    body = doc.element.body
+    for element in list(body):
+        if not element.tag.endswith("}sectPr"):
+            body.remove(element)
+
+@functools.lru_cache(maxsize=None)
+def build_template(path):
+    doc = docx.Document(path or None)
+    names = {style.name for style in doc.styles}
+    missing = [name for name in REQUIRED_STYLES if name not in names]
+    if missing:
+        raise ValueError(f"DOCX template {path} lacks the styles {', '.join(missing)}")
+    if path:
+        clear_body(doc)
+        if TITLE_STYLE not in names:
+            add_default_styles(doc)
+    else:
+        add_default_styles(doc)
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+def template_bytes(path=RENDER_TEMPLATE_PATH):
+    """Serialized base document, built on first use"""
+    with lock:
+        return build_template(path)
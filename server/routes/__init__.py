@@ -1,6 +1,10 @@
 from routes.sow_routes import sow_bp
 from routes.chat_routes import chat_bp
 from routes.feedback_routes import feedback_bp
+from routes.job_routes import job_bp
+from routes.health_routes import health_bp
+from routes.document_routes import document_bp
+from routes.session_routes import session_bp
 
 # Export all blueprints for easy import in app.py
-__all__ = ['sow_bp', 'chat_bp', 'feedback_bp']
\ No newline at end of file
+__all__ = ['sow_bp', 'chat_bp', 'feedback_bp', 'job_bp', 'health_bp', 'document_bp', 'session_bp']
\ No newline at end of file
@@ -1,5 +1,9 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from graph.sow_graph import graph
+from graph.inputs import build_chat_state, build_sow_response, chat_key
+from graph.streaming import stream_graph_events, SSE_HEADERS
+from graph.sessions import graph_config, require_session, SessionNotFoundError
+from services.single_flight import single_flight
 
 chat_bp = Blueprint('chat', __name__)
 
@@ -8,26 +12,31 @@ def chat():
     try:
         # Get the request data
         data = request.get_json()
+        # Continue the session's thread when the client sends one, the previous SOW is loaded from it
+        session = require_session(graph, data.get("sessionId"))
         
-        # Extract necessary fields
-        user_query = data.get("message", "Unknown")
-        generated_sow = data.get("context", "Unknown")
-        
-        # Process the chat request through the agent workflow graph
-        response = graph.invoke({ 
-            'user_query': user_query, 
-            'flow': 'chat', 
-            'previous_sow': generated_sow 
-        })
+        def refine():
+            inputs = build_chat_state(data, session)
+            response = graph.invoke(inputs, graph_config(inputs['session_id']))
+            return build_sow_response(response)
 
-        # Return the formatted response
-        sow_response = {
-            "status": "success",
-            "message": response['formatted_sow'],
-            "sow_json": response['sow'],
-            "fileName": response['doc_file_path']
-        }
-        
-        return jsonify(sow_response), 200
+        # The same message sent again while it is being processed shares the running turn
+        return jsonify(single_flight.run(chat_key(data), refine, "chat")), 200
+    except SessionNotFoundError as e:
+        return jsonify({"status": "error", "message": str(e)}), 404
     except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 500
\ No newline at end of file
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@chat_bp.route('/chat/stream', methods=['POST'])
+def chat_stream():
+    """Same as /chat but streams progress and tokens as Server-Sent Events"""
+    try:
+        data = request.get_json()
+        inputs = build_chat_state(data, require_session(graph, data.get("sessionId")))
+    except SessionNotFoundError as e:
+        return jsonify({"status": "error", "message": str(e)}), 404
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+    events = stream_graph_events(graph, inputs)
+    return Response(stream_with_context(events), mimetype='text/event-stream', headers=SSE_HEADERS)
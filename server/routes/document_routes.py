@@ -0,0 +1,43 @@
+from flask import Blueprint, jsonify, send_file
+from services.document_store import document_store, DOCX_MIMETYPE
+from graph.sow_graph import formatting_agent
+
+document_bp = Blueprint('document', __name__)
+
+# Content addressed documents never change, clients and proxies may cache them for a year
+CACHE_MAX_AGE = 365 * 24 * 3600
+
+@document_bp.route('/documents/<file_name>', methods=['GET'])
+def download_document(file_name):
+    """
+    Stream a generated DOCX from the document store, rendering it first when the
+    name is a SOW version that was not downloaded before. The digest is the ETag, so
+    If-None-Match answers 304, and Range/If-Range requests get partial content.
+    The file is sent in blocks (or with sendfile under gunicorn), never read into memory whole.
+    """
+    digest = file_name.removesuffix('.docx')
+    try:
+        meta = document_store.metadata(digest)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    if meta is not None and meta.get("kind") == "sow":
+        # A SOW version whose DOCX is rendered on its first download
+        try:
+            digest = formatting_agent.render_document(digest)
+        except Exception as e:
+            return jsonify({"status": "error", "message": f"Document rendering failed: {str(e)}"}), 500
+        meta = document_store.metadata(digest) if digest else None
+    if meta is None or not document_store.exists(digest):
+        return jsonify({"status": "error", "message": "Document not found"}), 404
+
+    response = send_file(
+        document_store.path(digest),
+        mimetype=DOCX_MIMETYPE,
+        as_attachment=True,
+        download_name=f"{meta.get('name') or 'Generated_SOW'}.docx",
+        etag=digest,
+        conditional=True,
+        max_age=CACHE_MAX_AGE,
+    )
+    response.cache_control.immutable = True
+    return response
@@ -0,0 +1,46 @@
+from flask import Blueprint, Response, jsonify
+from services.registry import registry
+from services.llm_service import llm_service
+from services.vector_service import vector_service
+from services.metrics import render_metrics
+from services.asset_cache import asset_cache
+from services.document_store import document_store
+from services.single_flight import single_flight
+from graph.sow_graph import validation_agent, formatting_agent
+from config import MODEL_LOADING
+
+health_bp = Blueprint('health', __name__)
+
+@health_bp.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the process is up and serving requests"""
+    return jsonify({"status": "ok", "models": registry.status()}), 200
+
+@health_bp.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: with lazy loading the app is always ready, otherwise once warm-up finished"""
+    ready = MODEL_LOADING == "lazy" or registry.warmed_up
+    return jsonify({
+        "status": "ready" if ready else "loading",
+        "modelLoading": MODEL_LOADING,
+        "models": registry.status()
+    }), 200 if ready else 503
+
+@health_bp.route('/stats', methods=['GET'])
+def stats():
+    """Cache hit ratios and the latency they saved"""
+    return jsonify({
+        "llmCache": llm_service.cache_stats() if registry.is_loaded("llm_service") else None,
+        "validationCache": validation_agent.cache.stats(),
+        "embeddingCache": vector_service.embeddings.stats() if registry.is_loaded("vector_service") else None,
+        "assetCache": asset_cache.stats(),
+        "documentStore": document_store.stats(),
+        "documentRendering": formatting_agent.stats(),
+        "singleFlight": single_flight.stats(),
+    }), 200
+
+@health_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics: node, LLM and vector store latency, tokens, retries, compliance scores and caches"""
+    body, content_type = render_metrics()
+    return Response(body, mimetype=content_type)
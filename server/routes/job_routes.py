@@ -0,0 +1,49 @@
+from flask import Blueprint, request, jsonify
+from graph.inputs import build_query_map, build_form_state, build_chat_state, form_key, chat_key
+from graph.jobs import job_manager, QueueFullError
+from graph.sessions import require_session, SessionNotFoundError
+from graph.sow_graph import graph
+from routes.sow_routes import store_user_input
+
+job_bp = Blueprint('jobs', __name__)
+
+@job_bp.route('/jobs', methods=['POST'])
+def create_job():
+    try:
+        data = request.get_json()
+        kind = data.get("type", "form")
+        on_run = None
+
+        if kind == "form":
+            query_map = build_query_map(data)
+            options = (data.get("draftingMode"), data.get("repairMode"), data.get("brand"))
+            key = form_key(query_map, *options)
+            inputs = build_form_state(query_map, *options)
+            on_run = lambda: store_user_input(query_map)
+        elif kind == "chat":
+            key = chat_key(data)
+            inputs = build_chat_state(data, require_session(graph, data.get("sessionId")))
+        else:
+            return jsonify({"status": "error", "message": f"Unknown job type: {kind}"}), 400
+
+        # A duplicate of an unfinished job gets that job's id; the form is stored by the run, as in /generate-sow,
+        # so a job coalesced with a request in another worker stores no second submission
+        job = job_manager.submit(kind, inputs, key, on_run)
+        return jsonify({"status": "queued", "jobId": job.id}), 202
+    except QueueFullError as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
+    except SessionNotFoundError as e:
+        return jsonify({"status": "error", "message": str(e)}), 404
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@job_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Job not found"}), 404
+    return jsonify(job), 200
+
+@job_bp.route('/jobs', methods=['GET'])
+def job_stats():
+    return jsonify(job_manager.stats()), 200
@@ -0,0 +1,37 @@
+from flask import Blueprint, jsonify
+from graph.sow_graph import graph
+from graph.inputs import build_sow_response
+from graph.sessions import graph_config, resume_session
+
+session_bp = Blueprint('session', __name__)
+
+@session_bp.route('/sessions/<session_id>', methods=['GET'])
+def get_session(session_id):
+    """Latest checkpoint of a session: the SOW of its last finished run, or the nodes still pending"""
+    try:
+        snapshot = graph.get_state(graph_config(session_id))
+        if not snapshot.values:
+            return jsonify({"status": "error", "message": "Session not found"}), 404
+        values = snapshot.values
+        return jsonify({
+            "sessionId": session_id,
+            "status": "interrupted" if snapshot.next else "completed",
+            "pendingNodes": list(snapshot.next),
+            "retryCount": values.get('retryCount'),
+            "result": build_sow_response(values) if not snapshot.next and 'formatted_sow' in values else None,
+        }), 200
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@session_bp.route('/sessions/<session_id>/resume', methods=['POST'])
+def resume(session_id):
+    """Finish an interrupted run from its last completed node, or return the finished result"""
+    try:
+        response = resume_session(graph, session_id)
+        if response is None:
+            return jsonify({"status": "error", "message": "Session not found"}), 404
+        if 'formatted_sow' not in response:
+            return jsonify({"status": "error", "message": response.get('error') or 'SOW generation did not complete'}), 500
+        return jsonify(build_sow_response(response)), 200
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
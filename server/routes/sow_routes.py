@@ -1,81 +1,63 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from models.sow import db, SOWUserInput
+from services.db import get_engine
+from services.write_behind import WriteBehindQueue
+from config import WRITE_BEHIND
 from graph.sow_graph import graph
+from graph.inputs import build_query_map, build_form_state, build_sow_response, form_key
+from graph.streaming import stream_graph_events, SSE_HEADERS
+from graph.sessions import graph_config
+from services.single_flight import single_flight
 
 sow_bp = Blueprint('sow', __name__)
 
+def persist_user_inputs(rows):
+    """Insert a batch of form submissions in one statement"""
+    with get_engine().begin() as conn:
+        conn.execute(SOWUserInput.__table__.insert(), rows)
+
+user_input_writer = WriteBehindQueue("sow_user_input", persist_user_inputs)
+
+def store_user_input(query_map):
+    """Store user's query in database for future use, off the request path unless WRITE_BEHIND is off"""
+    if WRITE_BEHIND:
+        user_input_writer.put(dict(query_map))
+        return
+    sow_data = SOWUserInput(**query_map)
+    db.session.add(sow_data)
+    db.session.commit()
+
 @sow_bp.route('/generate-sow', methods=['POST'])
 def generate_sow():
     try:
-        # Get the request data
+        # Get the request data and extract the form fields
         data = request.get_json()
-        
-        # Extract necessary fields
-        project_objectives = data.get("projectObjectives", "NA")
-        project_scope = data.get("projectScope", "NA")
-        detailed_desc = data.get("servicesDescription", "NA")
-        specific_feature = data.get("specificFeatures", "NA")
-        platform_tech = data.get("platformsTechnologies", "NA")
-        integrations = data.get("integrations", "NA")
-        design_specification = data.get("designSpecifications", "NA")
-        out_of_scope = data.get("outOfScope", "NA")
-        deliverables = data.get("deliverables", "NA")
-        project_timeline = data.get("timeline", "NA")
-        
+        query_map = build_query_map(data)
+        options = (data.get("draftingMode"), data.get("repairMode"), data.get("brand"))
 
-        # Store user's query in database for future use
-        sow_data = SOWUserInput(
-                                project_objectives=project_objectives,
-                                project_scope=project_scope,
-                                detailed_desc= detailed_desc,
-                                specific_feature=specific_feature,
-                                platform_tech=platform_tech,
-                                integrations=integrations,
-                                design_specification=design_specification,
-                                out_of_scope=out_of_scope,
-                                deliverables=deliverables,
-                                project_timeline=project_timeline)
-        db.session.add(sow_data)
-        db.session.commit()
+        def generate():
+            store_user_input(query_map)
 
-        # Prepare the user query and query map
-        user_query = (
-            f"Objectives of project are {project_objectives}.\n"
-            f"Scope of the project is {project_scope}.\n"
-            f"Detailed Description of Services is {detailed_desc}.\n"
-            f"Specific Features are {specific_feature}.\n"
-            f"Platforms and Technologies is {platform_tech}.\n"
-            f"Integrations is {integrations}.\n"
-            f"Design Specifications are {design_specification}.\n"
-            f"Out of Scope is {out_of_scope}.\n"
-            f"Deliverables are {deliverables}.\n"
-            f"Project Timeline and Schedule is {project_timeline}."
-        )
-        
-        user_query_map = {
-            "project_objectives": project_objectives,
-            "project_scope": project_scope,
-            "detailed_desc": detailed_desc,
-            "specific_feature": specific_feature,
-            "platform_tech": platform_tech,
-            "integrations": integrations,
-            "design_specification": design_specification,
-            "out_of_scope": out_of_scope,
-            "deliverables": deliverables,
-            "project_timeline": project_timeline
-        }
+            # Process the request through the agent workflow graph
+            inputs = build_form_state(query_map, *options)
+            response = graph.invoke(inputs, graph_config(inputs['session_id']))
+            return build_sow_response(response)
 
-        # Process the request through the agent workflow graph
-        response = graph.invoke({ 'user_query': user_query, 'query_map': user_query_map })
-        
-        # Return the formatted response
-        sow_response = {
-            "status": "success",
-            "message": response['formatted_sow'],
-            "sow_json": response['sow'],
-            "fileName": response['doc_file_path']
-        }
-        
-        return jsonify(sow_response), 200
+        # Identical forms submitted while one is running (double clicks, client retries) share its run and result
+        return jsonify(single_flight.run(form_key(query_map, *options), generate, "form")), 200
     except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 500
\ No newline at end of file
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@sow_bp.route('/generate-sow/stream', methods=['POST'])
+def generate_sow_stream():
+    """Same as /generate-sow but streams progress and tokens as Server-Sent Events"""
+    try:
+        data = request.get_json()
+        query_map = build_query_map(data)
+
+        store_user_input(query_map)
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+    events = stream_graph_events(graph, build_form_state(query_map, data.get("draftingMode"), data.get("repairMode"), data.get("brand")))
+    return Response(stream_with_context(events), mimetype='text/event-stream', headers=SSE_HEADERS)
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from config import ASSET_CACHE_DIR, ASSET_CACHE_TTL, ASSET_FETCH_TIMEOUT, LOGO_FALLBACK_PATH
+
+# Seconds before an asset that could never be fetched is tried again
+RETRY_AFTER = 60
+
+class Asset:
+    def __init__(self, content, etag=None, last_modified=None, fetched_at=None):
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at or time.time()
+
+class AssetCache:
+    """
+    Remote images (logos) keyed by URL, kept in memory and on disk. Once an asset
+    is cached it is served without network I/O and revalidated in the background
+    with ETag/Last-Modified after the TTL. When it cannot be fetched, the last
+    known good copy or the bundled fallback image is served instead.
+    """
+
+    def __init__(self, directory=ASSET_CACHE_DIR, ttl=ASSET_CACHE_TTL, timeout=ASSET_FETCH_TIMEOUT,
+                 fallback_path=LOGO_FALLBACK_PATH):
+        self.directory = directory
+        self.ttl = ttl
+        self.timeout = timeout
+        self.fallback_path = fallback_path
+        self.assets = {}
+        self.failed = {}  # url -> time of the last failed fetch, for assets with no cached copy
+        self.refreshing = set()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.executor = None
+        self.pid = None
+
+    def path(self, url):
+        """Disk location of an asset and its metadata"""
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    def load(self, url):
+        """Asset from disk, None when it was never fetched"""
+        path = self.path(url)
+        try:
+            with open(path, "rb") as file:
+                content = file.read()
+            with open(f"{path}.json") as file:
+                meta = json.load(file)
+        except (OSError, ValueError):
+            return None
+        return Asset(content, meta.get("etag"), meta.get("lastModified"), meta.get("fetchedAt"))
+
+    def save(self, url, asset):
+        """Write an asset to disk atomically, so a crash never leaves a truncated image"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(url)
+        for target, data, mode in (
+            (path, asset.content, "wb"),
+            (f"{path}.json", json.dumps({"url": url, "etag": asset.etag, "lastModified": asset.last_modified,
+                                         "fetchedAt": asset.fetched_at}), "w"),
+        ):
+            temp_path = f"{target}.tmp"
+            with open(temp_path, mode) as file:
+                file.write(data)
+            os.replace(temp_path, target)
+
+    def fetch(self, url, cached=None):
+        """
+        Download an asset, conditionally when a cached copy exists. Returns the new
+        or revalidated asset, or None when the request failed.
+        """
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        try:
+            response = requests.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"⚠️ Could not fetch asset {url}: {e}")
+            return None
+
+        if response.status_code == 304 and cached is not None:
+            asset = Asset(cached.content, cached.etag, cached.last_modified)
+        elif response.status_code == 200 and response.content:
+            asset = Asset(response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        else:
+            print(f"⚠️ Failed to fetch asset {url}. Status code: {response.status_code}")
+            return None
+
+        try:
+            self.save(url, asset)
+        except OSError as e:
+            print(f"⚠️ Could not write asset {url} to disk: {e}")
+        return asset
+
+    def refresh(self, url):
+        """Revalidate an asset, keeping the current copy when the host is unreachable"""
+        try:
+            asset = self.fetch(url, self.assets.get(url))
+            if asset is not None:
+                self.assets[url] = asset
+                self.failed.pop(url, None)
+            elif url not in self.assets:
+                self.failed[url] = time.time()
+        finally:
+            with self.lock:
+                self.refreshing.discard(url)
+
+    def ensure_executor(self):
+        """
+        Create the refresh threads on first use, again in a forked worker: an executor
+        used before fork() (create_app prefetches in the gunicorn master) never runs
+        tasks in the child, and refreshes in flight at the fork never finish there
+        """
+        if self.executor is not None and self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.executor is None or self.pid != os.getpid():
+                self.pid = os.getpid()
+                self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="asset-cache")
+                self.refreshing.clear()
+
+    def refresh_in_background(self, url):
+        self.ensure_executor()
+        with self.lock:
+            if url in self.refreshing:
+                return
+            self.refreshing.add(url)
+        self.executor.submit(self.refresh, url)
+
+    def prefetch(self, url):
+        """Start caching an asset ahead of the first document that needs it"""
+        if url and url not in self.assets:
+            asset = self.load(url)
+            if asset is not None:
+                self.assets[url] = asset
+            if asset is None or asset.fetched_at + self.ttl < time.time():
+                self.refresh_in_background(url)
+
+    def fallback(self):
+        if self.fallback_path and os.path.exists(self.fallback_path):
+            with open(self.fallback_path, "rb") as file:
+                return file.read()
+        return None
+
+    def get(self, url):
+        """Bytes of the asset at url, the fallback image, or None"""
+        if not url:
+            return self.fallback()
+
+        asset = self.assets.get(url)
+        if asset is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if asset is None and url in self.failed:
+            # Unreachable so far: never block a request on it again, retry in the background
+            if self.failed[url] + RETRY_AFTER < time.time():
+                self.refresh_in_background(url)
+            return self.fallback()
+
+        if asset is None:
+            asset = self.load(url)
+            if asset is None:
+                # First use of this URL: the only time a request waits for the network
+                asset = self.fetch(url)
+            if asset is None:
+                self.failed[url] = time.time()
+                return self.fallback()
+            self.assets[url] = asset
+
+        if asset.fetched_at + self.ttl < time.time():
+            self.refresh_in_background(url)
+        return asset.content
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": round(self.hits / total, 3) if total else 0.0,
+            "size": len(self.assets),
+            "unreachable": len(self.failed),
+        }
+
+asset_cache = AssetCache()
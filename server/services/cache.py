@@ -0,0 +1,282 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import text
+
+from config import CACHE_SQLITE_PATH
+from services.metrics import CACHE_HITS, CACHE_MISSES, CACHE_ENTRIES
+from services.db import get_engine
+
+def hash_key(*parts):
+    """Stable sha256 key over the given parts"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with optional TTL (seconds)"""
+
+    def __init__(self, max_size=1024, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at and expires_at < time.time():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self.lock:
+            self.entries[key] = (value, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+class SQLiteStore:
+    """
+    Persistent key/value tier in a local SQLite file, values stored as JSON. The
+    connection is opened on first use in each process: one inherited across a
+    fork would be shared by the parent and every worker. As in PostgresStore,
+    reads refresh accessed_at at most every TOUCH_INTERVAL seconds and the size
+    limit and TTL are enforced every EVICT_EVERY writes.
+    """
+
+    TOUCH_INTERVAL = 60
+    EVICT_EVERY = 100
+
+    def __init__(self, table, path=CACHE_SQLITE_PATH, ttl=None, max_size=None):
+        self.table = table
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.conn = None
+        self.pid = None
+        self.writes = 0
+
+    def connect(self):
+        """Connection of the current process, called with the lock held"""
+        if self.conn is not None and self.pid == os.getpid():
+            return self.conn
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        # Eviction finds its cutoff by walking this index instead of sorting the table
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed_at_idx ON {self.table} (accessed_at)")
+        conn.commit()
+        self.conn = conn
+        self.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            conn = self.connect()
+            row = conn.execute(
+                f"SELECT value, created_at, accessed_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl and row[1] + self.ttl < now:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            if row[2] + self.TOUCH_INTERVAL < now:
+                conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+                conn.commit()
+            return json.loads(row[0])
+
+    def set(self, key, value):
+        now = time.time()
+        with self.lock:
+            conn = self.connect()
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+            self.writes += 1
+            if self.writes % self.EVICT_EVERY == 0:
+                self.evict(conn)
+            conn.commit()
+
+    def evict(self, conn):
+        """Drop expired rows and the least recently used ones beyond max_size, called with the lock held"""
+        if self.ttl:
+            conn.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl,))
+        if self.max_size:
+            cutoff = conn.execute(
+                f"SELECT accessed_at FROM {self.table} ORDER BY accessed_at DESC LIMIT 1 OFFSET ?", (self.max_size,)
+            ).fetchone()
+            if cutoff is not None:
+                conn.execute(f"DELETE FROM {self.table} WHERE accessed_at <= ?", cutoff)
+
+class PostgresStore:
+    """
+    Persistent key/value tier in a Postgres table shared by every worker, values stored as JSONB.
+    Reads refresh accessed_at at most every TOUCH_INTERVAL seconds, and the size limit and
+    TTL are enforced every EVICT_EVERY writes rather than on each one.
+    """
+
+    TOUCH_INTERVAL = 60
+    EVICT_EVERY = 100
+
+    def __init__(self, table, ttl=None, max_size=None):
+        self.table = table
+        self.ttl = ttl
+        self.max_size = max_size
+        self.engine = None
+        self.writes = 0
+        self.lock = threading.Lock()
+
+    def connect(self):
+        """Create the engine and table on first use so importing never touches the database"""
+        if self.engine is not None:
+            return self.engine
+        with self.lock:
+            if self.engine is None:
+                engine = get_engine()
+                with engine.begin() as conn:
+                    conn.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                        "key TEXT PRIMARY KEY, value JSONB NOT NULL, "
+                        "created_at TIMESTAMPTZ NOT NULL DEFAULT now(), accessed_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+                    ))
+                    # Eviction finds its cutoff by walking this index instead of sorting the table
+                    conn.execute(text(
+                        f"CREATE INDEX IF NOT EXISTS {self.table}_accessed_at_idx ON {self.table} (accessed_at)"
+                    ))
+                self.engine = engine
+        return self.engine
+
+    def get(self, key):
+        with self.connect().begin() as conn:
+            row = conn.execute(text(
+                f"SELECT value, accessed_at < now() - make_interval(secs => :touch) FROM {self.table} WHERE key = :key "
+                "AND (CAST(:ttl AS DOUBLE PRECISION) IS NULL OR created_at > now() - make_interval(secs => :ttl))"
+            ), {"key": key, "ttl": self.ttl, "touch": self.TOUCH_INTERVAL}).fetchone()
+            if row is None:
+                return None
+            if row[1]:
+                conn.execute(text(f"UPDATE {self.table} SET accessed_at = now() WHERE key = :key"), {"key": key})
+        return row[0]
+
+    def set(self, key, value):
+        with self.connect().begin() as conn:
+            conn.execute(text(
+                f"INSERT INTO {self.table} (key, value) VALUES (:key, CAST(:value AS JSONB)) "
+                "ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, created_at = now(), accessed_at = now()"
+            ), {"key": key, "value": json.dumps(value)})
+        with self.lock:
+            self.writes += 1
+            due = self.writes % self.EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Drop expired rows and the least recently used ones beyond max_size"""
+        with self.connect().begin() as conn:
+            if self.ttl:
+                conn.execute(text(f"DELETE FROM {self.table} WHERE created_at < now() - make_interval(secs => :ttl)"),
+                             {"ttl": self.ttl})
+            if self.max_size:
+                cutoff = conn.execute(text(
+                    f"SELECT accessed_at FROM {self.table} ORDER BY accessed_at DESC OFFSET :max_size LIMIT 1"
+                ), {"max_size": self.max_size}).scalar()
+                if cutoff is not None:
+                    conn.execute(text(f"DELETE FROM {self.table} WHERE accessed_at <= :cutoff"), {"cutoff": cutoff})
+
+def build_store(backend, table, ttl=None, max_size=None):
+    """Create the persistent tier for a cache backend name ('sqlite', 'postgres' or '' for none)"""
+    if not backend or backend == "memory":
+        return None
+    if backend == "sqlite":
+        return SQLiteStore(table, ttl=ttl, max_size=max_size)
+    if backend == "postgres":
+        return PostgresStore(table, ttl=ttl, max_size=max_size)
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+class TieredCache:
+    """In-process LRU in front of an optional persistent store, with hit/miss counters"""
+
+    def __init__(self, name, max_size=1024, ttl=None, store=None):
+        self.name = name
+        self.memory = LRUCache(max_size=max_size, ttl=ttl)
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        # Prometheus children of this cache, counted per process and merged across workers
+        self.hit_counter = CACHE_HITS.labels(name)
+        self.miss_counter = CACHE_MISSES.labels(name)
+        self.entries_gauge = CACHE_ENTRIES.labels(name)
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is None and self.store is not None:
+            try:
+                value = self.store.get(key)
+            except Exception as e:
+                print(f"⚠️ {self.name} cache store read failed: {str(e)}")
+                value = None
+            if value is not None:
+                self.memory.set(key, value)
+
+        with self.lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if value is None:
+            self.miss_counter.inc()
+        else:
+            self.hit_counter.inc()
+        self.entries_gauge.set(len(self.memory))
+        return value
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        self.entries_gauge.set(len(self.memory))
+        if self.store is not None:
+            try:
+                self.store.set(key, value)
+            except Exception as e:
+                print(f"⚠️ {self.name} cache store write failed: {str(e)}")
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRatio": round(self.hits / total, 4) if total else 0.0,
+                "size": len(self.memory),
+            }
@@ -0,0 +1,58 @@
+"""
+The one SQLAlchemy engine (psycopg3) of a process. Flask-SQLAlchemy, PGVector
+and the Postgres cache tiers all check connections out of its pool, so
+DB_POOL_SIZE + DB_MAX_OVERFLOW bounds the connections a worker opens. Single-flight
+advisory locks are held for a whole graph run, so they use unpooled connections
+of a second engine instead of starving that pool.
+"""
+import threading
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+from config import (POSTGRESQL_BASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE,
+                    DB_STATEMENT_TIMEOUT_MS, VECTOR_HNSW_EF_SEARCH, VECTOR_IVFFLAT_PROBES)
+from services.metrics import track_pool
+
+engine = None
+lock_engine = None
+lock = threading.Lock()
+
+def database_url():
+    return f"postgresql+psycopg://{POSTGRESQL_BASE_URL}"
+
+def engine_options():
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+        # Applied to every session, so a runaway query cannot hold a pooled connection forever, and vector
+        # searches use the configured ANN recall settings
+        "connect_args": {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS} "
+                                    f"-c hnsw.ef_search={VECTOR_HNSW_EF_SEARCH} -c ivfflat.probes={VECTOR_IVFFLAT_PROBES}"},
+    }
+
+def get_engine():
+    """The shared engine, created on first use. Creating it does not connect."""
+    global engine
+    if engine is None:
+        with lock:
+            if engine is None:
+                engine = create_engine(database_url(), **engine_options())
+                track_pool(engine)
+    return engine
+
+def get_lock_engine():
+    """Engine without a pool for connections held as long as a lock, each one is closed on release"""
+    global lock_engine
+    if lock_engine is None:
+        with lock:
+            if lock_engine is None:
+                lock_engine = create_engine(database_url(), poolclass=NullPool,
+                                            connect_args=engine_options()["connect_args"])
+    return lock_engine
+
+def dispose_after_fork():
+    """Drop pooled connections inherited from the parent process without closing them for the parent"""
+    if engine is not None:
+        engine.dispose(close=False)
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import zipfile
+from io import BytesIO
+from config import DOCUMENT_STORE_DIR, DOCUMENT_MAX_AGE, DOCUMENT_MAX_BYTES, DOCUMENT_EVICT_INTERVAL
+
+DOCX_MIMETYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+DIGEST = re.compile(r"^[0-9a-f]{64}$")
+# Stored kinds: rendered documents and the SOW sources they are rendered from on demand
+SUFFIXES = {"docx": ".docx", "sow": ".sow"}
+# Earliest time a zip entry can carry
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+def atomic_write(path, data):
+    """Write to a temporary file in the same directory and rename it over path"""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def stable_zip(content):
+    """
+    The same zip with every entry stamped ZIP_EPOCH. python-docx writes entries
+    with the current time, so the same SOW rendered a second later would
+    otherwise hash to a different document.
+    """
+    output = BytesIO()
+    with zipfile.ZipFile(BytesIO(content)) as source, zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as target:
+        for entry in source.infolist():
+            info = zipfile.ZipInfo(entry.filename, date_time=ZIP_EPOCH)
+            info.compress_type = entry.compress_type
+            info.external_attr = entry.external_attr
+            target.writestr(info, source.read(entry))
+    return output.getvalue()
+
+class DocumentStore:
+    """
+    Generated documents addressed by the SHA-256 of their content, so concurrent
+    requests never overwrite each other and identical SOWs are stored once, and
+    the SOW sources of documents not rendered yet, addressed by their version.
+    Each entry has a JSON sidecar with its kind, size, creation time and the
+    requests that produced it; a source also records the document rendered from
+    it. Entries not stored again within max_age seconds are evicted, then the
+    oldest ones until the store holds at most max_bytes.
+    """
+
+    def __init__(self, directory=DOCUMENT_STORE_DIR, max_age=DOCUMENT_MAX_AGE, max_bytes=DOCUMENT_MAX_BYTES,
+                 evict_interval=DOCUMENT_EVICT_INTERVAL):
+        self.directory = directory
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.evict_interval = evict_interval
+        self.last_eviction = 0.0
+        self.lock = threading.Lock()
+
+    def path(self, digest, suffix=".docx"):
+        if not DIGEST.match(digest):
+            raise ValueError(f"Invalid document id: {digest}")
+        return os.path.join(self.directory, digest[:2], f"{digest}{suffix}")
+
+    def metadata(self, digest):
+        """Metadata of a stored document, None when it does not exist"""
+        try:
+            with open(self.path(digest, ".json")) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def exists(self, digest, kind="docx"):
+        return os.path.exists(self.path(digest, SUFFIXES[kind]))
+
+    def put(self, content, request_id=None, name=None, kind="docx", key=None):
+        """
+        Store content and return its key, the SHA-256 of the content unless given,
+        recording request_id against it. Documents are hashed with stable zip
+        timestamps, so identical SOWs share one entry.
+        """
+        if kind == "docx":
+            content = stable_zip(content)
+        digest = key or hashlib.sha256(content).hexdigest()
+        path = self.path(digest, SUFFIXES[kind])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        now = time.time()
+
+        with self.lock:
+            meta = self.metadata(digest) if os.path.exists(path) else None
+            if meta is None:
+                atomic_write(path, content)
+                meta = {"digest": digest, "kind": kind, "size": len(content), "name": name, "createdAt": now,
+                        "requestIds": []}
+            if request_id and request_id not in meta["requestIds"]:
+                meta["requestIds"].append(request_id)
+            meta["storedAt"] = now
+            atomic_write(self.path(digest, ".json"), json.dumps(meta).encode("utf-8"))
+
+        if now - self.last_eviction > self.evict_interval:
+            self.last_eviction = now
+            self.evict()
+        return digest
+
+    def load_source(self, version):
+        """SOW source stored with put(..., kind="sow"), None when it does not exist"""
+        try:
+            with open(self.path(version, SUFFIXES["sow"])) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def link(self, version, digest):
+        """Record the document rendered from a source"""
+        with self.lock:
+            meta = self.metadata(version)
+            if meta is not None:
+                meta["document"] = digest
+                atomic_write(self.path(version, ".json"), json.dumps(meta).encode("utf-8"))
+
+    def entries(self):
+        """Metadata of every stored document"""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    meta = self.metadata(entry.name[:-len(".json")])
+                    if meta is not None:
+                        entries.append(meta)
+        return entries
+
+    def delete(self, digest):
+        for suffix in (*SUFFIXES.values(), ".json"):
+            try:
+                os.remove(self.path(digest, suffix))
+            except FileNotFoundError:
+                pass
+
+    def evict(self):
+        """Apply the retention policy, returns the number of documents removed"""
+        now = time.time()
+        removed = 0
+        kept = []
+        for meta in self.entries():
+            if self.max_age and now - meta.get("storedAt", meta["createdAt"]) > self.max_age:
+                self.delete(meta["digest"])
+                removed += 1
+            else:
+                kept.append(meta)
+
+        total = sum(meta["size"] for meta in kept)
+        if self.max_bytes and total > self.max_bytes:
+            for meta in sorted(kept, key=lambda meta: meta.get("storedAt", meta["createdAt"])):
+                if total <= self.max_bytes:
+                    break
+                self.delete(meta["digest"])
+                total -= meta["size"]
+                removed += 1
+        if removed:
+            print(f"🗑️ Evicted {removed} stored documents")
+        return removed
+
+    def stats(self):
+        entries = self.entries()
+        sources = sum(1 for meta in entries if meta.get("kind") == "sow")
+        return {"documents": len(entries) - sources, "sources": sources, "bytes": sum(meta["size"] for meta in entries)}
+
+document_store = DocumentStore()
@@ -0,0 +1,70 @@
+import threading
+import time
+from langchain_core.embeddings import Embeddings
+from config import EMBEDDING_CACHE_SIZE, EMBEDDING_CACHE_BACKEND, EMBEDDING_CACHE_MAX_ROWS
+from services.cache import TieredCache, build_store, hash_key
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that caches vectors by embedding model and whitespace
+    normalized text, for both queries and documents. Only texts that are not
+    cached are sent to the wrapped embeddings, in a single batch.
+    """
+
+    def __init__(self, embeddings, model_name):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.cache = TieredCache(
+            "embedding",
+            max_size=EMBEDDING_CACHE_SIZE,
+            store=build_store(EMBEDDING_CACHE_BACKEND, "embedding_cache", max_size=EMBEDDING_CACHE_MAX_ROWS)
+        )
+        self.saved_ms = 0.0
+        self.stats_lock = threading.Lock()
+
+    def cache_key(self, text):
+        return hash_key(self.model_name, " ".join(text.split()))
+
+    def lookup(self, text):
+        """Cached vector of a text, adding the latency it saved to the stats"""
+        cached = self.cache.get(self.cache_key(text))
+        if cached is None:
+            return None
+        with self.stats_lock:
+            self.saved_ms += cached["latency_ms"]
+        return cached["embedding"]
+
+    def store(self, texts, vectors, latency_ms):
+        """Cache freshly embedded texts, the batch latency is split evenly between them"""
+        per_text_ms = round(latency_ms / max(len(texts), 1), 1)
+        for text, vector in zip(texts, vectors):
+            self.cache.set(self.cache_key(text), {"embedding": list(vector), "latency_ms": per_text_ms})
+
+    def embed_documents(self, texts):
+        vectors = [self.lookup(text) for text in texts]
+        missing = [index for index, vector in enumerate(vectors) if vector is None]
+        if missing:
+            # Texts that normalize to the same key are embedded once
+            unique = {}
+            for index in missing:
+                unique.setdefault(self.cache_key(texts[index]), texts[index])
+            start = time.perf_counter()
+            embedded = self.embeddings.embed_documents(list(unique.values()))
+            self.store(list(unique.values()), embedded, (time.perf_counter() - start) * 1000)
+            by_key = dict(zip(unique.keys(), embedded))
+            for index in missing:
+                vectors[index] = list(by_key[self.cache_key(texts[index])])
+        return vectors
+
+    def embed_query(self, text):
+        vector = self.lookup(text)
+        if vector is None:
+            start = time.perf_counter()
+            vector = self.embeddings.embed_query(text)
+            self.store([text], [vector], (time.perf_counter() - start) * 1000)
+        return list(vector)
+
+    def stats(self):
+        stats = self.cache.stats()
+        stats["savedMs"] = round(self.saved_ms, 1)
+        return stats
@@ -0,0 +1,93 @@
+import re
+from langchain_core.embeddings import Embeddings
+from config import (OPENAI_API_KEY, AZURE_API_BASE_URL, AZURE_TEXT_EMBEDDING, AZURE_EMBEDDING_URL_PATH,
+                    EMBEDDING_BACKEND, EMBEDDING_DIMENSIONS, EMBEDDING_COL_NAME,
+                    LOCAL_EMBEDDING_MODEL, LOCAL_EMBEDDING_BATCH_SIZE)
+from services.registry import registry
+
+# Output size of the Azure embedding models, others are probed once
+AZURE_DIMENSIONS = {
+    "text-embedding-ada-002": 1536,
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+}
+# Backend, model and dimension of the vectors stored under the bare EMBEDDING_COL_NAME before
+# collections were named per model, they keep that collection
+LEGACY_COLLECTION = ("azure", "text-embedding-ada-002", 1536)
+
+class LocalEmbeddings(Embeddings):
+    """In-process sentence-transformers embeddings on CPU, encoded in batches"""
+
+    def __init__(self, model, batch_size=LOCAL_EMBEDDING_BATCH_SIZE):
+        self.model = model
+        self.batch_size = batch_size
+
+    @property
+    def dimension(self):
+        return self.model.get_sentence_embedding_dimension()
+
+    def embed_documents(self, texts):
+        if not texts:
+            return []
+        vectors = self.model.encode(
+            list(texts), batch_size=self.batch_size, normalize_embeddings=True,
+            convert_to_numpy=True, show_progress_bar=False
+        )
+        return vectors.tolist()
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+def load_local_embedding_model():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(LOCAL_EMBEDDING_MODEL, device="cpu")
+
+def build_azure_embeddings():
+    from langchain_openai import AzureOpenAIEmbeddings
+    return AzureOpenAIEmbeddings(
+        model=AZURE_TEXT_EMBEDDING,
+        azure_endpoint=f"{AZURE_API_BASE_URL}{AZURE_EMBEDDING_URL_PATH}",
+        api_key=OPENAI_API_KEY,
+        openai_api_version="2023-05-15",
+    )
+
+class EmbeddingProvider:
+    """
+    The embeddings of the configured backend ('azure' or 'local') together with
+    the model name and vector dimension that identify the index they produce.
+    """
+
+    def __init__(self, backend=EMBEDDING_BACKEND):
+        self.backend = backend
+        if backend == "azure":
+            self.model_name = AZURE_TEXT_EMBEDDING
+            self.embeddings = build_azure_embeddings()
+            self.dimension = EMBEDDING_DIMENSIONS or AZURE_DIMENSIONS.get(AZURE_TEXT_EMBEDDING)
+        elif backend == "local":
+            self.model_name = LOCAL_EMBEDDING_MODEL
+            self.embeddings = LocalEmbeddings(registry.get("local_embedding_model"))
+            self.dimension = self.embeddings.dimension
+        else:
+            raise ValueError(f"Unknown embedding backend: {backend}")
+
+        if not self.dimension:
+            self.dimension = len(self.embeddings.embed_query("dimension probe"))
+
+    @property
+    def cache_name(self):
+        """Identity of the embedding model in cache keys"""
+        return f"{self.backend}:{self.model_name}"
+
+    def collection_name(self, base=EMBEDDING_COL_NAME):
+        """Collection of this backend, model and dimension, so vectors of different models never mix"""
+        if (self.backend, self.model_name, self.dimension) == LEGACY_COLLECTION:
+            return base
+        slug = re.sub(r"[^a-z0-9]+", "_", self.model_name.split("/")[-1].lower()).strip("_")
+        return f"{base}__{self.backend}_{slug}_{self.dimension}"
+
+    def collection_metadata(self):
+        return {"backend": self.backend, "model": self.model_name, "dimension": self.dimension}
+
+# The local model holds in-process weights, it is only registered when it is used
+if EMBEDDING_BACKEND == "local":
+    registry.register("local_embedding_model", load_local_embedding_model, kind="model")
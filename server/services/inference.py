@@ -0,0 +1,59 @@
+import os
+from config import INFERENCE_BACKEND, ONNX_MODEL_DIR, ONNX_QUANTIZATION
+
+# Quantized file name written by ORTQuantizer (model.onnx + "_quantized" suffix)
+QUANTIZED_FILE_NAME = "model_quantized.onnx"
+
+def onnx_model_path(model_id):
+    """Directory holding the int8 quantized ONNX export of a Hugging Face model"""
+    return os.path.join(ONNX_MODEL_DIR, model_id.replace("/", "__") + "-int8")
+
+def export_quantized_model(model_id, quantization=ONNX_QUANTIZATION):
+    """
+    Export a sequence classification model to ONNX and apply dynamic int8
+    quantization (weights quantized ahead of time, activations at runtime).
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    output_dir = onnx_model_path(model_id)
+    fp32_dir = output_dir + "-fp32"
+
+    print(f"⏳ Exporting {model_id} to ONNX...")
+    model = ORTModelForSequenceClassification.from_pretrained(model_id, export=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model.save_pretrained(fp32_dir)
+    tokenizer.save_pretrained(fp32_dir)
+
+    print(f"⏳ Quantizing {model_id} ({quantization}, dynamic int8)...")
+    quantization_config = getattr(AutoQuantizationConfig, quantization)(is_static=False, per_channel=False)
+    quantizer = ORTQuantizer.from_pretrained(fp32_dir)
+    quantizer.quantize(save_dir=output_dir, quantization_config=quantization_config)
+    tokenizer.save_pretrained(output_dir)
+
+    print(f"✅ Quantized model saved to {output_dir}")
+    return output_dir
+
+def load_onnx_pipeline(task, model_id):
+    """Load the quantized ONNX export of a model, exporting it first if it does not exist"""
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from optimum.pipelines import pipeline as ort_pipeline
+    from transformers import AutoTokenizer
+
+    model_dir = onnx_model_path(model_id)
+    if not os.path.exists(os.path.join(model_dir, QUANTIZED_FILE_NAME)):
+        export_quantized_model(model_id)
+
+    model = ORTModelForSequenceClassification.from_pretrained(model_dir, file_name=QUANTIZED_FILE_NAME)
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    return ort_pipeline(task, model=model, tokenizer=tokenizer, accelerator="ort")
+
+def build_pipeline(task, model_id, backend=INFERENCE_BACKEND):
+    """Create a classification pipeline on the configured backend ('pytorch' or 'onnx'), always on CPU"""
+    if backend == "onnx":
+        return load_onnx_pipeline(task, model_id)
+    if backend == "pytorch":
+        from transformers import pipeline
+        return pipeline(task, model=model_id, framework="pt", device=-1)
+    raise ValueError(f"Unknown inference backend: {backend}")
@@ -0,0 +1,232 @@
+import hashlib
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+SUPPORTED_EXTENSIONS = (".docx", ".pdf", ".md", ".txt")
+
+def extract_text(path):
+    """Plain text of a DOCX, PDF, markdown or text file"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".docx":
+        import docx
+        document = docx.Document(path)
+        paragraphs = [paragraph.text for paragraph in document.paragraphs]
+        for table in document.tables:
+            for row in table.rows:
+                paragraphs.append(" | ".join(cell.text for cell in row.cells))
+        return "\n\n".join(paragraph for paragraph in paragraphs if paragraph.strip())
+    if extension == ".pdf":
+        from pypdf import PdfReader
+        return "\n\n".join(page.extract_text() or "" for page in PdfReader(path).pages)
+    with open(path, encoding="utf-8", errors="replace") as file:
+        return file.read()
+
+def file_digest(path):
+    """sha256 of the file contents, used to skip unchanged files"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def content_id(text, source=None):
+    """
+    Deterministic id of a chunk, so re-ingesting the same text upserts instead of
+    duplicating. With a source the id is scoped to it: identical chunks of two files
+    are separate rows, each with its own fileName, and removing one keeps the other.
+    """
+    key = text if source is None else f"{source}\x1f{text}"
+    return str(uuid.UUID(hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]))
+
+def build_token_counter():
+    """Embedding token count of a text, approximated by words when tiktoken has no encoding available"""
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text))
+    except Exception:
+        return lambda text: round(len(text.split()) * 4 / 3)
+
+def walk_corpus(directory):
+    """Supported files under a directory, sorted so runs and checkpoints are reproducible"""
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(SUPPORTED_EXTENSIONS) and not name.startswith("~$"):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+class Checkpoint:
+    """Files already ingested (path -> digest and chunk ids), saved atomically after every file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.files = {}
+        if path and os.path.exists(path):
+            with open(path) as file:
+                self.files = json.load(file).get("files", {})
+
+    def is_current(self, key, digest):
+        return self.files.get(key, {}).get("digest") == digest
+
+    def previous_ids(self, key):
+        return self.files.get(key, {}).get("ids", [])
+
+    def ids_of_others(self, key):
+        """Chunk ids recorded for every file but this one"""
+        return {chunk_id for other, entry in self.files.items() if other != key for chunk_id in entry.get("ids", [])}
+
+    def mark(self, key, digest, ids):
+        self.files[key] = {"digest": digest, "ids": ids}
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump({"files": self.files}, file)
+        os.replace(temp_path, self.path)
+
+def upsert_batch(vector_store, embeddings, batch):
+    """Embed one batch of (id, text, metadata) chunks and upsert them into the collection"""
+    texts = [text for _, text, _ in batch]
+    vectors = embeddings.embed_documents(texts)
+    vector_store.add_embeddings(
+        texts, vectors, metadatas=[metadata for _, _, metadata in batch], ids=[chunk_id for chunk_id, _, _ in batch]
+    )
+
+class CorpusIngestor:
+    """
+    Walks a directory of historical SOWs, chunks their text and upserts the chunks
+    into the vector store with ids hashed from their file and content. Embedding batches run on a bounded
+    thread pool and files are checkpointed once all their batches are stored.
+    """
+
+    def __init__(self, vector_store, embeddings, batch_size=64, concurrency=4,
+                 chunk_size=2000, chunk_overlap=200, checkpoint_path=None):
+        self.vector_store = vector_store
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.count_tokens = build_token_counter()
+        self.stats = {"files": 0, "skipped": 0, "failed": 0, "chunks": 0, "existing": 0, "tokens": 0}
+
+    def chunk_file(self, path, directory):
+        """(id, text, metadata) chunks of one file"""
+        source = os.path.relpath(path, directory)
+        file_name = os.path.splitext(os.path.basename(path))[0]
+        chunks = []
+        for index, text in enumerate(self.splitter.split_text(extract_text(path))):
+            chunk_id = content_id(text, source)
+            metadata = {"id": chunk_id, "fileName": file_name, "source": source, "chunk": index}
+            chunks.append((chunk_id, text, metadata))
+        # A chunk repeated within a file is stored once
+        return list({chunk_id: (chunk_id, text, metadata) for chunk_id, text, metadata in chunks}.values())
+
+    def existing_ids(self, ids):
+        """Ids already in the collection, e.g. from an interrupted run that lost its checkpoint"""
+        if not ids:
+            return set()
+        return {document.id for document in self.vector_store.get_by_ids(ids)}
+
+    def ingest(self, directory, progress_every=25):
+        start = time.perf_counter()
+        paths = walk_corpus(directory)
+        print(f"📂 {len(paths)} files found in {directory}")
+
+        pending_batches = {}  # future -> files of the chunks in the batch
+        unstored = {}         # file -> chunks queued or in flight
+        finished = {}         # file -> (digest, ids) to checkpoint once all its chunks are stored
+        buffer = []
+
+        def mark_if_stored(source):
+            if not unstored.get(source):
+                unstored.pop(source, None)
+                self.checkpoint.mark(source, *finished.pop(source))
+
+        def submit(batch):
+            pending_batches[executor.submit(upsert_batch, self.vector_store, self.embeddings, batch)] = [
+                metadata["source"] for _, _, metadata in batch
+            ]
+
+        def collect(block):
+            # Bound the number of batches in flight, waiting for any of them to finish
+            while pending_batches and (block or len(pending_batches) >= self.concurrency):
+                done, _ = wait(list(pending_batches), return_when=FIRST_COMPLETED)
+                for future in done:
+                    sources = pending_batches.pop(future)
+                    future.result()
+                    for source in sources:
+                        unstored[source] -= 1
+                    for source in set(sources):
+                        mark_if_stored(source)
+                if not block:
+                    break
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for number, path in enumerate(paths, 1):
+                source = os.path.relpath(path, directory)
+                digest = file_digest(path)
+                if self.checkpoint.is_current(source, digest):
+                    self.stats["skipped"] += 1
+                    continue
+
+                try:
+                    chunks = self.chunk_file(path, directory)
+                except Exception as e:
+                    print(f"❌ Could not read {source}: {e}")
+                    self.stats["failed"] += 1
+                    continue
+
+                ids = [chunk_id for chunk_id, _, _ in chunks]
+                # Chunks of the previous version of a changed file are removed, unless another file still
+                # records them, as files checkpointed with content-only ids can
+                stale = [chunk_id for chunk_id in self.checkpoint.previous_ids(source) if chunk_id not in ids]
+                if stale:
+                    shared = self.checkpoint.ids_of_others(source)
+                    stale = [chunk_id for chunk_id in stale if chunk_id not in shared]
+                if stale:
+                    self.vector_store.delete(ids=stale)
+
+                existing = self.existing_ids(ids)
+                new_chunks = [chunk for chunk in chunks if chunk[0] not in existing]
+                self.stats["files"] += 1
+                self.stats["existing"] += len(existing)
+                self.stats["chunks"] += len(new_chunks)
+                self.stats["tokens"] += sum(self.count_tokens(text) for _, text, _ in new_chunks)
+
+                finished[source] = (digest, ids)
+                unstored[source] = len(new_chunks)
+                mark_if_stored(source)
+                buffer.extend(new_chunks)
+                while len(buffer) >= self.batch_size:
+                    collect(block=False)
+                    submit(buffer[:self.batch_size])
+                    buffer = buffer[self.batch_size:]
+
+                if number % progress_every == 0:
+                    self.report(start, f"{number}/{len(paths)} files")
+
+            if buffer:
+                submit(buffer)
+            collect(block=True)
+
+        return self.report(start, "done")
+
+    def report(self, start, label):
+        """Print and return throughput so far"""
+        elapsed = time.perf_counter() - start
+        stats = dict(self.stats, seconds=round(elapsed, 2))
+        stats["docsPerSecond"] = round(self.stats["files"] / elapsed, 2) if elapsed else 0.0
+        stats["tokensPerSecond"] = round(self.stats["tokens"] / elapsed, 1) if elapsed else 0.0
+        print(f"⏳ {label}: {stats['files']} ingested, {stats['skipped']} unchanged, {stats['failed']} failed, "
+              f"{stats['chunks']} chunks embedded ({stats['existing']} already stored), "
+              f"{stats['docsPerSecond']} docs/s, {stats['tokensPerSecond']} tokens/s")
+        return stats
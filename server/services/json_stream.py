@@ -0,0 +1,89 @@
+import json
+
+class IncrementalJSONParser:
+    """
+    Consumes a JSON object in arbitrary text chunks (e.g. LLM tokens) and emits
+    each top-level (key, value) pair as soon as its value is complete. Anything
+    before the opening brace, such as a ```json fence, is skipped.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = 0      # Next character of the buffer to scan
+        self.started = False   # Seen the opening brace of the top-level object
+        self.finished = False  # Seen the closing brace of the top-level object
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.key = None
+        self.value_start = None
+        self.string_start = None
+        self.fields = {}
+
+    def feed(self, chunk):
+        """Add text and return the list of (key, value) pairs completed by it"""
+        self.buffer += chunk
+        completed = []
+
+        while self.position < len(self.buffer) and not self.finished:
+            char = self.buffer[self.position]
+
+            if not self.started:
+                if char == "{":
+                    self.started = True
+                    self.depth = 1
+                self.position += 1
+                continue
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                    # A string closing at depth 1 outside of a value is a key
+                    if self.depth == 1 and self.key is None:
+                        self.key = json.loads(self.buffer[self.string_start:self.position + 1])
+                self.position += 1
+                continue
+
+            if char == '"':
+                self.in_string = True
+                if self.depth == 1 and self.key is None:
+                    self.string_start = self.position
+                elif self.depth == 1 and self.value_start is None:
+                    self.value_start = self.position
+            elif char in "{[":
+                if self.depth == 1 and self.value_start is None:
+                    self.value_start = self.position
+                self.depth += 1
+            elif char in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.complete_field(completed)
+                    self.finished = True
+            elif char == ",":
+                if self.depth == 1:
+                    self.complete_field(completed)
+            elif char == ":" or char.isspace():
+                pass
+            elif self.depth == 1 and self.key is not None and self.value_start is None:
+                # Start of a number, true, false or null
+                self.value_start = self.position
+            self.position += 1
+
+        return completed
+
+    def complete_field(self, completed):
+        """Parse the value between value_start and the current position"""
+        if self.key is not None and self.value_start is not None:
+            value = json.loads(self.buffer[self.value_start:self.position])
+            self.fields[self.key] = value
+            completed.append((self.key, value))
+        self.key = None
+        self.value_start = None
+
+    def result(self):
+        """The fields parsed so far, the full object once finished is True"""
+        return dict(self.fields)
@@ -1,5 +1,13 @@
+import json
+import threading
+import time
 from langchain_community.chat_models import AzureChatOpenAI
-from config import OPENAI_API_KEY, AZURE_DEPLOYMENT_NAME, AZURE_MODEL_NAME, AZURE_API_BASE_URL
+from langchain_core.messages import AIMessage
+from config import (OPENAI_API_KEY, AZURE_DEPLOYMENT_NAME, AZURE_MODEL_NAME, AZURE_API_BASE_URL,
+                    LLM_CACHE_SIZE, LLM_CACHE_TTL, LLM_CACHE_BACKEND, LLM_CACHE_MAX_ROWS)
+from services.cache import TieredCache, build_store, hash_key
+from services.metrics import LLM_DURATION, LLM_ERRORS, LLM_REQUESTS, record_token_usage
+from services.registry import registry
 
 class LLMService:
     def __init__(self):
@@ -15,12 +23,95 @@ class LLMService:
             # This is the default value for Azure OpenAI API and Not Model
             openai_api_version="2023-05-15",
         )
+
+        # Responses keyed by the normalized prompt, model and deployment
+        self.cache = TieredCache(
+            "llm",
+            max_size=LLM_CACHE_SIZE,
+            ttl=LLM_CACHE_TTL,
+            store=build_store(LLM_CACHE_BACKEND, "llm_cache", ttl=LLM_CACHE_TTL, max_size=LLM_CACHE_MAX_ROWS)
+        )
+        self.saved_ms = 0.0
+        self.stats_lock = threading.Lock()
+
+    def cache_key(self, prompt):
+        """Hash of the rendered prompt messages with whitespace normalized"""
+        messages = prompt.to_messages() if hasattr(prompt, "to_messages") else [prompt]
+        normalized = []
+        for message in messages:
+            role = getattr(message, "type", "human")
+            content = getattr(message, "content", message)
+            if not isinstance(content, str):
+                content = json.dumps(content, sort_keys=True)
+            normalized.append([role, " ".join(content.split())])
+        return hash_key(AZURE_MODEL_NAME, AZURE_DEPLOYMENT_NAME, json.dumps(normalized))
+
+    def invoke(self, prompt, use_cache=True):
+        """
+        Invoke the LLM with the given prompt. With use_cache a cached response for
+        an identical prompt is returned without calling Azure; without it the
+        cache is bypassed but the fresh response still replaces the cached one.
+        """
+        key = self.cache_key(prompt)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                with self.stats_lock:
+                    self.saved_ms += cached["latency_ms"]
+                LLM_REQUESTS.labels("invoke", "true").inc()
+                return AIMessage(content=cached["content"])
+
+        LLM_REQUESTS.labels("invoke", "false").inc()
+        start = time.perf_counter()
+        try:
+            response = self.model.invoke(prompt)
+        except Exception:
+            LLM_ERRORS.labels("invoke").inc()
+            raise
+        latency_ms = (time.perf_counter() - start) * 1000
+        LLM_DURATION.labels("invoke").observe(latency_ms / 1000)
+        record_token_usage(response)
+        self.cache.set(key, {"content": response.content, "latency_ms": round(latency_ms, 1)})
+        return response
+
+    def stream(self, prompt, use_cache=True):
+        """
+        Stream the LLM response as text chunks. Cached responses are yielded as one
+        chunk and a streamed response is cached once it has been fully consumed.
+        """
+        key = self.cache_key(prompt)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                with self.stats_lock:
+                    self.saved_ms += cached["latency_ms"]
+                LLM_REQUESTS.labels("stream", "true").inc()
+                yield cached["content"]
+                return
+
+        LLM_REQUESTS.labels("stream", "false").inc()
+        start = time.perf_counter()
+        chunks = []
+        try:
+            for chunk in self.model.stream(prompt):
+                # Usage, when the deployment reports it, arrives on the last chunk
+                record_token_usage(chunk)
+                if chunk.content:
+                    chunks.append(chunk.content)
+                    yield chunk.content
+        except Exception:
+            LLM_ERRORS.labels("stream").inc()
+            raise
+        latency_ms = (time.perf_counter() - start) * 1000
+        LLM_DURATION.labels("stream").observe(latency_ms / 1000)
+        self.cache.set(key, {"content": "".join(chunks), "latency_ms": round(latency_ms, 1)})
+
+    def cache_stats(self):
+        stats = self.cache.stats()
+        stats["savedMs"] = round(self.saved_ms, 1)
+        return stats
     
-    def invoke(self, prompt):
-        """Invoke the LLM with the given prompt"""
-        return self.model.invoke(prompt)
-    
-    def extract_json_from_sow(self, raw_sow: str) -> dict:
+    def extract_json_from_sow(self, raw_sow: str, use_cache=True) -> dict:
         """Extract JSON from SOW content using LLM"""
         extraction_prompt = (
             '''
@@ -35,13 +126,13 @@ class LLMService:
             ''' + raw_sow +
             "\n\nOutput the result as a valid JSON and do not format just return pure json."
         )
-        response = self.model.invoke(extraction_prompt)
+        response = self.invoke(extraction_prompt, use_cache=use_cache)
         try:
-            import json
             sow_data = json.loads(response.content)
             return sow_data
         except Exception as e:
             raise ValueError("Failed to extract JSON from SOW content: " + str(e))
 
-# Initialize LLM service as a singleton
-llm_service = LLMService()
\ No newline at end of file
+# LLM service singleton, created on first use
+registry.register("llm_service", LLMService, kind="service")
+llm_service = registry.lazy("llm_service")
\ No newline at end of file
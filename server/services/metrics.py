@@ -0,0 +1,145 @@
+import functools
+import os
+import time
+from prometheus_client import (CollectorRegistry, Counter, Gauge, Histogram, CONTENT_TYPE_LATEST,
+                               generate_latest, REGISTRY)
+
+# LLM completions take seconds to minutes, local stages milliseconds
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+NODE_DURATION = Histogram(
+    "sow_node_duration_seconds", "Duration of a SOW graph node", ["node"], buckets=STAGE_BUCKETS
+)
+NODE_ERRORS = Counter("sow_node_errors_total", "Graph node runs that raised", ["node"])
+
+LLM_DURATION = Histogram(
+    "sow_llm_request_duration_seconds", "Duration of LLM calls that reached Azure", ["operation"],
+    buckets=STAGE_BUCKETS
+)
+LLM_REQUESTS = Counter("sow_llm_requests_total", "LLM calls, cached or not", ["operation", "cached"])
+LLM_TOKENS = Counter("sow_llm_tokens_total", "Tokens reported by the LLM", ["kind"])
+LLM_ERRORS = Counter("sow_llm_errors_total", "LLM calls that raised", ["operation"])
+
+VECTOR_DURATION = Histogram(
+    "sow_vector_request_duration_seconds", "Duration of vector store calls", ["operation"], buckets=STAGE_BUCKETS
+)
+VECTOR_ERRORS = Counter("sow_vector_errors_total", "Vector store calls that raised", ["operation"])
+
+ROUTER_DECISIONS = Counter(
+    "sow_router_decisions_total", "Routing decisions after validation", ["decision"]
+)
+GRAPH_RETRIES = Histogram(
+    "sow_graph_retries", "Drafting retries a SOW needed before formatting", buckets=(0, 1, 2, 3, 5, 8, 11)
+)
+COMPLIANCE_SCORE = Histogram(
+    "sow_compliance_score", "Compliance score of each checked draft", buckets=(20, 40, 60, 70, 80, 85, 90, 95, 100)
+)
+DOCX_RENDER_DURATION = Histogram(
+    "sow_docx_render_duration_seconds", "Time to render and store a DOCX, in the pipeline or on first download",
+    ["path"], buckets=STAGE_BUCKETS
+)
+DOCX_RENDERS_DEFERRED = Counter(
+    "sow_docx_renders_deferred_total", "Pipeline runs that stored the SOW for rendering on download instead of a DOCX"
+)
+
+WRITE_BEHIND_ROWS = Counter(
+    "sow_write_behind_rows_total", "Rows persisted by a write-behind queue: written, sync (queue full) or failed",
+    ["queue", "result"]
+)
+WRITE_BEHIND_FLUSH_DURATION = Histogram(
+    "sow_write_behind_flush_duration_seconds", "Duration of a write-behind batch insert", ["queue"],
+    buckets=STAGE_BUCKETS
+)
+SINGLE_FLIGHT_REQUESTS = Counter(
+    "sow_single_flight_requests_total",
+    "Coalesced requests by role: leader (ran it), local / remote (got the result of a run in this / another worker) "
+    "or fallback (ran it after the lock or the wait failed)",
+    ["kind", "role"]
+)
+
+# Gauges are summed over the live workers when samples are merged under PROMETHEUS_MULTIPROC_DIR
+CACHE_HITS = Counter("sow_cache_hits", "Cache hits", ["cache"])
+CACHE_MISSES = Counter("sow_cache_misses", "Cache misses", ["cache"])
+CACHE_ENTRIES = Gauge(
+    "sow_cache_entries", "Entries in the in-process cache tier", ["cache"], multiprocess_mode="livesum"
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "sow_db_pool_connections", "Connections of the shared pool by state", ["state"], multiprocess_mode="livesum"
+)
+WRITE_BEHIND_QUEUE_DEPTH = Gauge(
+    "sow_write_behind_queue_depth", "Rows waiting in a write-behind queue", ["queue"], multiprocess_mode="livesum"
+)
+
+def instrument_node(node):
+    """Decorator timing a graph node function and counting the runs that raise"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                NODE_ERRORS.labels(node).inc()
+                raise
+            finally:
+                NODE_DURATION.labels(node).observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def instrument_vector(operation):
+    """Decorator timing a vector store call and counting the calls that raise"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                VECTOR_ERRORS.labels(operation).inc()
+                raise
+            finally:
+                VECTOR_DURATION.labels(operation).observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def record_token_usage(message):
+    """Count prompt and completion tokens from the usage an LLM response reports, if any"""
+    usage = getattr(message, "usage_metadata", None) or {}
+    prompt_tokens = usage.get("input_tokens")
+    completion_tokens = usage.get("output_tokens")
+    if prompt_tokens is None:
+        token_usage = (getattr(message, "response_metadata", None) or {}).get("token_usage") or {}
+        prompt_tokens = token_usage.get("prompt_tokens")
+        completion_tokens = token_usage.get("completion_tokens")
+    if prompt_tokens:
+        LLM_TOKENS.labels("prompt").inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels("completion").inc(completion_tokens)
+
+def track_pool(engine):
+    """Keep the pool gauges current from the pool's own events, so every worker reports its pool"""
+    from sqlalchemy import event
+
+    def update(returning=0):
+        pool = engine.pool
+        DB_POOL_CONNECTIONS.labels("size").set(pool.size())
+        DB_POOL_CONNECTIONS.labels("checked_out").set(pool.checkedout() - returning)
+        DB_POOL_CONNECTIONS.labels("checked_in").set(pool.checkedin() + returning)
+        DB_POOL_CONNECTIONS.labels("overflow").set(max(0, pool.overflow()))
+
+    # checkin fires before the pool counts the returned connection
+    event.listen(engine, "checkin", lambda *_: update(returning=1))
+    for name in ("checkout", "close", "invalidate"):
+        event.listen(engine, name, lambda *_: update())
+    update()
+
+def render_metrics():
+    """Body and content type of the /metrics response"""
+    multiprocess_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if multiprocess_dir:
+        # Under gunicorn every worker writes its samples to this directory, they are merged here
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
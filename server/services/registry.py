@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+
+class ModelRegistry:
+    """
+    Central registry of heavy models and external service clients. Entries are
+    created lazily on first use, or eagerly through warm_up().
+
+    Entries have a kind: 'model' for in-process weights that are safe to load in
+    a pre-fork master and share copy-on-write, 'service' for clients holding
+    network connections that must be created in each worker after the fork.
+    Entries registered with preload=False are only loaded on first use.
+    """
+
+    def __init__(self):
+        self.factories = {}
+        self.kinds = {}
+        self.on_demand = set()
+        self.instances = {}
+        self.load_seconds = {}
+        self.locks = {}
+        self.lock = threading.Lock()
+        self.warmed_up = False
+
+    def after_fork(self):
+        """
+        Fresh locks in a forked child: a lock held by a loading thread of the parent
+        at fork time would stay held forever, since that thread does not exist here
+        """
+        self.lock = threading.Lock()
+        self.locks = {name: threading.Lock() for name in self.locks}
+        self.warmed_up = self.models_loaded()
+
+    def models_loaded(self):
+        return all(self.is_loaded(name) for name in self.factories
+                   if self.kinds[name] == "model" and name not in self.on_demand)
+
+    def register(self, name, factory, kind="model", preload=True):
+        with self.lock:
+            self.factories[name] = factory
+            self.kinds[name] = kind
+            self.locks.setdefault(name, threading.Lock())
+            if preload:
+                self.on_demand.discard(name)
+            else:
+                self.on_demand.add(name)
+
+    def get(self, name):
+        instance = self.instances.get(name)
+        if instance is not None:
+            return instance
+
+        if name not in self.factories:
+            raise KeyError(f"Nothing registered under '{name}'")
+
+        # One lock per entry so two models can load at the same time, but never the same one twice
+        with self.locks[name]:
+            instance = self.instances.get(name)
+            if instance is None:
+                print(f"⏳ Loading {name}...")
+                start = time.perf_counter()
+                instance = self.factories[name]()
+                self.load_seconds[name] = round(time.perf_counter() - start, 3)
+                self.instances[name] = instance
+                print(f"✅ Loaded {name} in {self.load_seconds[name]}s")
+        return instance
+
+    def is_loaded(self, name):
+        return name in self.instances
+
+    def override(self, name, instance, kind=None):
+        """Replace an entry with a ready instance (used by benchmarks and fakes)"""
+        with self.lock:
+            self.factories.setdefault(name, lambda: instance)
+            self.kinds.setdefault(name, kind or "service")
+            self.locks.setdefault(name, threading.Lock())
+            self.instances[name] = instance
+
+    def warm_up(self, kind=None):
+        """Load every registered entry, optionally only those of one kind"""
+        for name in list(self.factories):
+            if (kind is None or self.kinds[name] == kind) and name not in self.on_demand:
+                self.get(name)
+        self.warmed_up = self.models_loaded()
+
+    def status(self):
+        return {
+            name: {
+                "kind": self.kinds[name],
+                "loaded": self.is_loaded(name),
+                "loadSeconds": self.load_seconds.get(name),
+            }
+            for name in self.factories
+        }
+
+    def lazy(self, name):
+        return LazyProxy(self, name)
+
+class LazyProxy:
+    """Stands in for a registry entry and resolves it on first attribute access"""
+
+    def __init__(self, registry, name):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attr):
+        return getattr(self._registry.get(self._name), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._registry.get(self._name), attr, value)
+
+    def __call__(self, *args, **kwargs):
+        return self._registry.get(self._name)(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<lazy {self._name} loaded={self._registry.is_loaded(self._name)}>"
+
+# Initialize the registry as a singleton
+registry = ModelRegistry()
+os.register_at_fork(after_in_child=registry.after_fork)
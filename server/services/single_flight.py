@@ -0,0 +1,268 @@
+"""
+Coalescing of identical concurrent work. The first caller of a key runs it and
+every caller that arrives while it is running gets the same result instead of
+running it again. Callers in the same process wait on the running call. Callers
+in other worker processes wait on a lock held by the process running it, either
+a Postgres advisory lock or a file lock when the workers share a host, and then
+read the result it published.
+"""
+import os
+import threading
+import time
+import uuid
+from sqlalchemy import text
+from config import (SINGLE_FLIGHT_BACKEND, SINGLE_FLIGHT_DIR, SINGLE_FLIGHT_WAIT_TIMEOUT, SINGLE_FLIGHT_POLL_INTERVAL,
+                    SINGLE_FLIGHT_RESULT_TTL)
+from services.cache import build_store
+from services.db import get_lock_engine
+from services.metrics import SINGLE_FLIGHT_REQUESTS
+
+# Backend -> cache store backend of the published results
+RESULT_STORES = {"postgres": "postgres", "file": "sqlite"}
+
+class Call:
+    """A running call and the result shared with the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class PostgresLock:
+    """
+    Session level advisory lock on an unpooled connection of its own, opened on
+    the first attempt and kept while polling. Closing the connection ends the
+    session and releases the lock, as does the death of the process.
+    """
+
+    def __init__(self, key):
+        # Advisory lock ids are signed 64 bit integers: 60 bits of the key
+        self.lock_id = int(key[:15], 16)
+        self.conn = None
+
+    def acquire(self):
+        if self.conn is None:
+            self.conn = get_lock_engine().connect()
+        try:
+            acquired = self.conn.execute(text("SELECT pg_try_advisory_lock(:id)"), {"id": self.lock_id}).scalar()
+            self.conn.commit()
+        except Exception:
+            self.close()
+            raise
+        return acquired
+
+    def release(self):
+        self.close()
+
+    def close(self):
+        if self.conn is None:
+            return
+        try:
+            self.conn.close()
+        except Exception as e:
+            print(f"⚠️ Could not close single-flight lock connection: {str(e)}")
+        finally:
+            self.conn = None
+
+class FileLock:
+    """flock on a lock file per key, for worker processes on the same host. Released if the process dies."""
+
+    def __init__(self, key, directory=SINGLE_FLIGHT_DIR):
+        self.path = os.path.join(directory, f"{key}.lock")
+        self.file = None
+
+    def acquire(self):
+        import fcntl
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        while True:
+            file = open(self.path, "a")
+            try:
+                fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                file.close()
+                return False
+            # sweep_lock_files may have removed the file between open and flock: the lock is only
+            # held if it is still the file at the path, otherwise lock the new one
+            try:
+                current = os.stat(self.path).st_ino == os.fstat(file.fileno()).st_ino
+            except FileNotFoundError:
+                current = False
+            if current:
+                break
+            file.close()
+        # The modification time tells the sweep when the key was last run
+        os.utime(self.path)
+        self.file = file
+        return True
+
+    def release(self):
+        import fcntl
+        fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
+        self.file = None
+
+    def close(self):
+        """Nothing is held between attempts"""
+
+def sweep_lock_files(directory=SINGLE_FLIGHT_DIR, max_age=SINGLE_FLIGHT_RESULT_TTL):
+    """Remove the lock files of keys not run for max_age seconds, skipping any that is held"""
+    import fcntl
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return 0
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            if not name.endswith(".lock") or os.path.getmtime(path) > cutoff:
+                continue
+            with open(path, "a") as file:
+                try:
+                    fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                # Removed while locked, so a process that opened it before finds it replaced once it gets the lock
+                os.remove(path)
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+class SingleFlight:
+    """
+    run(key, fn) returns fn() and shares it with every concurrent run of the same
+    key. Backends: postgres or file coalesce across worker processes, memory only
+    within a process, off disables coalescing. Only successful results are shared
+    across processes; when the running call fails or outlasts wait_timeout, a waiting
+    caller runs fn itself.
+    """
+
+    def __init__(self, backend=SINGLE_FLIGHT_BACKEND, wait_timeout=SINGLE_FLIGHT_WAIT_TIMEOUT,
+                 poll_interval=SINGLE_FLIGHT_POLL_INTERVAL, result_ttl=SINGLE_FLIGHT_RESULT_TTL):
+        if backend not in ("postgres", "file", "memory", "off"):
+            raise ValueError(f"Unknown SINGLE_FLIGHT_BACKEND: {backend}")
+        self.backend = backend
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.result_ttl = result_ttl
+        self.results = build_store(RESULT_STORES.get(backend), "single_flight_results", ttl=result_ttl, max_size=1000)
+        self.calls = {}
+        self.lock = threading.Lock()
+        self.swept_at = 0
+        self.counts = {"leader": 0, "local": 0, "remote": 0, "fallback": 0}
+
+    def count(self, kind, role):
+        with self.lock:
+            self.counts[role] += 1
+        SINGLE_FLIGHT_REQUESTS.labels(kind=kind, role=role).inc()
+
+    def run(self, key, fn, kind="default"):
+        if self.backend == "off":
+            return fn()
+
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = Call()
+        if not leader:
+            if not call.done.wait(self.wait_timeout):
+                print(f"⚠️ Waited {self.wait_timeout}s on a running call, running it again")
+                self.count(kind, "fallback")
+                return fn()
+            if call.error is None:
+                self.count(kind, "local")
+                return call.result
+            # The running call failed: run it like a caller in another process would
+            return self.run_exclusive(key, fn, kind)
+
+        try:
+            call.result = self.run_exclusive(key, fn, kind)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+
+    def new_lock(self, key):
+        if self.backend == "postgres":
+            return PostgresLock(key)
+        self.sweep()
+        return FileLock(key)
+
+    def sweep(self):
+        """Remove unused lock files at most once per result TTL, each file is one distinct request"""
+        now = time.time()
+        with self.lock:
+            if now - self.swept_at < self.result_ttl:
+                return
+            self.swept_at = now
+        try:
+            sweep_lock_files(max_age=max(self.result_ttl, self.wait_timeout))
+        except Exception as e:
+            print(f"⚠️ Single-flight lock file sweep failed: {str(e)}")
+
+    def run_exclusive(self, key, fn, kind):
+        """Run fn under the cross-process lock of key, or return the result of the process holding it"""
+        if self.results is None:
+            self.count(kind, "leader")
+            return fn()
+
+        lock = self.new_lock(key)
+        deadline = time.time() + self.wait_timeout
+        seen = None
+        while True:
+            try:
+                acquired = lock.acquire()
+            except Exception as e:
+                print(f"⚠️ Single-flight lock unavailable, running uncoalesced: {str(e)}")
+                self.count(kind, "fallback")
+                return fn()
+            if acquired:
+                break
+            if seen is None:
+                # Result published before this caller arrived; anything newer comes from the call it waits on
+                seen = self.published(key) or {"flight": None}
+            if time.time() > deadline:
+                lock.close()
+                print(f"⚠️ Waited {self.wait_timeout}s on a running call, running it again")
+                self.count(kind, "fallback")
+                return fn()
+            time.sleep(self.poll_interval)
+
+        try:
+            if seen is not None:
+                shared = self.published(key)
+                if shared and shared["flight"] != seen["flight"]:
+                    self.count(kind, "remote")
+                    return shared["result"]
+            self.count(kind, "leader")
+            result = fn()
+            self.publish(key, result)
+            return result
+        finally:
+            lock.release()
+
+    def published(self, key):
+        try:
+            return self.results.get(key)
+        except Exception as e:
+            print(f"⚠️ Single-flight result read failed: {str(e)}")
+            return None
+
+    def publish(self, key, result):
+        try:
+            self.results.set(key, {"flight": str(uuid.uuid4()), "result": result})
+        except Exception as e:
+            print(f"⚠️ Single-flight result write failed: {str(e)}")
+
+    def stats(self):
+        with self.lock:
+            return {"backend": self.backend, "inFlight": len(self.calls), **self.counts}
+
+single_flight = SingleFlight()
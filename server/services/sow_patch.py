@@ -0,0 +1,79 @@
+import copy
+
+PATCH_OPS = ("replace", "append", "remove")
+
+class PatchError(ValueError):
+    """Raised when an edit operation cannot be applied to the SOW"""
+
+def apply_operation(sow, operation):
+    """Apply one edit operation to the SOW dict in place and return the field it touched"""
+    if not isinstance(operation, dict):
+        raise PatchError(f"Operation must be an object, got {operation!r}")
+
+    op = operation.get("op")
+    field = operation.get("field")
+    index = operation.get("index")
+    if op not in PATCH_OPS:
+        raise PatchError(f"Unknown operation {op!r}, expected one of {', '.join(PATCH_OPS)}")
+    if not isinstance(field, str) or not field:
+        raise PatchError(f"Operation {op!r} is missing the field name")
+    if op != "remove" and "value" not in operation:
+        raise PatchError(f"Operation {op!r} on {field!r} is missing a value")
+    value = operation.get("value")
+
+    if index is not None:
+        # Operations on one item of an array field (Milestones, Contractor Resources)
+        items = sow.get(field)
+        if not isinstance(items, list):
+            raise PatchError(f"{field!r} is not an array, an index cannot be used")
+        if not isinstance(index, int) or not -len(items) <= index < len(items):
+            raise PatchError(f"Index {index!r} is out of range for {field!r} ({len(items)} items)")
+        if op == "replace":
+            items[index] = value
+        elif op == "remove":
+            del items[index]
+        else:
+            items.insert(index + 1 if index >= 0 else len(items) + index + 1, value)
+        return field
+
+    if op == "replace":
+        sow[field] = value
+    elif op == "remove":
+        if field not in sow:
+            raise PatchError(f"Cannot remove {field!r}, it does not exist")
+        del sow[field]
+    else:
+        current = sow.get(field)
+        if current is None:
+            sow[field] = value
+        elif isinstance(current, list):
+            current.extend(value if isinstance(value, list) else [value])
+        elif isinstance(current, str) and isinstance(value, str):
+            sow[field] = f"{current}\n{value}" if current else value
+        else:
+            raise PatchError(f"Cannot append a {type(value).__name__} to {field!r}")
+    return field
+
+def apply_patch(sow, operations):
+    """
+    Apply a list of field level edit operations to a SOW dict. The input is not
+    modified. Returns the patched SOW and the fields touched, in operation order.
+
+    Operations:
+        {"op": "replace", "field": F, "value": V}              set a field
+        {"op": "replace", "field": F, "index": i, "value": V}  set one array item
+        {"op": "append", "field": F, "value": V}               add text to a string field or items to an array
+        {"op": "append", "field": F, "index": i, "value": V}   insert an array item after item i
+        {"op": "remove", "field": F}                           delete a field
+        {"op": "remove", "field": F, "index": i}               delete one array item
+    """
+    if not isinstance(operations, list):
+        raise PatchError("Operations must be a list")
+
+    patched = copy.deepcopy(sow)
+    touched = []
+    for operation in operations:
+        field = apply_operation(patched, operation)
+        if field not in touched:
+            touched.append(field)
+    return patched, touched
@@ -0,0 +1,230 @@
+"""
+Approximate nearest neighbour indexes of the PGVector collections. PGVector
+stores every collection in one langchain_pg_embedding table with an untyped
+vector column, which HNSW and IVFFlat cannot index. Each collection therefore
+gets a partial index over its own rows on the column cast to the collection's
+dimension (halfvec above the 2000 dimensions a vector index supports), and
+IndexedPGVector orders results by the same expression so the planner uses it.
+"""
+import json
+import math
+import time
+from contextlib import contextmanager
+from langchain_postgres import PGVector
+from langchain_postgres.vectorstores import DistanceStrategy
+from pgvector.sqlalchemy import HALFVEC, VECTOR
+from sqlalchemy import cast, text
+from config import (VECTOR_INDEX, VECTOR_HNSW_M, VECTOR_HNSW_EF_CONSTRUCTION, VECTOR_IVFFLAT_LISTS,
+                    VECTOR_INDEX_BUILD_MEMORY)
+
+EMBEDDING_TABLE = "langchain_pg_embedding"
+COLLECTION_TABLE = "langchain_pg_collection"
+METHODS = ("hnsw", "ivfflat")
+# Largest dimension HNSW and IVFFlat can index as vector, halfvec goes up to 4000
+MAX_VECTOR_DIMENSIONS = 2000
+# Operator class suffix of each PGVector distance strategy
+OPERATOR_CLASSES = {
+    DistanceStrategy.COSINE: "cosine_ops",
+    DistanceStrategy.EUCLIDEAN: "l2_ops",
+    DistanceStrategy.MAX_INNER_PRODUCT: "ip_ops",
+}
+# Serves {"fileName": {"$in": [...]}} filters and deletes by file within a collection
+FILE_NAME_INDEX = "ix_pg_embedding_file_name"
+# An IVFFlat index with automatic lists is rebuilt once its collection grew by this factor
+IVFFLAT_REBUILD_GROWTH = 2
+
+def vector_type(dimension):
+    """SQL type of the indexed expression"""
+    return "vector" if dimension <= MAX_VECTOR_DIMENSIONS else "halfvec"
+
+def default_lists(rows):
+    """IVFFlat lists recommended by pgvector: rows / 1000 up to 1M rows, sqrt(rows) above"""
+    return max(1, rows // 1000 if rows <= 1_000_000 else int(math.sqrt(rows)))
+
+def file_name_filter(file_names):
+    """
+    Metadata filter on fileName that FILE_NAME_INDEX serves. $in compiles to
+    cmetadata->>'fileName' IN (...), while the $eq form compiles to
+    jsonb_path_match, which no index can use.
+    """
+    return {"fileName": {"$in": list(file_names)}}
+
+class IndexedPGVector(PGVector):
+    """PGVector ordering by the expression the collection's ANN index is built on"""
+
+    def __init__(self, *args, dimension, index_method=VECTOR_INDEX, **kwargs):
+        self.dimension = dimension
+        self.index_method = index_method
+        super().__init__(*args, **kwargs)
+
+    @property
+    def distance_strategy(self):
+        if self.index_method not in METHODS:
+            return super().distance_strategy
+        sql_type = VECTOR if vector_type(self.dimension) == "vector" else HALFVEC
+        column = cast(self.EmbeddingStore.embedding, sql_type(self.dimension))
+        if self._distance_strategy == DistanceStrategy.EUCLIDEAN:
+            return column.l2_distance
+        if self._distance_strategy == DistanceStrategy.MAX_INNER_PRODUCT:
+            return column.max_inner_product
+        return column.cosine_distance
+
+class VectorIndexManager:
+    """
+    Creates, inspects, rebuilds and drops the ANN index of one collection, and
+    the fileName index shared by all collections. Indexes are built with CREATE
+    INDEX CONCURRENTLY, so retrieval and inserts continue during a build, and a
+    replaced index is only dropped once its successor is valid. The build
+    parameters and row count are recorded in the index comment.
+    """
+
+    def __init__(self, engine, collection_name, dimension, distance_strategy=DistanceStrategy.COSINE):
+        self.engine = engine
+        self.collection_name = collection_name
+        self.dimension = dimension
+        self.distance_strategy = distance_strategy
+
+    @contextmanager
+    def maintenance(self):
+        """Autocommit connection without the statement timeout, for builds that run for minutes"""
+        with self.engine.connect() as conn:
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            conn.execute(text("SELECT set_config('statement_timeout', '0', false), "
+                              "set_config('maintenance_work_mem', :memory, false)"),
+                         {"memory": VECTOR_INDEX_BUILD_MEMORY})
+            try:
+                yield conn
+            finally:
+                # Back to the settings the pooled connection was opened with
+                conn.execute(text("RESET ALL"))
+
+    def collection_id(self):
+        with self.engine.connect() as conn:
+            row = conn.execute(text(f"SELECT uuid FROM {COLLECTION_TABLE} WHERE name = :name"),
+                               {"name": self.collection_name}).fetchone()
+        if row is None:
+            raise ValueError(f"Collection not found: {self.collection_name}")
+        return str(row[0])
+
+    def prefix(self, collection_id):
+        return f"ix_pg_embedding_{collection_id.replace('-', '')[:16]}_"
+
+    def rows(self, collection_id):
+        with self.engine.connect() as conn:
+            return conn.execute(text(f"SELECT count(*) FROM {EMBEDDING_TABLE} WHERE collection_id = :id"),
+                                {"id": collection_id}).scalar()
+
+    def indexes(self, collection_id):
+        """ANN indexes of the collection: name, method, validity, size and build metadata"""
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT c.relname, am.amname, i.indisvalid, pg_relation_size(c.oid), obj_description(c.oid, 'pg_class') "
+                "FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid JOIN pg_am am ON am.oid = c.relam "
+                f"WHERE i.indrelid = '{EMBEDDING_TABLE}'::regclass AND starts_with(c.relname, :prefix) "
+                "ORDER BY c.relname"
+            ), {"prefix": self.prefix(collection_id)}).fetchall()
+        indexes = []
+        for name, method, valid, size, comment in rows:
+            try:
+                meta = json.loads(comment) if comment else {}
+            except ValueError:
+                meta = {}
+            indexes.append({"name": name, "method": method, "valid": valid, "bytes": size, **meta})
+        return indexes
+
+    def has_file_name_index(self):
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": FILE_NAME_INDEX}).scalar()
+
+    def status(self):
+        collection_id = self.collection_id()
+        return {
+            "collection": self.collection_name,
+            "dimension": self.dimension,
+            "rows": self.rows(collection_id),
+            "indexes": self.indexes(collection_id),
+            "fileNameIndex": self.has_file_name_index(),
+        }
+
+    def wanted_params(self, method, rows, m=None, ef_construction=None, lists=None):
+        if method == "hnsw":
+            return {"m": m or VECTOR_HNSW_M, "ef_construction": ef_construction or VECTOR_HNSW_EF_CONSTRUCTION}
+        return {"lists": lists or VECTOR_IVFFLAT_LISTS or default_lists(rows)}
+
+    def is_current(self, index, method, params, rows, auto_lists):
+        if not index["valid"] or index["method"] != method or index.get("dimension") != self.dimension:
+            return False
+        if method == "ivfflat" and auto_lists:
+            # Centroids are fixed at build time: re-cluster once the collection has grown enough
+            return index.get("rows", 0) * IVFFLAT_REBUILD_GROWTH >= rows
+        return index.get("params") == params
+
+    def create_file_name_index(self, conn):
+        conn.execute(text(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {FILE_NAME_INDEX} "
+            f"ON {EMBEDDING_TABLE} (collection_id, (cmetadata ->> 'fileName'))"
+        ))
+
+    def index_sql(self, name, method, params, collection_id):
+        column_type = vector_type(self.dimension)
+        operator_class = f"{column_type}_{OPERATOR_CLASSES[self.distance_strategy]}"
+        options = ", ".join(f"{key} = {int(value)}" for key, value in params.items())
+        return (f"CREATE INDEX CONCURRENTLY {name} ON {EMBEDDING_TABLE} "
+                f"USING {method} ((embedding::{column_type}({int(self.dimension)})) {operator_class}) "
+                f"WITH ({options}) WHERE collection_id = '{collection_id}'::uuid")
+
+    def ensure(self, method=VECTOR_INDEX, m=None, ef_construction=None, lists=None, force=False):
+        """
+        Bring the collection's indexes in line with the configuration, returns a
+        description of what was done. A valid index built with the same parameters
+        is kept unless force is set; any other ANN index of the collection is
+        replaced by a new build.
+        """
+        collection_id = self.collection_id()
+        with self.maintenance() as conn:
+            self.create_file_name_index(conn)
+
+        existing = self.indexes(collection_id)
+        if method not in METHODS:
+            self.drop_indexes(existing)
+            return f"no ANN index, dropped {len(existing)}"
+
+        rows = self.rows(collection_id)
+        if method == "ivfflat" and rows == 0:
+            return "collection is empty, IVFFlat needs rows to train its lists"
+        params = self.wanted_params(method, rows, m, ef_construction, lists)
+        auto_lists = method == "ivfflat" and not (lists or VECTOR_IVFFLAT_LISTS)
+        current = next((index for index in existing if self.is_current(index, method, params, rows, auto_lists)), None)
+        if current is not None and not force:
+            self.drop_indexes([index for index in existing if index is not current])
+            return f"kept {current['name']}"
+
+        # A new name per build: the index it replaces keeps serving queries until this one is valid
+        name = f"{self.prefix(collection_id)}{method}_{int(time.time()):x}"
+        meta = {"params": params, "rows": rows, "dimension": self.dimension, "builtAt": time.time()}
+        start = time.perf_counter()
+        with self.maintenance() as conn:
+            try:
+                conn.execute(text(self.index_sql(name, method, params, collection_id)))
+            except Exception:
+                # A failed concurrent build leaves an invalid index behind
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+                raise
+            # Utility statements take no parameters
+            comment = json.dumps(meta).replace("'", "''")
+            conn.execute(text(f"COMMENT ON INDEX {name} IS '{comment}'"))
+        self.drop_indexes(existing)
+        return f"built {name} ({method} {params}) over {rows} rows in {time.perf_counter() - start:.1f}s"
+
+    def drop_indexes(self, indexes):
+        if not indexes:
+            return
+        with self.maintenance() as conn:
+            for index in indexes:
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index['name']}"))
+
+    def drop(self):
+        """Drop the collection's ANN indexes, retrieval falls back to an exact scan"""
+        indexes = self.indexes(self.collection_id())
+        self.drop_indexes(indexes)
+        return f"dropped {len(indexes)}"
@@ -1,32 +1,51 @@
-from config import OPENAI_API_KEY, AZURE_API_BASE_URL, AZURE_TEXT_EMBEDDING, AZURE_EMBEDDING_URL_PATH, POSTGRESQL_BASE_URL, EMBEDDING_COL_NAME
-from langchain_postgres import PGVector
-from langchain_openai import AzureOpenAIEmbeddings
 from langchain_core.documents import Document
 import uuid
+from services.embedding_cache import CachedEmbeddings
+from services.embeddings import EmbeddingProvider
+from services.metrics import instrument_vector
+from services.registry import registry
+from services.db import get_engine
+from services.vector_index import IndexedPGVector, VectorIndexManager, file_name_filter
 
 class VectorService:
     def __init__(self):
-        self.embeddings = AzureOpenAIEmbeddings(
-            model=AZURE_TEXT_EMBEDDING,
-            azure_endpoint=f"{AZURE_API_BASE_URL}{AZURE_EMBEDDING_URL_PATH}",
-            api_key=OPENAI_API_KEY,
-            openai_api_version="2023-05-15",
-        )
+        self.provider = EmbeddingProvider()
 
-        self.vector_store = PGVector(
-            embeddings=self.embeddings,
-            collection_name=EMBEDDING_COL_NAME,
-            connection=f"postgresql+psycopg://{POSTGRESQL_BASE_URL}",
-            use_jsonb=True,
-        )
+        # Repeated queries (resubmitted forms) and documents reuse their cached vectors
+        self.embeddings = CachedEmbeddings(self.provider.embeddings, model_name=self.provider.cache_name)
+
+        # Each backend, model and dimension has its own collection
+        self.collection_name = self.provider.collection_name()
+        self.vector_store = self.build_store()
+        # The ANN index yields at most hnsw.ef_search candidates before a fileName filter is applied,
+        # so filtered queries order by the uncast column: the fileName index finds every row of the
+        # files and they are ranked exactly
+        self.filtered_store = self.build_store(index_method=None)
+        # ANN index of the collection, created and maintained with manage_vector_index.py
+        self.index = VectorIndexManager(get_engine(), self.collection_name, self.provider.dimension)
 
         # Querying embeddings 
         self.retriever = self.vector_store.as_retriever(search_type="mmr", search_kwargs={"k": 2})
     
-    def retrieve_context(self, query):
-        """Retrieve relevant context from vector store based on query"""
+    def build_store(self, **kwargs):
+        return IndexedPGVector(
+            embeddings=self.embeddings,
+            collection_name=self.collection_name,
+            collection_metadata=self.provider.collection_metadata(),
+            connection=get_engine(),
+            use_jsonb=True,
+            dimension=self.provider.dimension,
+            **kwargs,
+        )
+
+    @instrument_vector("retrieve")
+    def retrieve_context(self, query, file_names=None):
+        """Retrieve relevant context from vector store based on query, optionally from the given files only"""
+        if file_names:
+            return self.filtered_store.max_marginal_relevance_search(query, k=2, filter=file_name_filter(file_names))
         return self.retriever.invoke(query)
     
+    @instrument_vector("store")
     def store_document(self, content, file_name="user_generated_sow"):
         """Store a document in the vector database"""
         doc = Document(
@@ -37,5 +56,6 @@ class VectorService:
         self.vector_store.add_documents([doc], ids=[doc.metadata["id"]])
         return doc.metadata["id"]
 
-# Initialize vector service as a singleton
-vector_service = VectorService()
\ No newline at end of file
+# Vector service singleton, created on first use
+registry.register("vector_service", VectorService, kind="service")
+vector_service = registry.lazy("vector_service")
\ No newline at end of file
@@ -0,0 +1,104 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from config import WRITE_BEHIND_BATCH_SIZE, WRITE_BEHIND_INTERVAL, WRITE_BEHIND_QUEUE_SIZE
+from services.metrics import WRITE_BEHIND_FLUSH_DURATION, WRITE_BEHIND_ROWS, WRITE_BEHIND_QUEUE_DEPTH
+
+class WriteBehindQueue:
+    """
+    Buffers rows and writes them with flush(batch) from a background thread, in
+    batches of up to batch_size at most interval seconds apart. A full queue
+    writes the row on the caller's thread instead of dropping it, and rows still
+    queued at exit are flushed before the process ends.
+    """
+
+    def __init__(self, name, flush, batch_size=WRITE_BEHIND_BATCH_SIZE, interval=WRITE_BEHIND_INTERVAL,
+                 max_size=WRITE_BEHIND_QUEUE_SIZE, retries=3):
+        self.name = name
+        self.flush = flush
+        self.batch_size = batch_size
+        self.interval = interval
+        self.retries = retries
+        self.queue = queue.Queue(maxsize=max_size)
+        self.thread = None
+        self.pid = None
+        self.lock = threading.Lock()
+        self.depth_gauge = WRITE_BEHIND_QUEUE_DEPTH.labels(name)
+
+    def start(self):
+        """Start the writer thread on first use, again in a forked worker where it does not exist"""
+        if self.thread is not None and self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.thread is None or self.pid != os.getpid():
+                self.pid = os.getpid()
+                self.thread = threading.Thread(target=self.run, name=f"write-behind-{self.name}", daemon=True)
+                self.thread.start()
+                atexit.register(self.drain)
+
+    def put(self, row):
+        self.start()
+        try:
+            self.queue.put_nowait(row)
+            self.depth_gauge.set(self.queue.qsize())
+        except queue.Full:
+            # Back pressure: the caller pays for one attempt rather than losing the row
+            self.write([row], "sync", attempts=1)
+
+    def depth(self):
+        return self.queue.qsize()
+
+    def take_batch(self, timeout, limit=None):
+        """Up to limit (batch_size) rows, waiting at most timeout seconds for the first one"""
+        limit = limit or self.batch_size
+        try:
+            batch = [self.queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(batch) < limit:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        self.depth_gauge.set(self.queue.qsize())
+        return batch
+
+    def write(self, batch, result="written", attempts=None):
+        attempts = attempts or self.retries
+        for attempt in range(1, attempts + 1):
+            start = time.perf_counter()
+            try:
+                self.flush(batch)
+                WRITE_BEHIND_FLUSH_DURATION.labels(self.name).observe(time.perf_counter() - start)
+                WRITE_BEHIND_ROWS.labels(self.name, result).inc(len(batch))
+                return True
+            except Exception as e:
+                print(f"⚠️ Write-behind {self.name}: batch of {len(batch)} failed (attempt {attempt}): {e}")
+                if attempt < attempts:
+                    time.sleep(min(2 ** attempt, 30))
+        WRITE_BEHIND_ROWS.labels(self.name, "failed").inc(len(batch))
+        return False
+
+    def run(self):
+        while True:
+            batch = self.take_batch(self.interval)
+            if not batch:
+                continue
+            # Let a batch fill up for at most interval seconds when rows trickle in
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size and time.monotonic() < deadline:
+                more = self.take_batch(max(0.0, deadline - time.monotonic()), self.batch_size - len(batch))
+                if not more:
+                    break
+                batch += more
+            self.write(batch)
+
+    def drain(self):
+        """Write whatever is still queued, called at interpreter exit"""
+        while True:
+            batch = self.take_batch(0)
+            if not batch:
+                return
+            self.write(batch)
@@ -0,0 +1,5 @@
+from app import create_app
+
+# WSGI entry point, e.g. `gunicorn -c gunicorn.conf.py wsgi:app`. The app is preloaded in the
+# gunicorn master, the background model warm-up runs in each worker instead (see post_fork)
+app = create_app(background_warm_up=False)